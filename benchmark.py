@@ -0,0 +1,34 @@
+import os, sys, glob, time
+path_to_add = os.path.abspath('.')
+sys.path.insert(0, path_to_add)
+import numpy as np
+from multiprocessing import cpu_count
+import epeditor as ed
+from epeditor.reader import get_group_result
+
+# python benchmark.py <folder with case sql files> [variable type] [frequency] [max workers]
+# reads every case sql under the folder with 1, 2, 4 ... worker processes and reports the speed-up
+
+if __name__ == '__main__':
+    folder = sys.argv[1] if len(sys.argv) > 1 else '.'
+    var_type = sys.argv[2] if len(sys.argv) > 2 else 'Zone Mean Air Temperature'
+    frequency = sys.argv[3] if len(sys.argv) > 3 else ed.utils.Hourly
+    max_workers = int(sys.argv[4]) if len(sys.argv) > 4 else cpu_count()
+    sql_list = sorted(glob.glob(os.path.join(folder, '**', '*.sql'), recursive=True))
+    variable = ed.Variable(None, var_type, None)
+    print(f'{len(sql_list)} cases, {var_type}, {frequency}')
+
+    workers, timing, reference = 1, {}, None
+    while workers <= max_workers:
+        start = time.perf_counter()
+        result = get_group_result(sql_list, variable, np.mean, frequency, alike=True, workers=workers)
+        timing[workers] = time.perf_counter() - start
+        if reference is None:
+            reference = result
+        elif not (np.allclose(reference.data, result.data) and reference.sql_list == result.sql_list):
+            print(f'**********workers={workers} does not match the serial result')
+        workers *= 2
+
+    print()
+    for workers, cost in timing.items():
+        print(f'workers={workers:<3d} {cost:8.3f}s  speed-up x{timing[1] / cost:.2f}')
@@ -0,0 +1,30 @@
+import os, sys, glob, time
+path_to_add = os.path.abspath('.')
+sys.path.insert(0, path_to_add)
+from multiprocessing import cpu_count
+import epeditor as ed
+
+# python benchmark_simulation.py <folder with idf files> <epw file> [workers] [avoid smt: 0/1]
+# simulates the folder unpinned, then pinned with each placement policy, and reports the throughput
+# all runs go through the same forceCPU workers and shared queue, only the pinning differs
+
+if __name__ == '__main__':
+    folder = sys.argv[1]
+    epw = sys.argv[2]
+    # forceCPU falls back to the scheduler above cpu_count() workers
+    workers = min(int(sys.argv[3]), cpu_count()) if len(sys.argv) > 3 else cpu_count()
+    avoid_smt = len(sys.argv) > 4 and sys.argv[4] == '1'
+    cases = len(glob.glob(os.path.join(folder, '*.idf')))
+    print(f'{cases} cases, {workers} workers, avoid_smt={avoid_smt}')
+
+    timing = {}
+    for placement in [None, 'compact', 'spread', 'numa']:
+        start = time.perf_counter()
+        ed.simulate_local(folder, epw, overwrite=True, prs_count=workers, forceCPU=True,
+                          placement=placement, avoid_smt=avoid_smt)
+        timing[placement or 'unpinned'] = time.perf_counter() - start
+
+    print()
+    for placement, cost in timing.items():
+        print(f'{placement:<9s} {cost:8.1f}s  {60 * cases / cost:8.2f} cases/min  '
+              f'speed-up x{timing["unpinned"] / cost:.2f}')
@@ -1,7 +1,8 @@
-from db_eplusout_reader import Variable
+from .db_eplusout_reader import Variable
 from eppy.bunch_subclass import EpBunch
 from .generator import Generator
 from .simulator import simulate_local,simulate_cloud
+from .scheduler import Scheduler
 from .editor import IDFEditor, IDFGroupEditor, IDFModel,IDFsearchresult
 from . import utils
 from .project import project
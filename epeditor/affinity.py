@@ -0,0 +1,164 @@
+from subprocess import Popen
+import os
+
+SYSFS_CPU = '/sys/devices/system/cpu'
+SYSFS_NODE = '/sys/devices/system/node'
+# placement policies, see place_workers
+COMPACT = 'compact'
+SPREAD = 'spread'
+NUMA = 'numa'
+
+
+def parse_cpulist(text: str):
+    """
+    Parse a sysfs cpu list such as '0-3,8,10-11'.
+
+    Returns
+    -------
+    list of int
+    """
+    cpus = []
+    for part in text.strip().split(','):
+        if not part:
+            continue
+        if '-' in part:
+            first, last = part.split('-')
+            cpus.extend(range(int(first), int(last) + 1))
+        else:
+            cpus.append(int(part))
+    return cpus
+
+
+def _read(path: str):
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def available_cpus():
+    """CPUs this process may run on, sorted."""
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count()))
+
+
+def numa_nodes():
+    """
+    CPUs of each NUMA node, read from /sys/devices/system/node.
+
+    Returns
+    -------
+    dict of int : list of int
+        Available CPUs by node, a single node 0 holding all of them when the topology cannot be read.
+    """
+    cpus = set(available_cpus())
+    nodes = {}
+    if os.path.isdir(SYSFS_NODE):
+        for name in sorted(os.listdir(SYSFS_NODE)):
+            if not name.startswith('node') or not name[4:].isdigit():
+                continue
+            cpulist = _read(os.path.join(SYSFS_NODE, name, 'cpulist'))
+            node_cpus = [cpu for cpu in parse_cpulist(cpulist or '') if cpu in cpus]
+            if node_cpus:
+                nodes[int(name[4:])] = node_cpus
+    if not nodes:
+        nodes = {0: sorted(cpus)}
+    return nodes
+
+
+def cpu_topology():
+    """
+    Location of each available CPU.
+
+    Returns
+    -------
+    list of tuple of int
+        (cpu, node, package, core, thread) sorted by cpu, `thread` being the rank of the CPU among
+        the SMT siblings of its core (0 for the first hardware thread).
+    """
+    node_of = {cpu: node for node, cpus in numa_nodes().items() for cpu in cpus}
+    topology = []
+    for cpu in available_cpus():
+        folder = os.path.join(SYSFS_CPU, f'cpu{cpu}', 'topology')
+        package = _read(os.path.join(folder, 'physical_package_id'))
+        core = _read(os.path.join(folder, 'core_id'))
+        siblings = parse_cpulist(_read(os.path.join(folder, 'thread_siblings_list')) or str(cpu))
+        topology.append((cpu, node_of.get(cpu, 0), int(package or 0), cpu if core is None else int(core),
+                         sorted(siblings).index(cpu) if cpu in siblings else 0))
+    return topology
+
+
+def place_workers(count: int, policy=COMPACT, avoid_smt=False):
+    """
+    CPUs assigned to each of `count` pinned workers.
+
+    Parameters
+    ----------
+    count : int
+        Number of workers.
+    policy : str, optional
+        'compact' fills the cores one after the other (SMT siblings of a core first), 'spread' spreads the
+        workers over the NUMA nodes and cores before using the siblings, 'numa' pins each worker to all the
+        CPUs of a node, the nodes taken in turn. Default is 'compact'.
+    avoid_smt : bool, optional
+        If True, only the first hardware thread of each core is used. Default is False.
+
+    Returns
+    -------
+    list of tuple of int
+        CPUs of each worker. Workers share CPUs when there are more workers than CPUs.
+    """
+    topology = cpu_topology()
+    if avoid_smt:
+        topology = [location for location in topology if location[4] == 0]
+    if policy == NUMA:
+        nodes = {}
+        for cpu, node, _, _, _ in topology:
+            nodes.setdefault(node, []).append(cpu)
+        cpu_sets = [tuple(nodes[node]) for node in sorted(nodes)]
+    elif policy == COMPACT:
+        cpu_sets = [(location[0],) for location in sorted(topology, key=lambda l: (l[1], l[2], l[3], l[4], l[0]))]
+    elif policy == SPREAD:
+        # rank of each core within its node, so that the nodes are taken in turn
+        cores = {}
+        for cpu, node, package, core, thread in sorted(topology, key=lambda l: (l[1], l[2], l[3])):
+            node_cores = cores.setdefault(node, {})
+            node_cores.setdefault((package, core), len(node_cores))
+        order = sorted(topology, key=lambda l: (l[4], cores[l[1]][(l[2], l[3])], l[1], l[0]))
+        cpu_sets = [(location[0],) for location in order]
+    else:
+        raise ValueError(f'Unknown placement policy: {policy}')
+    return [cpu_sets[i % len(cpu_sets)] for i in range(count)]
+
+
+def pinned_popen(cmd, cpus=None, **kwargs):
+    """
+    Start a process pinned to the given CPUs.
+
+    On Linux the affinity is set with `os.sched_setaffinity` in the child before it executes `cmd`,
+    on Windows the process is pinned with `SetProcessAffinityMask` right after it started.
+
+    Parameters
+    ----------
+    cmd : str or list of str
+        Command, see `subprocess.Popen`.
+    cpus : int or iterable of int, optional
+        CPU or CPUs the process runs on. Default is None (not pinned).
+    **kwargs
+        Additional keyword arguments passed to `subprocess.Popen`.
+
+    Returns
+    -------
+    subprocess.Popen
+    """
+    if cpus is None:
+        return Popen(cmd, **kwargs)
+    cpus = {cpus} if isinstance(cpus, int) else set(cpus)
+    if hasattr(os, 'sched_setaffinity'):
+        return Popen(cmd, preexec_fn=lambda: os.sched_setaffinity(0, cpus), **kwargs)
+    import win32process
+    proc = Popen(cmd, **kwargs)
+    win32process.SetProcessAffinityMask(proc._handle, sum(1 << cpu for cpu in cpus))
+    return proc
@@ -0,0 +1,320 @@
+import numpy as np
+from .db_eplusout_reader import Variable, get_first_arrays
+from .db_eplusout_reader.sql_reader import get_first_ids, get_time_index, get_window_mask, \
+    get_first_arrays_from_sql, get_outputs_array, to_sql_frequency, get_time_environments
+from .resample import resample as resample_steps, is_known, PERIODS, SOURCES
+import sqlite3
+import json
+import os, shutil
+
+CACHE_FOLDER = '_epeditorcache'
+CACHE_VERSION = 4
+USE_CACHE = True
+# opt-in default of the `resample` arguments: derive Daily/Monthly/Annual/RunPeriod series from cached hourly
+# (or timestep) blocks instead of reading the frequencies reported by EnergyPlus, only for variables reported
+# as 'Sum' or 'Avg'
+RESAMPLE = False
+
+
+class CaseCache:
+    """
+    Columnar cache of one case's EnergyPlus SQL output.
+
+    Every (frequency, variable) series is stored as a memory-mappable .npy block next to the
+    timestamps of its frequency, a small JSON index maps requests to blocks. The index is keyed by
+    the SQL path, size and modification time, the cache is emptied once the SQL file changes.
+    With `resample`, coarser frequencies of variables already cached hourly are resampled from those blocks.
+    """
+    __slots__ = ['sql', 'folder', 'index']
+
+    def __init__(self, sql: str):
+        """
+        Open (or create) the cache of a SQL file.
+
+        Parameters
+        ----------
+        sql : str
+            Path to the EnergyPlus SQL output of the case.
+        """
+        self.sql = os.path.abspath(sql)
+        self.folder = cache_folder(self.sql)
+        self.index = None
+        self.load()
+
+    @property
+    def stamp(self):
+        """Path, size and modification time identifying the current SQL file."""
+        stat = os.stat(self.sql)
+        return {'sql': self.sql, 'size': stat.st_size, 'mtime': stat.st_mtime_ns}
+
+    def load(self):
+        """
+        Load the JSON index, dropping all blocks if the SQL file changed since they were written.
+        """
+        stamp = self.stamp
+        index_path = os.path.join(self.folder, 'index.json')
+        if os.path.isfile(index_path):
+            try:
+                with open(index_path, 'r') as f:
+                    self.index = json.load(f)
+            except Exception:
+                self.index = None
+        if self.index is None or self.index.get('stamp') != stamp or self.index.get('version') != CACHE_VERSION:
+            self.clear()
+
+    def clear(self):
+        """
+        Delete all cached blocks of the case.
+        """
+        if os.path.exists(self.folder):
+            shutil.rmtree(self.folder, ignore_errors=True)
+        self.index = {'version': CACHE_VERSION, 'stamp': self.stamp, 'time': {}, 'environments': {}, 'requests': {},
+                      'blocks': {}}
+
+    def save(self):
+        """
+        Write the JSON index, replacing the old one at once.
+        """
+        if not os.path.exists(self.folder):
+            os.makedirs(self.folder)
+        index_path = os.path.join(self.folder, 'index.json')
+        with open(index_path + '.tmp', 'w') as f:
+            json.dump(self.index, f)
+        os.replace(index_path + '.tmp', index_path)
+
+    def timestamps(self, frequency):
+        return np.load(os.path.join(self.folder, self.index['time'][frequency]), mmap_mode='r')
+
+    def environments(self, frequency):
+        return np.load(os.path.join(self.folder, self.index['environments'][frequency]), mmap_mode='r')
+
+    def block(self, frequency, id_):
+        return np.load(os.path.join(self.folder, self.index['blocks'][f'{frequency}|{id_}']['file']), mmap_mode='r')
+
+    def fill(self, variables: list, frequency, alike=False, catalogue=None):
+        """
+        Read the requests missing from the cache from the SQL file and store them as blocks.
+
+        Parameters
+        ----------
+        variables : list of Variable
+            Requested variables.
+        frequency : str
+            The temporal frequency of the data.
+        alike : bool, optional
+            If True, allows approximate matching of variable names. Default is False.
+        catalogue : VariableCatalogue, optional
+            Project catalogue used to resolve variable ids without querying SQLite. Default is None.
+
+        Returns
+        -------
+        list of int
+            ReportDataDictionary id of each request.
+
+        Raises
+        ------
+        NoResults
+            When any of the requested variables cannot be found.
+        """
+        keys = [request_key(v, frequency, alike) for v in variables]
+        missing = [i for i in range(len(keys)) if keys[i] not in self.index['requests']]
+        if len(missing) > 0 or frequency not in self.index['time']:
+            if not os.path.exists(self.folder):
+                os.makedirs(self.folder)
+            conn = sqlite3.connect(self.sql)
+            try:
+                if frequency not in self.index['time']:
+                    _, timestamps = get_time_index(conn, frequency)
+                    self.index['time'][frequency] = f'time_{frequency}.npy'
+                    np.save(os.path.join(self.folder, self.index['time'][frequency]), timestamps)
+                    self.index['environments'][frequency] = f'environments_{frequency}.npy'
+                    np.save(os.path.join(self.folder, self.index['environments'][frequency]),
+                            get_time_environments(conn, frequency))
+                ids = None
+                if catalogue is not None:
+                    stamp = self.index['stamp']
+                    ids = catalogue.resolve(self.sql, [variables[i] for i in missing], frequency, alike,
+                                            (stamp['size'], stamp['mtime']))
+                if ids is None:
+                    ids = get_first_ids(conn, [variables[i] for i in missing], to_sql_frequency(frequency), alike)
+                new_ids = [id_ for id_ in dict.fromkeys(ids) if f'{frequency}|{id_}' not in self.index['blocks']]
+                if len(new_ids) > 0:
+                    array, counts = get_outputs_array(conn, new_ids, return_counts=True)
+                    info = {id_: (units, var_type) for id_, units, var_type in conn.execute(
+                        "SELECT ReportDataDictionaryIndex, Units, Type FROM ReportDataDictionary"
+                        " WHERE ReportDataDictionaryIndex IN ({})".format(",".join(str(int(id_)) for id_ in new_ids)))}
+                    n_steps = len(self.timestamps(frequency))
+                    for id_, count, row in zip(new_ids, counts, array):
+                        file = f'{frequency}_{id_}.npy'
+                        np.save(os.path.join(self.folder, file), row[:count])
+                        units, var_type = info.get(id_, (None, None))
+                        self.index['blocks'][f'{frequency}|{id_}'] = {'file': file, 'aligned': count == n_steps,
+                                                                      'units': units, 'type': var_type}
+            finally:
+                conn.close()
+            for i, id_ in zip(missing, ids):
+                self.index['requests'][keys[i]] = id_
+            self.save()
+        return [self.index['requests'][key] for key in keys]
+
+    def resample_source(self, variables: list, frequency, alike=False, resample=None):
+        """
+        Find a cached finer frequency holding all requested variables on every step.
+
+        Parameters
+        ----------
+        variables : list of Variable
+            Requested variables.
+        frequency : str
+            The temporal frequency requested.
+        alike : bool, optional
+            If True, allows approximate matching of variable names. Default is False.
+        resample : bool, optional
+            If False, no request is resampled. Default is None (`RESAMPLE`).
+
+        Returns
+        -------
+        str or None
+            Hourly or TimeStep, None when the request has to be read from SQLite, which it is
+            for every variable not reported as 'Sum' or 'Avg'.
+        """
+        if not (RESAMPLE if resample is None else resample) or frequency not in PERIODS:
+            return None
+        for source in SOURCES:
+            ids = [self.index['requests'].get(request_key(v, source, alike)) for v in variables]
+            if len(ids) > 0 and all(id_ is not None and self.index['blocks'][f'{source}|{id_}']['aligned']
+                                    and is_known(self.index['blocks'][f'{source}|{id_}'].get('type'))
+                                    for id_ in ids):
+                return source
+        return None
+
+    def first_arrays(self, variables: list, frequency, alike=False, start_date=None, end_date=None,
+                     catalogue=None, resample=None):
+        """
+        Serve the first match of each requested variable from the cache, see `get_first_arrays`.
+
+        Parameters
+        ----------
+        variables : list of Variable
+            Requested variables.
+        frequency : str
+            The temporal frequency of the data.
+        alike : bool, optional
+            If True, allows approximate matching of variable names. Default is False.
+        start_date : datetime, optional
+            Start date for filtering the time range of data. Default is None.
+        end_date : datetime, optional
+            End date for filtering the time range of data. Default is None.
+        catalogue : VariableCatalogue, optional
+            Project catalogue used to resolve variable ids without querying SQLite. Default is None.
+        resample : bool, optional
+            If True, the Daily, Monthly, Annual and RunPeriod series of 'Sum' and 'Avg' variables are aggregated
+            from their cached hourly or timestep series instead of being read from SQLite. Default is None
+            (`cache.RESAMPLE`).
+
+        Returns
+        -------
+        tuple of (numpy.ndarray, numpy.ndarray)
+            (variables, steps) float64 array and datetime64[m] timestamps.
+        """
+        source = self.resample_source(variables, frequency, alike, resample)
+        if source is not None:
+            array, timestamps = self.first_arrays(variables, source, alike)
+            ids = [self.index['requests'][request_key(v, source, alike)] for v in variables]
+            types = [self.index['blocks'][f'{source}|{id_}']['type'] for id_ in ids]
+            array, timestamps = resample_steps(array, timestamps, frequency, types, self.environments(source))
+            if start_date or end_date:
+                mask = get_window_mask(timestamps, start_date, end_date)
+                array, timestamps = array[:, mask], timestamps[mask]
+            return array, timestamps
+
+        ids = self.fill(variables, frequency, alike, catalogue)
+        timestamps = self.timestamps(frequency)
+        blocks = [self.block(frequency, id_) for id_ in ids]
+        if start_date or end_date:
+            if not all(self.index['blocks'][f'{frequency}|{id_}']['aligned'] for id_ in ids):
+                # series not reported on every step cannot be windowed by timestamps
+                return get_first_arrays_from_sql(self.sql, variables, frequency, alike, start_date, end_date)
+            mask = get_window_mask(timestamps, start_date, end_date)
+            blocks = [block[mask] for block in blocks]
+            timestamps = timestamps[mask]
+        if len(blocks) == 0:
+            return np.empty((0, 0), dtype=np.float64), np.array(timestamps)
+        n_steps = max(len(block) for block in blocks)
+        array = np.full((len(blocks), n_steps), np.nan, dtype=np.float64)
+        for i, block in enumerate(blocks):
+            array[i, :len(block)] = block
+        return array, np.array(timestamps)
+
+
+def cache_folder(sql: str):
+    """
+    Folder holding the cache of a SQL file, next to the file itself.
+
+    Parameters
+    ----------
+    sql : str
+        Path to the SQL file.
+
+    Returns
+    -------
+    str
+    """
+    sql = os.path.abspath(sql)
+    return os.path.join(os.path.dirname(sql), CACHE_FOLDER, os.path.splitext(os.path.basename(sql))[0])
+
+
+def request_key(variable: Variable, frequency, alike=False):
+    return '|'.join([frequency, str(bool(alike))] + [str(v) for v in variable])
+
+
+def get_cached_arrays(sql: str, variables, frequency, alike=False, start_date=None, end_date=None,
+                      catalogue=None, resample=None):
+    """
+    Get the first match of each requested variable, building the case cache lazily.
+
+    Falls back to reading the file directly when caching is disabled or the file is not SQL.
+
+    Parameters
+    ----------
+    sql : str
+        Path to the EnergyPlus output file.
+    variables : Variable or list of Variable
+        Requested variables.
+    frequency : str
+        The temporal frequency of the data.
+    alike : bool, optional
+        If True, allows approximate matching of variable names. Default is False.
+    start_date : datetime, optional
+        Start date for filtering the time range of data. Default is None.
+    end_date : datetime, optional
+        End date for filtering the time range of data. Default is None.
+    catalogue : VariableCatalogue, optional
+        Project catalogue used to resolve variable ids without querying SQLite. Default is None.
+    resample : bool, optional
+        If True, the Daily, Monthly, Annual and RunPeriod series of 'Sum' and 'Avg' variables are aggregated
+        from their cached hourly or timestep series instead of being read from SQLite. Default is None
+        (`cache.RESAMPLE`).
+
+    Returns
+    -------
+    tuple of (numpy.ndarray, numpy.ndarray)
+        (variables, steps) float64 array and datetime64[m] timestamps.
+    """
+    if isinstance(variables, Variable):
+        variables = [variables]
+    if not USE_CACHE or not sql.lower().endswith('.sql'):
+        return get_first_arrays(sql, variables, frequency, alike, start_date, end_date)
+    return CaseCache(sql).first_arrays(variables, frequency, alike, start_date, end_date, catalogue, resample)
+
+
+def clear_cache(sql: str):
+    """
+    Delete the cache of a SQL file.
+
+    Parameters
+    ----------
+    sql : str
+        Path to the SQL file.
+    """
+    shutil.rmtree(cache_folder(sql), ignore_errors=True)
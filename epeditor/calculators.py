@@ -0,0 +1,140 @@
+import numpy as np
+
+
+class Percentile:
+    """
+    Percentile calculator, usable per series as well as over a whole axis.
+    """
+    __slots__ = ['q']
+
+    def __init__(self, q):
+        """
+        Parameters
+        ----------
+        q : float
+            Percentile to compute, between 0 and 100.
+        """
+        self.q = q
+
+    def __repr__(self):
+        return f'Percentile({self.q})'
+
+    def __call__(self, a, axis=None):
+        return np.percentile(a, self.q, axis=axis)
+
+
+def argmax(a, axis=None):
+    """
+    Position of the maximum along the axis, e.g. the case or variable at the peak.
+    """
+    return np.argmax(a, axis=axis)
+
+
+def raw(a, axis=0):
+    """
+    Keep the series itself, moving the reduced axis to the end as `np.array` per series does.
+    """
+    return np.moveaxis(np.asarray(a), axis, -1)
+
+
+def count(a, axis=0):
+    """
+    Number of values along the axis, as `len` per series.
+    """
+    a = np.asarray(a)
+    return np.full(np.delete(a.shape, axis), a.shape[axis])
+
+
+# calculator -> vectorized function taking (array, axis)
+CALCULATORS = {
+    np.array: raw,
+    np.asarray: raw,
+    np.sum: np.sum,
+    sum: np.sum,
+    np.mean: np.mean,
+    np.median: np.median,
+    np.std: np.std,
+    np.var: np.var,
+    np.min: np.min,
+    np.amin: np.min,
+    min: np.min,
+    np.max: np.max,
+    np.amax: np.max,
+    max: np.max,
+    np.ptp: np.ptp,
+    np.argmax: np.argmax,
+    np.argmin: np.argmin,
+    argmax: argmax,
+    len: count,
+}
+
+# peak of a series reduced over cases or variables is where its maximum is
+peak_hour = argmax
+
+
+def register_calculator(calculator, function):
+    """
+    Register a vectorized implementation of a calculator.
+
+    Parameters
+    ----------
+    calculator : callable
+        The calculator as passed to `get_group_result` or `get_group_summary`, taking one series.
+    function : callable
+        Function taking (array, axis) and reducing the whole array along the axis at once.
+    """
+    CALCULATORS[calculator] = function
+
+
+def get_axis_function(calculator):
+    """
+    Find the vectorized implementation of a calculator.
+
+    Parameters
+    ----------
+    calculator : callable
+        Calculator taking one series.
+
+    Returns
+    -------
+    callable or None
+        Function taking (array, axis), None if the calculator is unknown.
+    """
+    if isinstance(calculator, Percentile):
+        return calculator
+    try:
+        return CALCULATORS.get(calculator)
+    except TypeError:
+        return None
+
+
+def apply_calculator(calculator, array, axis=0):
+    """
+    Apply a calculator to every series along an axis of an array.
+
+    Registered calculators run as a single NumPy reduction, other callables are called once
+    per series.
+
+    Parameters
+    ----------
+    calculator : callable
+        Calculator taking one series (array-like) and returning a scalar or an array.
+    array : numpy.ndarray
+        Data array.
+    axis : int, optional
+        Axis holding the series to reduce. Default is 0.
+
+    Returns
+    -------
+    numpy.ndarray
+        Array with the reduced axis replaced by the calculator output.
+    """
+    array = np.asarray(array)
+    function = get_axis_function(calculator)
+    if function is not None:
+        return np.asarray(function(array, axis=axis))
+    series = np.moveaxis(array, axis, -1)
+    if series.size == 0:
+        return np.empty(series.shape[:-1])
+    result = np.array([calculator(data_series) for data_series in series.reshape(-1, series.shape[-1])])
+    return result.reshape(series.shape[:-1] + result.shape[1:])
@@ -0,0 +1,333 @@
+import numpy as np
+from .db_eplusout_reader import Variable, exceptions
+from .db_eplusout_reader.sql_reader import to_sql_frequency
+from .db_eplusout_reader.eso_reader import get_eso_dictionary_rows
+import sqlite3
+import fnmatch
+import re
+import os
+
+SQL_FREQUENCIES = ['Zone Timestep', 'Hourly', 'Daily', 'Monthly', 'Annual', 'Run Period']
+CATALOGUE_FILE = 'catalogue.npz'
+
+
+class VariableCatalogue:
+    """
+    Catalogue of the output variables reported by all case SQL files of a project.
+
+    Every distinct string is stored once in `strings`; `entries` holds (key, type, units, frequency)
+    codes into it, sorted the same way as the SQL reader sorts its matches. Cases sharing the same
+    data dictionary share one column of `layouts`, which gives the ReportDataDictionary id of each
+    entry (-1 when the case does not report it). `lowered` holds the lower-case strings used by the
+    case-insensitive searches.
+    """
+    __slots__ = ['strings', 'lowered', 'entries', 'layouts', 'cases', 'case_layout', 'stamps', '__case_index']
+
+    def __init__(self, strings=None, entries=None, layouts=None, cases=None, case_layout=None, stamps=None):
+        self.strings = np.array([], dtype=str) if strings is None else strings
+        self.lowered = np.char.lower(self.strings)
+        self.entries = np.empty((0, 4), dtype=np.int32) if entries is None else entries
+        self.layouts = np.empty((0, 0), dtype=np.int32) if layouts is None else layouts
+        self.cases = np.array([], dtype=str) if cases is None else cases
+        self.case_layout = np.empty(0, dtype=np.int32) if case_layout is None else case_layout
+        self.stamps = np.empty((0, 2), dtype=np.int64) if stamps is None else stamps
+        self.__case_index = {case: i for i, case in enumerate(self.cases.tolist())}
+
+    def __repr__(self):
+        return f'VariableCatalogue({len(self.entries)} variables, {len(self.cases)} cases)'
+
+    def __len__(self):
+        return len(self.entries)
+
+    @classmethod
+    def build(cls, sql_list: list, previous=None):
+        """
+        Build the catalogue from a list of SQL files.
+
+        Each file is scanned once; files unchanged since `previous` was built are taken from it.
+
+        Parameters
+        ----------
+        sql_list : list of str
+            Paths to the case SQL files.
+        previous : VariableCatalogue, optional
+            An older catalogue whose up-to-date cases are reused. Default is None.
+
+        Returns
+        -------
+        VariableCatalogue
+        """
+        case_rows, cases, stamps = [], [], []
+        for sql in sql_list:
+            sql = os.path.normpath(os.path.abspath(sql))
+            stamp = sql_stamp(sql)
+            rows = previous.case_rows(sql, stamp) if previous is not None else None
+            if rows is None:
+                try:
+                    rows = read_dictionary_rows(sql)
+                except Exception as e:
+                    print(e)
+                    continue
+            case_rows.append(rows)
+            cases.append(sql)
+            stamps.append(stamp)
+
+        # intern strings and sort entries as (key, type, units) strings, then frequency
+        entry_set = sorted({row[1:] for rows in case_rows for row in rows})
+        strings = sorted({s for entry in entry_set for s in entry})
+        string_index = {s: i for i, s in enumerate(strings)}
+        entry_index = {entry: i for i, entry in enumerate(entry_set)}
+        entries = np.array([[string_index[s] for s in entry] for entry in entry_set], dtype=np.int32).reshape(-1, 4)
+
+        layouts, layout_index, case_layout = [], {}, []
+        for rows in case_rows:
+            column = np.full(len(entry_set), -1, dtype=np.int32)
+            for row in reversed(rows):
+                # the first id wins for repeated definitions
+                column[entry_index[row[1:]]] = row[0]
+            signature = column.tobytes()
+            if signature not in layout_index:
+                layout_index[signature] = len(layouts)
+                layouts.append(column)
+            case_layout.append(layout_index[signature])
+        layouts = np.array(layouts, dtype=np.int32).T.reshape(len(entry_set), len(layouts))
+        return cls(np.array(strings, dtype=str), entries, layouts, np.array(cases, dtype=str),
+                   np.array(case_layout, dtype=np.int32), np.array(stamps, dtype=np.int64).reshape(-1, 2))
+
+    def case_rows(self, sql: str, stamp=None):
+        """
+        Rows (id, key, type, units, frequency) of a case, None if unknown or changed since it was scanned.
+        """
+        i = self.__case_index.get(os.path.normpath(os.path.abspath(sql)))
+        if i is None or (stamp is not None and tuple(self.stamps[i]) != tuple(stamp)):
+            return None
+        column = self.layouts[:, self.case_layout[i]]
+        valid = np.flatnonzero(column >= 0)
+        return [(int(column[e]),) + tuple(self.strings[self.entries[e]].tolist()) for e in valid]
+
+    def save(self, path: str):
+        """
+        Save the catalogue as an uncompressed .npz file.
+
+        Parameters
+        ----------
+        path : str
+            Target file path.
+        """
+        np.savez(path, strings=self.strings, entries=self.entries, layouts=self.layouts, cases=self.cases,
+                 case_layout=self.case_layout, stamps=self.stamps)
+
+    @classmethod
+    def load(cls, path: str):
+        """
+        Load a catalogue saved by `save`.
+
+        Parameters
+        ----------
+        path : str
+            Path to the .npz file.
+
+        Returns
+        -------
+        VariableCatalogue
+        """
+        with np.load(path) as f:
+            return cls(f['strings'], f['entries'], f['layouts'], f['cases'], f['case_layout'], f['stamps'])
+
+    def is_current(self, sql_list: list):
+        """
+        Check that the catalogue covers exactly these SQL files in their current state.
+        """
+        if len(sql_list) != len(self.cases):
+            return False
+        for sql in sql_list:
+            i = self.__case_index.get(os.path.normpath(os.path.abspath(sql)))
+            if i is None or tuple(self.stamps[i]) != sql_stamp(sql):
+                return False
+        return True
+
+    def variable(self, entry: int):
+        key, type_, units, _ = self.strings[self.entries[entry]].tolist()
+        return Variable(key, type_, units)
+
+    def variables(self):
+        """
+        All variables grouped by SQL frequency, as returned by `utils.get_variables`.
+
+        Returns
+        -------
+        dict
+        """
+        frequencies = self.strings[self.entries[:, 3]] if len(self.entries) else np.array([], dtype=str)
+        return {freq: [self.variable(e) for e in np.flatnonzero(frequencies == freq)] for freq in SQL_FREQUENCIES}
+
+    def field_mask(self, field: int, pattern: str, mode='substring'):
+        """
+        Match one field of every entry against a pattern, case-insensitively.
+
+        Parameters
+        ----------
+        field : int
+            0 for key, 1 for type, 2 for units and 3 for frequency.
+        pattern : str
+            Text to look for.
+        mode : str, optional
+            'substring', 'prefix', 'glob', 'regex' (`re.search`) or 'exact'. Default is 'substring'.
+
+        Returns
+        -------
+        numpy.ndarray
+            Boolean mask over entries.
+        """
+        lowered = self.lowered
+        if mode == 'regex':
+            regex = re.compile(pattern, re.IGNORECASE)
+            matched = np.array([regex.search(s) is not None for s in self.strings.tolist()], dtype=bool)
+            return matched[self.entries[:, field]] if len(self.entries) else np.zeros(0, dtype=bool)
+        pattern = pattern.lower()
+        if mode == 'substring':
+            matched = np.char.find(lowered, pattern) >= 0
+        elif mode == 'prefix':
+            matched = np.char.startswith(lowered, pattern)
+        elif mode == 'glob':
+            regex = re.compile(fnmatch.translate(pattern))
+            matched = np.array([regex.match(s) is not None for s in lowered.tolist()], dtype=bool)
+        elif mode == 'exact':
+            matched = lowered == pattern
+        else:
+            raise ValueError(f'unknown search mode {mode}')
+        return matched[self.entries[:, field]] if len(self.entries) else np.zeros(0, dtype=bool)
+
+    def search(self, pattern: str, frequency=None, mode=None):
+        """
+        Search variables whose key or type matches a pattern.
+
+        Parameters
+        ----------
+        pattern : str
+            Text to look for. Patterns holding '*', '?' or '[' are treated as globs.
+        frequency : str, optional
+            Limit the search to one frequency (e.g. Hourly). Default is None (all frequencies).
+        mode : str, optional
+            'substring', 'prefix', 'glob' or 'regex'. Default is None (glob or substring, guessed from
+            the pattern).
+
+        Raises
+        ------
+        re.error
+            When `pattern` is not a valid regular expression in 'regex' mode.
+
+        Returns
+        -------
+        list of Variable
+        """
+        if mode is None:
+            mode = 'glob' if re.search(r'[*?\[]', pattern) else 'substring'
+        mask = self.field_mask(0, pattern, mode) | self.field_mask(1, pattern, mode)
+        if frequency is not None:
+            mask &= self.field_mask(3, to_sql_frequency(frequency), 'exact')
+        return list(dict.fromkeys(self.variable(e) for e in np.flatnonzero(mask)))
+
+    def resolve(self, sql: str, variables: list, frequency, alike=False, stamp=None):
+        """
+        Find the first ReportDataDictionary id of each request in a case, as `sql_reader.get_first_ids`.
+
+        Parameters
+        ----------
+        sql : str
+            Path to the case SQL file.
+        variables : list of Variable
+            Requested variables, None fields match anything.
+        frequency : str
+            The temporal frequency of the data.
+        alike : bool, optional
+            If True, fields only need to contain the requested text (case-insensitive). Default is False.
+        stamp : tuple of int, optional
+            (size, mtime) of the SQL file when the caller already read it. Default is None (read here).
+
+        Returns
+        -------
+        list of int or None
+            Ids of the requests, None if the case is not in the catalogue or changed since.
+
+        Raises
+        ------
+        NoResults
+            When any of the requested variables cannot be found.
+        """
+        i = self.__case_index.get(os.path.normpath(os.path.abspath(sql)))
+        if i is None or tuple(self.stamps[i]) != tuple(sql_stamp(sql) if stamp is None else stamp):
+            return None
+        column = self.layouts[:, self.case_layout[i]]
+        reported = (column >= 0) & self.field_mask(3, to_sql_frequency(frequency), 'exact')
+        ids = []
+        for variable in variables:
+            mask = reported.copy()
+            for field, value in enumerate(variable):
+                if value is not None:
+                    if alike:
+                        mask &= self.field_mask(field, value, 'substring')
+                    else:
+                        # strings are sorted and unique, an exact value is a single code
+                        code = int(np.searchsorted(self.strings, value))
+                        if code == len(self.strings) or self.strings[code] != value:
+                            mask[:] = False
+                        else:
+                            mask &= self.entries[:, field] == code
+            found = np.flatnonzero(mask)
+            if len(found) == 0:
+                raise exceptions.NoResults("Variable {} not found.".format(variable))
+            ids.append(int(column[found[0]]))
+        return ids
+
+
+def read_dictionary_rows(sql: str):
+    """
+    Rows (id, key, type, units, frequency) of the data dictionary of a .sql or .eso file.
+    """
+    if os.path.splitext(sql)[1].lower() == '.eso':
+        return get_eso_dictionary_rows(sql)
+    conn = sqlite3.connect(sql)
+    try:
+        return [(id_, str(key), str(type_), str(units), frequency) for id_, key, type_, units, frequency in
+                conn.execute("SELECT ReportDataDictionaryIndex, KeyValue, Name, Units, ReportingFrequency"
+                             " FROM ReportDataDictionary ORDER BY ReportDataDictionaryIndex")]
+    finally:
+        conn.close()
+
+
+def sql_stamp(sql: str):
+    stat = os.stat(sql)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def load_catalogue(folder: str, sql_list: list):
+    """
+    Load the catalogue persisted under `folder`, rebuilding it when case files were added or changed.
+
+    Parameters
+    ----------
+    folder : str
+        Folder holding `catalogue.npz`, usually the `result` folder of the project.
+    sql_list : list of str
+        Paths to the case SQL files.
+
+    Returns
+    -------
+    VariableCatalogue
+    """
+    path = os.path.join(folder, CATALOGUE_FILE)
+    previous = None
+    if os.path.isfile(path):
+        try:
+            previous = VariableCatalogue.load(path)
+        except Exception as e:
+            print(e)
+    if previous is not None and previous.is_current(sql_list):
+        return previous
+    catalogue = VariableCatalogue.build(sql_list, previous)
+    try:
+        catalogue.save(path)
+    except Exception as e:
+        print(e)
+    return catalogue
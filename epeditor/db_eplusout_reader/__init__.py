@@ -1,5 +1,5 @@
 __version__ = "0.1.0"
 
-from db_eplusout_reader.db_esofile import DBEsoFile, DBEsoFileCollection
-from db_eplusout_reader.get_results import get_results
-from db_eplusout_reader.processing.esofile_reader import Variable
+from .db_esofile import DBEsoFile, DBEsoFileCollection
+from .get_results import get_first_arrays, get_results
+from .processing.esofile_reader import Variable
@@ -1,7 +1,9 @@
-from db_eplusout_reader.constants import RP, TS, A, D, H, M
-from db_eplusout_reader.exceptions import CollectionRequired
-from db_eplusout_reader.processing.esofile_reader import process_eso_file
-from db_eplusout_reader.processing.esofile_time import (
+import numpy as np
+
+from .constants import RP, TS, A, D, H, M
+from .exceptions import CollectionRequired
+from .processing.esofile_reader import process_eso_file
+from .processing.esofile_time import (
     convert_raw_date_data,
     get_n_days_from_cumulative,
 )
@@ -20,10 +22,10 @@ class DBEsoFile:
             A name of the environment.
         header : dict of {str, dict of {int, Variable}}
             Processed header dictionary.
-        outputs : dict of {str, dict of {int, list of float}}
-            Processed numeric outputs.
-        dates : dict of {str, datetime}
-            Parsed dates.
+        outputs : dict of {str, dict of {int, numpy.ndarray}}
+            Processed numeric outputs, rows of the float64 blocks of 'RawOutputData'.
+        dates : dict of {str, numpy.ndarray of datetime64[m]}
+            Parsed dates, time index of each frequency.
         n_days : dict of {str, list of int}
             Number of days for each step for monthly to runperiod frequencies.
         days_of_week:
@@ -46,28 +48,29 @@ class DBEsoFile:
         }
         outputs {
             'hourly' : {
-               322 : [17.906587634970627, 17.198486368112462, 16.653197201251096, ...]
-               304 : [0.006551864336487204, 0.0061786832466626095, 0.005800374315868216, ...]
+               322 : array([17.906587634970627, 17.198486368112462, 16.653197201251096, ...])
+               304 : array([0.006551864336487204, 0.0061786832466626095, 0.005800374315868216, ...])
                 ...
             },
             'daily' : {
-                521 : [38.83017767728567, 48.74604212532369, 41.69013850729892, ...]
-                565 : [43.25127519033924, 55.42681891740626, 42.215387940031526, ...]
+                521 : array([38.83017767728567, 48.74604212532369, 41.69013850729892, ...])
+                565 : array([43.25127519033924, 55.42681891740626, 42.215387940031526, ...])
                 ...
             }
         }
         dates {
-            'hourly' : [
-                datetime.datetime(2002, 1, 1, 1, 0),
-                datetime.datetime(2002, 1, 1, 2, 0),
-                datetime.datetime(2002, 1, 1, 3, 0),
+            'hourly' : array([
+                '2002-01-01T01:00',
+                '2002-01-01T02:00',
+                '2002-01-01T03:00',
                 ...
-            ],
-            'daily' : [
-                datetime.datetime(2002, 1, 1, 0, 0),
-                datetime.datetime(2002, 1, 2, 0, 0),
-                datetime.datetime(2002, 1, 3, 0, 0),
+            ], dtype='datetime64[m]'),
+            'daily' : array([
+                '2002-01-01T00:00',
+                '2002-01-02T00:00',
+                '2002-01-03T00:00',
                 ...
+            ], dtype='datetime64[m]')
         }
         n_days {
             'monthly': [31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31],
@@ -120,7 +123,7 @@ class DBEsoFile:
         )
 
     @classmethod
-    def from_path(cls, file_path, year=None):
+    def from_path(cls, file_path, year=None, ids=None):
         """
         Create an instance from a given file path.
         
@@ -130,6 +133,8 @@ class DBEsoFile:
             Path to the ESO file to be processed.
         year : int, optional
             The calendar year to associate with the data. If not provided, defaults to None.
+        ids : set of int, optional
+            Result ids to be read, see `process_eso_file`. If not provided, all variables are read.
         
         Returns
         -------
@@ -137,7 +142,7 @@ class DBEsoFile:
             An instance of DBEsoFile constructed from the processed ESO file data.
         
         """
-        all_raw_outputs = process_eso_file(file_path)
+        all_raw_outputs = process_eso_file(file_path, ids)
         if len(all_raw_outputs) == 1:
             return cls._from_raw_outputs(all_raw_outputs[0], year)
         raise CollectionRequired(
@@ -148,6 +153,22 @@ class DBEsoFile:
             "".format(file_path)
         )
 
+    def time_index(self, frequency):
+        """
+        Timestamps of given frequency.
+
+        Parameters
+        ----------
+        frequency : str
+            An output interval, this can be one of {TS, H, D, M, A, RP} constants.
+
+        Returns
+        -------
+        numpy.ndarray of datetime64[m]
+            Empty when the frequency is not reported.
+        """
+        return self.dates.get(frequency.lower(), np.empty(0, dtype="datetime64[m]"))
+
     @property
     def frequencies(self):
         """
@@ -194,7 +215,7 @@ class DBEsoFileCollection:
         self._db_eso_files = [] if not db_eso_files else db_eso_files
 
     @classmethod
-    def from_path(cls, file_path, year=None):
+    def from_path(cls, file_path, year=None, ids=None):
         """
         Create an instance from a file path by processing ESO data.
         
@@ -206,13 +227,15 @@ class DBEsoFileCollection:
             Path to the ESO file to be processed.
         year : int, optional
             The year to associate with the ESO data. If not provided, defaults to None.
+        ids : set of int, optional
+            Result ids to be read, see `process_eso_file`. If not provided, all variables are read.
         
         Returns
         -------
         cls
             An instance of the class containing processed DBEsoFile objects.
         """
-        all_raw_outputs = process_eso_file(file_path)
+        all_raw_outputs = process_eso_file(file_path, ids)
         db_eso_files = []
         for raw_outputs in all_raw_outputs:
             db_eso_file = DBEsoFile._from_raw_outputs(raw_outputs, year)
@@ -0,0 +1,251 @@
+from collections import OrderedDict
+
+import numpy as np
+
+from .db_esofile import DBEsoFile, DBEsoFileCollection
+from .exceptions import NoResults
+from .processing.esofile_reader import Variable, read_eso_header
+from .results_dict import ResultsDictionary
+from .sql_reader import get_window_mask, to_sql_frequency
+
+
+def to_frequency(frequency):
+    """Normalize frequency to the keys used by eso header."""
+    return frequency.lower()
+
+
+def to_environments(eso_file):
+    """List processed environments of given file."""
+    if isinstance(eso_file, DBEsoFileCollection):
+        return list(eso_file)
+    return [eso_file]
+
+
+def to_sql_variable(variable):
+    """
+    Convert header 'Variable' to the syntax of .sql 'ReportDataDictionary'.
+
+    Eso header keys meters as 'Meter' or 'Cumulative Meter' and prefixes
+    cumulative meter names with 'Cumulative ', the .sql dictionary keys
+    them as '' or 'Cumulative' with plain names.
+
+    """
+    key, type_, units = variable
+    if key == "Meter":
+        return Variable("", type_, units)
+    if key == "Cumulative Meter":
+        if type_.startswith("Cumulative "):
+            type_ = type_[len("Cumulative "):]
+        return Variable("Cumulative", type_, units)
+    return variable
+
+
+def is_match(candidate, variable, alike):
+    """
+    Check if header 'Variable' matches requested 'Variable'.
+
+    Matching follows 'sql_reader.fetch_data_dict_rows', full match is
+    case sensitive while 'alike' match is a case insensitive substring.
+
+    """
+    for requested, value in zip(variable, candidate):
+        if requested is None:
+            continue
+        if alike:
+            if requested.lower() not in str(value).lower():
+                return False
+        elif requested != value:
+            return False
+    return True
+
+
+def get_eso_ids_dict(header, variables, frequency, alike):
+    """Find id : Variable pairs for given 'Variable' request."""
+    all_ids_dict = OrderedDict()
+    candidates = [
+        (to_sql_variable(Variable(*map(str, candidate))), id_)
+        for candidate, id_ in header.get(to_frequency(frequency), {}).items()
+    ]
+    for variable in variables:
+        matches = [
+            (candidate, id_)
+            for candidate, id_ in candidates
+            if is_match(candidate, variable, alike)
+        ]
+        for candidate, id_ in sorted(matches):
+            all_ids_dict[id_] = candidate
+    return all_ids_dict
+
+
+def get_first_eso_ids(header, variables, frequency, alike):
+    """
+    Find the first matching id for each requested 'Variable'.
+
+    Raises
+    ------
+    NoResults
+        When any of the requested variables cannot be found.
+
+    """
+    ids = []
+    for variable in variables:
+        ids_dict = get_eso_ids_dict(header, [variable], frequency, alike)
+        if not ids_dict:
+            raise NoResults("Variable {} not found.".format(variable))
+        ids.append(next(iter(ids_dict)))
+    return ids
+
+
+def get_eso_timestamps(eso_file, frequency):
+    """Fetch timestamps of all environments as 'datetime64[m]' array."""
+    dates = [environment.time_index(frequency) for environment in to_environments(eso_file)]
+    return np.concatenate(dates) if dates else np.empty(0, dtype="datetime64[m]")
+
+
+def get_eso_outputs_array(eso_file, ids, frequency):
+    """
+    Fetch outputs of given ids into a float64 array.
+
+    Returns
+    -------
+    numpy.ndarray
+        Array of shape (len(ids), n_steps), environments are concatenated
+        and steps without reported value are NaN.
+
+    """
+    frequency = to_frequency(frequency)
+    blocks = []
+    for environment in to_environments(eso_file):
+        n_steps = len(environment.time_index(frequency))
+        outputs = environment.outputs.get(frequency, {})
+        block = np.full((len(ids), n_steps), np.nan)
+        for i, id_ in enumerate(ids):
+            if id_ in outputs:
+                block[i] = outputs[id_]
+        blocks.append(block)
+    if not blocks:
+        return np.empty((len(ids), 0))
+    return np.concatenate(blocks, axis=1)
+
+
+def get_header(eso_file):
+    """Merge headers of all environments."""
+    header = {}
+    for environment in to_environments(eso_file):
+        for frequency, variables in environment.header.items():
+            header.setdefault(frequency, {}).update(variables)
+    return header
+
+
+def get_results_from_eso_file(
+    eso_file, variables, frequency, alike=False, start_date=None, end_date=None, batched=False
+):
+    """
+    Extract output values from processed EnergyPlus .eso file.
+
+    Parameters
+    ----------
+    eso_file : DBEsoFile or DBEsoFileCollection
+        Processed EnergyPlus .eso file, outputs of all environments
+        of a collection are concatenated.
+    variables : Variable or List of Variable
+        Requested output variables.
+    frequency : str
+        An output interval, this can be one of {TS, H, D, M, A, RP} constants.
+    alike : default False, bool
+        Specify if full string or only part of variable attribute
+        needs to match, filtering is case insensitive in that case.
+    start_date : default None, datetime.datetime
+        Lower datetime interval boundary, inclusive.
+    end_date : default None, datetime.datetime
+        Upper datetime interval boundary, inclusive.
+    batched : default False, bool
+        Kept for parity with 'get_results_from_sql', values are always
+        rows of a float64 (n_variables, n_steps) array.
+
+    Returns
+    -------
+    ResultsDictionary : Dict of {Variable, numpy.ndarray}
+
+    """
+    variables = [variables] if isinstance(variables, Variable) else variables
+    ids_dict = get_eso_ids_dict(get_header(eso_file), variables, frequency, alike)
+    timestamps = get_eso_timestamps(eso_file, frequency)
+    array = get_eso_outputs_array(eso_file, list(ids_dict.keys()), frequency)
+    if start_date or end_date:
+        mask = get_window_mask(timestamps, start_date, end_date)
+        array, timestamps = array[:, mask], timestamps[mask]
+
+    rd = ResultsDictionary(frequency)
+    rd.array = array
+    for variable, row in zip(ids_dict.values(), array):
+        rd[variable] = row
+    rd.time_series = timestamps
+    return rd
+
+
+def get_results_from_eso(
+    path, variables, frequency, alike=False, start_date=None, end_date=None, batched=False
+):
+    """
+    Extract output values from given EnergyPlus .eso file, see 'get_results_from_eso_file'.
+
+    Only the requested variables are parsed from the file body.
+
+    """
+    variables = [variables] if isinstance(variables, Variable) else variables
+    ids = get_eso_ids_dict(read_eso_header(path), variables, frequency, alike).keys()
+    eso_file = DBEsoFileCollection.from_path(path, ids=set(ids))
+    return get_results_from_eso_file(
+        eso_file, variables, frequency, alike, start_date, end_date, batched
+    )
+
+
+def get_first_arrays_from_eso(
+    path, variables, frequency, alike=False, start_date=None, end_date=None
+):
+    """
+    Extract the first match of each requested variable from an .eso file.
+
+    Returns
+    -------
+    tuple of (numpy.ndarray, numpy.ndarray of datetime64[m])
+        Float64 array of shape (n_requested_variables, n_steps), rows
+        follow the order of requested variables, and result timestamps.
+
+    Raises
+    ------
+    NoResults
+        When any of the requested variables cannot be found.
+
+    """
+    variables = [variables] if isinstance(variables, Variable) else variables
+    ids = get_first_eso_ids(read_eso_header(path), variables, frequency, alike)
+    eso_file = DBEsoFileCollection.from_path(path, ids=set(ids))
+    timestamps = get_eso_timestamps(eso_file, frequency)
+    array = get_eso_outputs_array(eso_file, ids, frequency)
+    if start_date or end_date:
+        mask = get_window_mask(timestamps, start_date, end_date)
+        array, timestamps = array[:, mask], timestamps[mask]
+    return array, timestamps
+
+
+def get_eso_dictionary_rows(path):
+    """
+    Read data dictionary of an .eso file as .sql 'ReportDataDictionary' rows.
+
+    Returns
+    -------
+    list of (int, str, str, str, str)
+        (id, key, type, units, sql frequency) sorted by id.
+
+    """
+    rows = []
+    for frequency, variables in read_eso_header(path).items():
+        try:
+            sql_frequency = to_sql_frequency(frequency)
+        except KeyError:
+            continue
+        for variable, id_ in variables.items():
+            rows.append((id_,) + tuple(to_sql_variable(Variable(*map(str, variable)))) + (sql_frequency,))
+    return sorted(rows)
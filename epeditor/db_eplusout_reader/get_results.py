@@ -1,11 +1,18 @@
 import os
 
-from db_eplusout_reader.db_esofile import DBEsoFile, DBEsoFileCollection
-from db_eplusout_reader.sql_reader import get_results_from_sql
+from .db_esofile import DBEsoFile, DBEsoFileCollection
+from .eso_reader import get_first_arrays_from_eso, get_results_from_eso, get_results_from_eso_file
+from .sql_reader import get_first_arrays_from_sql, get_results_from_sql
 
 
 def get_results(
-    file_or_path, variables, frequency, alike=False, start_date=None, end_date=None
+    file_or_path,
+    variables,
+    frequency,
+    alike=False,
+    start_date=None,
+    end_date=None,
+    batched=False,
 ):
     """
     Extract results from an EnergyPlus output file based on specified variables and frequency.
@@ -27,6 +34,9 @@ def get_results(
         Lower bound for date filtering (inclusive). If None, no lower bound is applied.
     end_date : datetime.datetime, optional
         Upper bound for date filtering (inclusive). If None, no upper bound is applied.
+    batched : bool, optional
+        If True, all matching variables are fetched with a single query
+        into a float64 (n_variables, n_steps) array (see ResultsDictionary.array).
     
     Returns
     -------
@@ -118,6 +128,8 @@ def get_results(
         Lower datetime interval boundary, inclusive.
     end_date : default None, datetime.datetime
         Upper datetime interval boundary, inclusive.
+    batched : default False, bool
+        Fetch all numeric outputs with a single query.
 
     Returns
     -------
@@ -135,16 +147,91 @@ def get_results(
                 alike=alike,
                 start_date=start_date,
                 end_date=end_date,
+                batched=batched,
             )
         elif ext == ".eso":
-            raise NotImplementedError("Sorry, this has not been implemented yet.")
+            results = get_results_from_eso(
+                file_or_path,
+                variables,
+                frequency,
+                alike=alike,
+                start_date=start_date,
+                end_date=end_date,
+                batched=batched,
+            )
         else:
             raise TypeError("Unsupported file type '{}' provided!".format(ext))
     else:
         if isinstance(file_or_path, (DBEsoFile, DBEsoFileCollection)):
-            raise NotImplementedError("Sorry, this has not been implemented yet.")
+            results = get_results_from_eso_file(
+                file_or_path,
+                variables,
+                frequency,
+                alike=alike,
+                start_date=start_date,
+                end_date=end_date,
+                batched=batched,
+            )
         else:
             raise TypeError(
                 "Unsupported class '{}' provided!".format(type(file_or_path).__name__)
             )
     return results
+
+
+def get_first_arrays(
+    file_or_path, variables, frequency, alike=False, start_date=None, end_date=None
+):
+    """
+    Extract the first match of each requested variable as a single array.
+
+    Unlike 'get_results', rows are aligned with requested variables
+    so the function can be used to read many variables from one
+    file in a single pass.
+
+    Parameters
+    ----------
+    file_or_path : PathLike
+        A path to unprocessed .sql or .eso file.
+    variables : Variable or list of Variable
+        Requested output variables.
+    frequency : str
+        An output interval, this can be one of {TS, H, D, M, A, RP} constants.
+    alike : default False, bool
+        Specify if full string or only part of variable attribute
+        needs to match.
+    start_date : default None, datetime.datetime
+        Lower datetime interval boundary, inclusive.
+    end_date : default None, datetime.datetime
+        Upper datetime interval boundary, inclusive.
+
+    Returns
+    -------
+    tuple of (numpy.ndarray, numpy.ndarray of datetime64[m])
+        Float64 (n_requested_variables, n_steps) array and timestamps.
+
+    """
+    if isinstance(file_or_path, str):
+        _, ext = os.path.splitext(file_or_path)
+        if ext == ".sql":
+            return get_first_arrays_from_sql(
+                file_or_path,
+                variables,
+                frequency,
+                alike=alike,
+                start_date=start_date,
+                end_date=end_date,
+            )
+        if ext == ".eso":
+            return get_first_arrays_from_eso(
+                file_or_path,
+                variables,
+                frequency,
+                alike=alike,
+                start_date=start_date,
+                end_date=end_date,
+            )
+        raise TypeError("Unsupported file type '{}' provided!".format(ext))
+    raise TypeError(
+        "Unsupported class '{}' provided!".format(type(file_or_path).__name__)
+    )
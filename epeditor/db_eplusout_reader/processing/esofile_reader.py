@@ -1,16 +1,19 @@
+import mmap
 import re
 from collections import defaultdict, namedtuple
 from datetime import datetime
 from functools import partial
 
-from db_eplusout_reader.constants import RP, TS, A, D, H, M
-from db_eplusout_reader.exceptions import (
+import numpy as np
+
+from ..constants import RP, TS, A, D, H, M
+from ..exceptions import (
     BlankLineError,
     IncompleteFile,
     InvalidLineSyntax,
 )
-from db_eplusout_reader.processing.esofile_time import EsoTimestamp
-from db_eplusout_reader.processing.raw_eso_data import RawOutputData
+from .esofile_time import EsoTimestamp
+from .raw_eso_data import RawOutputData
 
 ENVIRONMENT_LINE = 1
 TIMESTEP_OR_HOURLY_LINE = 2
@@ -19,6 +22,11 @@ MONTHLY_LINE = 4
 RUNPERIOD_LINE = 5
 ANNUAL_LINE = 6
 
+# body is scanned in chunks of this many bytes by the selective parser
+CHUNK_SIZE = 64 * 1024 * 1024
+# longest line id handled by the selective parser
+MAX_ID_DIGITS = 9
+
 Variable = namedtuple("Variable", "key type units")
 
 
@@ -310,10 +318,14 @@ def read_body(eso_file, highest_frequency_id, header):
                 raw_outputs, frequency = process_frequency_line(
                     line_id, line, all_raw_outputs, header, raw_outputs
                 )
+                if frequency is not None:
+                    # column of the current step, blocks only grow on frequency lines
+                    rows = raw_outputs.rows[frequency]
+                    column = raw_outputs.blocks[frequency][:, raw_outputs.n_steps[frequency] - 1]
             else:
                 # current line represents a result, replace nan values from the last step
                 res = float(line[0])
-                raw_outputs.outputs[frequency][line_id][-1] = res
+                column[rows[line_id]] = res
 
         except ValueError:
             if "End of Data" in raw_line:
@@ -325,8 +337,8 @@ def read_body(eso_file, highest_frequency_id, header):
     return all_raw_outputs
 
 
-def read_file(file):
-    """Read raw EnergyPlus output file."""
+def read_preamble(file):
+    """Read statement and header lines, return the highest frequency id and the header."""
     # process first few standard lines, ignore timestamp
     version, _ = process_statement_line(next(file))
     last_standard_item_id = 6 if version >= 890 else 5
@@ -337,16 +349,199 @@ def read_file(file):
 
     # Read header to obtain a header dictionary of EnergyPlus
     # outputs and initialize dictionary for output values
-    header = read_header(file)
+    return last_standard_item_id, read_header(file)
+
+
+def filter_header(header, ids):
+    """Keep only given ids in the header, all frequencies are kept."""
+    filtered = defaultdict(partial(defaultdict))
+    for frequency, variables in header.items():
+        filtered[frequency] = defaultdict(
+            None, ((v, id_) for v, id_ in variables.items() if id_ in ids)
+        )
+    return filtered
+
+
+def iter_chunks(buffer, start, chunk_size):
+    """Split buffer from 'start' into (start, end) spans ending on a line break."""
+    size = len(buffer)
+    while start < size:
+        end = min(start + chunk_size, size)
+        if end < size:
+            end = buffer.rfind(b"\n", start, end) + 1
+            if end <= start:
+                # a single line longer than the chunk
+                end = buffer.find(b"\n", start + chunk_size) + 1 or size
+        yield start, end
+        start = end
+
+
+def parse_line_ids(data, starts, ends):
+    """
+    Parse leading integer of many lines at once.
+
+    Parameters
+    ----------
+    data : numpy.ndarray of uint8
+        Raw bytes.
+    starts, ends : numpy.ndarray of int
+        First and past the last byte of each line.
+
+    Returns
+    -------
+    tuple of (numpy.ndarray of int, numpy.ndarray of int)
+        Line ids and the position following the id (the comma),
+        lines without leading digits keep the 'starts' position.
+
+    """
+    ids = np.zeros(len(starts), dtype=np.int64)
+    n_digits = np.zeros(len(starts), dtype=np.int64)
+    active = starts < ends
+    last = len(data) - 1
+    for k in range(MAX_ID_DIGITS):
+        # bytes below '0' wrap around to large values
+        digit = data[np.minimum(starts + k, last)] - np.uint8(48)
+        active &= (digit <= 9) & (starts + k < ends)
+        if not active.any():
+            break
+        ids = np.where(active, ids * 10 + digit, ids)
+        n_digits += active
+    return ids, starts + n_digits
+
+
+def read_body_selective(buffer, offset, highest_frequency_id, header, ids, chunk_size=CHUNK_SIZE):
+    """
+    Read body of the eso file keeping only given result ids.
+
+    The body is scanned in large chunks, line ids are parsed with NumPy
+    so unrequested result lines are dropped without being split or decoded.
+    Values of the kept lines are converted to float in one call per chunk.
+
+    Parameters
+    ----------
+    buffer : mmap.mmap or bytes
+        Raw eso file content.
+    offset : int
+        Position of the first body line.
+    highest_frequency_id : int
+        A maximum index defining an frequency (higher is considered a result)
+    header : dict of {str: dict of {Variable : int}}
+        Processed header dictionary, filtered to requested ids.
+    ids : set of int
+        Result ids to be kept.
+    chunk_size : int, default CHUNK_SIZE
+        Number of bytes processed at once.
+
+    Returns
+    -------
+    list of RawOutputData
+        Processed ESO file data.
+
+    """
+    all_raw_outputs = []
+    raw_outputs = None
+    frequency = None
+    wanted = np.array(sorted(ids), dtype=np.int64)
+    for start, end in iter_chunks(buffer, offset, chunk_size):
+        data = np.frombuffer(buffer, dtype=np.uint8, count=end - start, offset=start)
+        ends = np.flatnonzero(data == 10)
+        if len(ends) == 0 or ends[-1] != len(data) - 1:
+            ends = np.append(ends, len(data))
+        starts = np.concatenate(([0], ends[:-1] + 1))
+        line_ids, commas = parse_line_ids(data, starts, ends)
+
+        has_id = commas > starts
+        keep = np.flatnonzero(
+            ~has_id | (line_ids <= highest_frequency_id) | np.isin(line_ids, wanted)
+        )
+        # (environment, frequency) : (rows, steps, positions in values)
+        targets, values = {}, []
+        finished = False
+        for i in keep.tolist():
+            line_id = int(line_ids[i])
+            if not has_id[i]:
+                raw_line = bytes(buffer[start + starts[i]:start + ends[i] + 1]).decode()
+                if "End of Data" in raw_line:
+                    finished = True
+                    break
+                if raw_line.strip("\r\n") == "":
+                    raise BlankLineError("Empty line!")
+                raise InvalidLineSyntax("Unexpected line syntax: '{}'!".format(raw_line))
+            if line_id <= highest_frequency_id:
+                raw_line = bytes(buffer[start + commas[i] + 1:start + ends[i]]).decode()
+                raw_outputs, frequency = process_frequency_line(
+                    line_id, raw_line.rstrip("\r").split(","), all_raw_outputs, header, raw_outputs
+                )
+            else:
+                # only the first value is stored, monthly+ lines hold min / max columns too
+                first = start + commas[i] + 1
+                last = buffer.find(b",", first, start + ends[i])
+                rows, steps, positions = targets.setdefault(
+                    (len(all_raw_outputs) - 1, frequency), ([], [], [])
+                )
+                rows.append(raw_outputs.rows[frequency][line_id])
+                steps.append(raw_outputs.n_steps[frequency] - 1)
+                positions.append(len(values))
+                values.append(buffer[first:last if last >= 0 else start + ends[i]])
+        values = np.array(values, dtype=bytes).astype(np.float64)
+        for (environment, frequency_), (rows, steps, positions) in targets.items():
+            all_raw_outputs[environment].blocks[frequency_][rows, steps] = values[positions]
+        if finished:
+            return all_raw_outputs
+    raise IncompleteFile("File is not complete!")
+
+
+def read_file(file):
+    """Read raw EnergyPlus output file."""
+    last_standard_item_id, header = read_preamble(file)
 
     # Read body to obtain outputs and environment dictionaries
     return read_body(file, last_standard_item_id, header)
 
 
-def process_eso_file(file_path):
-    """Trigger eso file processing."""
+def read_file_selective(file_path, ids):
+    """Read raw EnergyPlus output file keeping only given result ids."""
+    with open(file_path, "r") as file:
+        last_standard_item_id, header = read_preamble(file)
+    header = filter_header(header, ids)
+    with open(file_path, "rb") as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            dictionary_end = buffer.find(b"End of Data Dictionary")
+            offset = buffer.find(b"\n", dictionary_end) + 1
+            try:
+                return read_body_selective(
+                    buffer, offset, last_standard_item_id, header, set(ids)
+                )
+            except IncompleteFile:
+                raise IncompleteFile("File '{}' is not complete!".format(file_path))
+
+
+def process_eso_file(file_path, ids=None):
+    """
+    Trigger eso file processing.
+
+    Parameters
+    ----------
+    file_path : str
+        Path to the eso file.
+    ids : default None, set of int
+        Result ids to be read, other variables are skipped and dropped
+        from the header. All variables are read when None.
+
+    """
     try:
+        if ids is not None:
+            return read_file_selective(file_path, ids)
         with open(file_path, "r") as file:
             return read_file(file)
     except StopIteration:
         raise IncompleteFile("File '{}' is not complete!".format(file_path))
+
+
+def read_eso_header(file_path):
+    """Read only the data dictionary of an eso file."""
+    try:
+        with open(file_path, "r") as file:
+            return read_preamble(file)[1]
+    except StopIteration:
+        raise IncompleteFile("File '{}' is not complete!".format(file_path))
@@ -2,9 +2,12 @@ import calendar
 import logging
 from collections import namedtuple
 from datetime import datetime, timedelta
+from itertools import chain
 
-from db_eplusout_reader.constants import RP, TS, A, D, H, M
-from db_eplusout_reader.exceptions import LeapYearMismatch, StartDayMismatch
+import numpy as np
+
+from ..constants import RP, TS, A, D, H, M
+from ..exceptions import LeapYearMismatch, StartDayMismatch
 
 EsoTimestamp = namedtuple("EsoTimestamp", "month day hour end_minute")
 
@@ -57,6 +60,62 @@ def parse_eso_timestamp(year, month, day, hour, end_minute):
     return corrected_datetime
 
 
+def parse_eso_timestamp_columns(years, months, days, hours, end_minutes):
+    """
+    Convert EnergyPlus time columns to 'datetime64[m]' array.
+
+    This is a vectorized equivalent of 'parse_eso_timestamp'.
+
+    Parameters
+    ----------
+    years, months, days, hours, end_minutes : numpy.ndarray of int
+        Year of each step and raw eso date columns.
+
+    Returns
+    -------
+    numpy.ndarray of datetime64[m]
+        Parsed timestamps.
+
+    Raises
+    ------
+    ValueError
+        When a day does not exist in its month (i.e. 29th February of standard year).
+
+    """
+    month_starts = ((years - 1970) * 12 + months - 1).astype("datetime64[M]")
+    month_lengths = (month_starts + 1).astype("datetime64[D]") - month_starts.astype("datetime64[D]")
+    if np.any((months < 1) | (months > 12) | (days < 1) | (days > month_lengths.astype(np.int64))):
+        raise ValueError("day is out of range for month")
+
+    # end minute 60 closes the hour, hour 24 rolls over to the next day
+    minutes = np.where(
+        end_minutes == 60, hours * 60, np.where(hours == 0, end_minutes, (hours - 1) * 60 + end_minutes)
+    )
+    offsets = (days - 1) * 1440 + minutes
+    return month_starts.astype("datetime64[m]") + offsets.astype("timedelta64[m]")
+
+
+def to_date_columns(raw_dates):
+    """Stack raw 'EsoTimestamp' list into (n_steps, 4) int array."""
+    if isinstance(raw_dates, np.ndarray):
+        return raw_dates.reshape(-1, 4)
+    flat = chain.from_iterable(raw_dates)
+    return np.fromiter(flat, dtype=np.int64, count=4 * len(raw_dates)).reshape(-1, 4)
+
+
+def get_year_offsets(columns):
+    """
+    Number of years elapsed since the first step for each step.
+
+    Year is incremented whenever a step does not follow the previous one,
+    (month, day, hour, end minute) tuples are compared as a single key.
+
+    """
+    months, days, hours, end_minutes = columns.T
+    keys = ((months * 32 + days) * 25 + hours) * 61 + end_minutes
+    return np.concatenate(([0], np.cumsum(keys[1:] <= keys[:-1])))
+
+
 def get_month_n_days_from_cumulative(monthly_cumulative_days):
     """
     Transform consecutive number of days in monthly data to actual number of days.
@@ -96,26 +155,11 @@ def get_num_of_days(cumulative_days):
     return num_of_days
 
 
-def check_year_increment(first_step_data, current_step_data):
-    """Check if year value should be incremented inside environment table."""
-    if first_step_data is current_step_data:
-        # do not increment first step
-        return False
-    return first_step_data >= current_step_data
-
-
 def generate_datetime_dates(raw_dates, year):
-    """Generate datetime index for a given period."""
-    dates = []
-    for i in range(0, len(raw_dates)):
-        # based on the first, current and previous
-        # steps decide if the year should be incremented
-        if check_year_increment(raw_dates[0], raw_dates[i]):
-            year += 1
-        # year can be incremented automatically when converting to datetime
-        date = parse_eso_timestamp(year, *raw_dates[i])
-        dates.append(date)
-    return dates
+    """Generate 'datetime64[m]' index for a given period."""
+    columns = to_date_columns(raw_dates)
+    years = year + get_year_offsets(columns)
+    return parse_eso_timestamp_columns(years, *columns.T)
 
 
 def update_start_dates(dates):
@@ -124,44 +168,20 @@ def update_start_dates(dates):
     
     Parameters
     ----------
-    dates : list of str or pandas.DatetimeIndex
-        List of date strings or a DatetimeIndex representing the original dates.
+    dates : dict of {str: numpy.ndarray of datetime64[m]}
+        Timestamps of each frequency.
     
     Returns
     -------
-    list of str
-        Updated list of date strings with accurate start dates for monthly or longer frequency tables.
+    dict of {str: numpy.ndarray of datetime64[m]}
+        Updated timestamps with accurate start dates for monthly or longer frequency tables.
     """
-    """Set accurate first date for monthly+ tables."""
-
-    def set_start_date(orig, refs):
-        """
-        Set the start date of a time series by updating the first timestamp to midnight.
-        
-        Parameters
-        ----------
-        orig : list of datetime
-            The original list of datetime objects to be modified.
-        refs : dict of {str: list of datetime}
-            A dictionary containing reference datetime lists; only the first value is used
-            to set the start date.
-        
-        Returns
-        -------
-        list of datetime
-            The modified original list with the first timestamp updated to have hour and minute set to zero.
-        """
-        for ref in refs.values():
-            orig[0] = ref[0].replace(hour=0, minute=0)
-            return orig
-
-    timestep_to_monthly_dates = {k: dates[k] for k in dates if k in [TS, H, D, M]}
-    if timestep_to_monthly_dates:
+    # the first day of the finest frequency holding any step is the reference
+    refs = [dates[k] for k in dates if k in [TS, H, D, M] and len(dates[k])]
+    if refs:
         for frequency in (M, A, RP):
-            if frequency in dates:
-                dates[frequency] = set_start_date(
-                    dates[frequency], timestep_to_monthly_dates
-                )
+            if frequency in dates and len(dates[frequency]):
+                dates[frequency][0] = refs[0][0].astype("datetime64[D]")
     return dates
 
 
@@ -232,13 +252,10 @@ def validate_year(year, is_leap, date, day):
 
 def is_leap_year_ts_to_d(raw_dates_arr):
     """Check if first year is leap based on timestep, hourly or daily data."""
-    for tup in raw_dates_arr:
-        if (tup.month, tup.day) == (2, 29):
-            return True
-        if check_year_increment(raw_dates_arr[0], tup):
-            # stop once first year is covered
-            return False
-    return False
+    columns = to_date_columns(raw_dates_arr)
+    # only first year is covered
+    first_year = get_year_offsets(columns) == 0
+    return bool(np.any(first_year & (columns[:, 0] == 2) & (columns[:, 1] == 29)))
 
 
 def seek_year(is_leap, date, day, max_year):
@@ -297,24 +314,23 @@ def convert_raw_date_data(
     days_of_week,  #: Dict[str, List[str]],
     year,  #: Optional[int],
 ):
-  """
-  Convert EnergyPlus raw date data into standard datetime format.
-  
-  Parameters
-  ----------
-  raw_dates : Dict[str, List[EsoTimestamp]]
-      Dictionary mapping time frequency strings to lists of EsoTimestamp objects.
-  days_of_week : Dict[str, List[str]]
-      Dictionary mapping time frequency strings to lists of day-of-week names.
-  year : Optional[int]
-      Year to assign to the converted dates. If None, the year is inferred based on leap year and date context.
-  
-  Returns
-  -------
-  Dict[str, List[datetime]]
-      Dictionary with the same keys as `raw_dates`, where values are lists of datetime objects corresponding to the input timestamps.
-  """  # -> Dict[str, List[datetime]]:
-    """Convert EnergyPlus dates into standard datetime format."""
+    """
+    Convert EnergyPlus raw date data into standard datetime format.
+
+    Parameters
+    ----------
+    raw_dates : Dict[str, List[EsoTimestamp]]
+        Dictionary mapping time frequency strings to lists of EsoTimestamp objects.
+    days_of_week : Dict[str, List[str]]
+        Dictionary mapping time frequency strings to lists of day-of-week names.
+    year : Optional[int]
+        Year to assign to the converted dates. If None, the year is inferred based on leap year and date context.
+
+    Returns
+    -------
+    Dict[str, numpy.ndarray]
+        Dictionary with the same keys as `raw_dates`, where values are 'datetime64[m]' arrays corresponding to the input timestamps.
+    """  # -> Dict[str, numpy.ndarray]:
     lowest_frequency = get_lowest_frequency(list(raw_dates.keys()))
     if lowest_frequency in {TS, H, D}:
         lowest_frequency_values = raw_dates[lowest_frequency]
@@ -1,20 +1,23 @@
-from collections import defaultdict
+import numpy as np
 
-from db_eplusout_reader.constants import RP, A, M
+from ..constants import RP, A, M
+
+# number of steps allocated for each frequency before the first growth
+INITIAL_STEPS = 256
 
 
 class RawOutputData:
     def __init__(self, environment_name, header):
         """
         Initialize the simulation environment with given name and header.
-        
+
         Parameters
         ----------
         environment_name : str
             Name of the environment for the simulation.
         header : dict
             Header information containing metadata for the simulation.
-        
+
         Returns
         -------
         None
@@ -23,7 +26,9 @@ class RawOutputData:
         self.environment_name = environment_name
         self.header = header
         (
-            self.outputs,
+            self.rows,
+            self.blocks,
+            self.n_steps,
             self.dates,
             self.cumulative_days,
             self.days_of_week,
@@ -32,20 +37,24 @@ class RawOutputData:
     def initialize_results_bins(self):
         """
         Initialize and return empty data structures for storing results based on frequency and variable IDs.
-        
+
         Parameters
         ----------
         self : object
             The instance of the class containing the `header` attribute, which maps frequency keys to variable dictionaries.
             Expected to have a `header` attribute where keys are frequency constants (e.g., M, A, RP) and values are dictionaries
             mapping variable identifiers to their respective IDs.
-        
+
         Returns
         -------
         tuple
-            A tuple containing four elements:
-            - outputs : collections.defaultdict of dict
-                Nested dictionaries initialized as empty lists for each variable ID, keyed by frequency and ID.
+            A tuple containing six elements:
+            - rows : dict of {str: dict of {int: int}}
+                Row of each variable ID in the block of its frequency.
+            - blocks : dict of {str: numpy.ndarray}
+                Float64 (n_variables, capacity) block of each frequency filled with NaN.
+            - n_steps : dict of {str: int}
+                Number of steps read for each frequency.
             - dates : dict
                 Dictionary with frequency keys and empty list values to store date information.
             - cumulative_days : dict
@@ -53,7 +62,9 @@ class RawOutputData:
             - days_of_week : dict
                 Dictionary with frequency keys (not M, A, RP) and empty list values to store days of the week.
         """
-        outputs = defaultdict(dict)
+        rows = {}
+        blocks = {}
+        n_steps = {}
         dates = {}
         cumulative_days = {}
         days_of_week = {}
@@ -63,24 +74,48 @@ class RawOutputData:
                 cumulative_days[frequency] = []
             else:
                 days_of_week[frequency] = []
-            for id_ in variables.values():
-                outputs[frequency][id_] = []
-        return outputs, dates, cumulative_days, days_of_week
+            rows[frequency] = {id_: i for i, id_ in enumerate(variables.values())}
+            blocks[frequency] = np.full((len(rows[frequency]), INITIAL_STEPS), np.nan)
+            n_steps[frequency] = 0
+        return rows, blocks, n_steps, dates, cumulative_days, days_of_week
 
     def initialize_next_outputs_step(self, frequency):
         """
-        Initialize the next step for outputs at a given frequency by appending NaN values.
-        
+        Start the next step for outputs at a given frequency, growing its block when full.
+
+        Cells of the new step stay NaN until a value is reported.
+
         Parameters
         ----------
         frequency : hashable
-            The key specifying the frequency level in the outputs dictionary whose values 
-            will be extended with NaN.
-        
+            The key specifying the frequency level whose step count is incremented.
+
         Returns
         -------
         None
             This function does not return any value.
         """
-        for value in self.outputs[frequency].values():
-            value.append(float("nan"))
+        n_steps = self.n_steps[frequency]
+        block = self.blocks[frequency]
+        if n_steps == block.shape[1]:
+            grown = np.full((block.shape[0], 2 * n_steps), np.nan)
+            grown[:, :n_steps] = block
+            self.blocks[frequency] = grown
+        self.n_steps[frequency] = n_steps + 1
+
+    def set_output(self, frequency, id_, value):
+        """Write the value of a variable for the current step."""
+        self.blocks[frequency][self.rows[frequency][id_], self.n_steps[frequency] - 1] = value
+
+    def array(self, frequency):
+        """Float64 (n_variables, n_steps) view of the outputs read for a frequency."""
+        return self.blocks[frequency][:, :self.n_steps[frequency]]
+
+    @property
+    def outputs(self):
+        """Dictionary of {frequency: {id: numpy.ndarray}}, values are row views of the blocks."""
+        outputs = {}
+        for frequency, rows in self.rows.items():
+            array = self.array(frequency)
+            outputs[frequency] = {id_: array[row] for id_, row in rows.items()}
+        return outputs
@@ -1,9 +1,50 @@
 import csv
+import gzip
 import sys
 from collections import OrderedDict
 
-from db_eplusout_reader.exceptions import InvalidShape, NoResults
-from db_eplusout_reader.processing.esofile_reader import Variable
+import numpy as np
+
+from .exceptions import InvalidShape, NoResults
+from .processing.esofile_reader import Variable
+
+# number of table cells formatted and written at once when streaming a csv
+CHUNK_CELLS = 2 ** 18
+
+
+def get_chunk_rows(n_columns, chunk_rows=None):
+    """Number of rows in a streamed chunk, None keeps chunks at about CHUNK_CELLS cells."""
+    if chunk_rows is None:
+        chunk_rows = CHUNK_CELLS // max(n_columns, 1)
+    return max(int(chunk_rows), 1)
+
+
+def open_csv(path, append=False, compress=None, newline=""):
+    """
+    Open a text stream for writing a csv file.
+
+    Parameters
+    ----------
+    path : os.PathLike
+        Defines a file path of the csv file.
+    append : bool, default False
+        Add to the end of the file instead of replacing it.
+    compress : default None, bool
+        Write gzip compressed text, None compresses when path ends with '.gz'.
+    newline : default "", str
+        Passed to 'open', "" keeps line endings written by csv writer.
+
+    Returns
+    -------
+    io.TextIOBase
+
+    """
+    mode = "a" if append else "w"
+    if compress is None:
+        compress = str(path).lower().endswith(".gz")
+    if compress:
+        return gzip.open(path, mode + "t", newline=newline)
+    return open(path, mode, newline=newline)
 
 
 class ResultsDictionary(OrderedDict):
@@ -14,7 +55,7 @@ class ResultsDictionary(OrderedDict):
     ----------
     frequency : str
         EnergyPlus reporting interval.
-    time_series : Optional, list of datetime
+    time_series : Optional, numpy.ndarray of datetime64
         Result timestamps.
     scalar : float
         First value of first variable.
@@ -26,6 +67,9 @@ class ResultsDictionary(OrderedDict):
         All Variable named tuples.
     arrays : list of list of float
         All numeric arrays.
+    array : Optional, numpy.ndarray
+        Float64 (n_variables, n_steps) block backing the values
+        when results were fetched in batched mode or from an .eso file.
 
     Raises
     ------
@@ -52,6 +96,7 @@ class ResultsDictionary(OrderedDict):
         super(ResultsDictionary, self).__init__()
         self.frequency = frequency
         self.time_series = None
+        self.array = None
 
     @property
     def _items(self):
@@ -174,10 +219,14 @@ class ResultsDictionary(OrderedDict):
         
         Returns
         -------
-        list
-            A list of arrays extracted from the second element of each item in `self._items`.
+        list or numpy.ndarray
+            A list of arrays extracted from the second element of each item in `self._items`,
+            or the underlying (n_variables, n_steps) block when results were fetched in batched mode.
         """
-        return [v[1] for v in self._items]
+        items = self._items
+        if self.array is not None and len(self.array) == len(items):
+            return self.array
+        return [v[1] for v in items]
 
     def to_table(self, explode_header=True):
         """
@@ -198,7 +247,15 @@ class ResultsDictionary(OrderedDict):
         return ResultsHandler.convert_dict_to_table(self, explode_header)
 
     def to_csv(
-        self, path, explode_header=True, delimiter=",", append=False, title="", **kwargs
+        self,
+        path,
+        explode_header=True,
+        delimiter=",",
+        append=False,
+        title="",
+        compress=None,
+        chunk_rows=None,
+        **kwargs
     ):
         """
         Save results as a csv file.
@@ -216,6 +273,12 @@ class ResultsDictionary(OrderedDict):
             Add results below the last row instead of replacing the .csv.
         title : str
             Add row with given text.
+        compress : default None, bool
+            Write gzip compressed csv, None compresses when path ends with '.gz'.
+        chunk_rows : default None, int
+            Number of rows formatted at once, rows are streamed from the
+            arrays so the whole table is never held in memory.
+            None keeps chunks at about CHUNK_CELLS values.
         **kwargs
             Key word arguments passed to csv writer.
 
@@ -224,9 +287,8 @@ class ResultsDictionary(OrderedDict):
             None
 
         """
-        table = ResultsHandler.convert_dict_to_table(self, explode_header)
-        ResultsWriter.write_table_to_csv(
-            table, path, delimiter, append, title, **kwargs
+        ResultsWriter.stream_dict_to_csv(
+            self, path, explode_header, delimiter, append, title, compress, chunk_rows, **kwargs
         )
 
 
@@ -264,6 +326,8 @@ class ResultsHandler:
             This function modifies the table in place and does not return a value.
         """
         """Add first column with header names and datetime / range data."""
+        # datetime64 arrays are converted to standard datetime objects
+        index = index.tolist() if hasattr(index, "tolist") else list(index)
         index_column = ["" for _ in range(offset)] + index
         for i, item in enumerate(index_column):
             table[i].insert(0, item)
@@ -295,11 +359,59 @@ class ResultsHandler:
             for array in results_dictionary.arrays:
                 row.append(array[i])
             table.append(row)
-        if results_dictionary.time_series:
+        if results_dictionary.time_series is not None and len(results_dictionary.time_series):
             offset = len(Variable._fields) if explode_header else 1
             cls._insert_index_column(table, results_dictionary.time_series, offset)
         return table
 
+    @classmethod
+    def iter_table_chunks(cls, results_dictionary, explode_header, chunk_rows=None):
+        """
+        Iterate over the table of 'convert_dict_to_table' in chunks of rows.
+
+        Values are formatted per chunk straight from the arrays, so memory
+        is bounded by 'chunk_rows' instead of the table size.
+
+        Parameters
+        ----------
+        results_dictionary : ResultsDictionary
+            Results dictionary input.
+        explode_header : bool
+            Split variable into multiple rows if true,
+            otherwise put one variable into one row.
+        chunk_rows : default None, int
+            Number of value rows in each chunk, see 'get_chunk_rows'.
+
+        Yields
+        ------
+        list of list of {str, Variable}
+            Header rows first, then chunks of value rows.
+
+        """
+        header = results_dictionary.variables
+        n_rows = len(results_dictionary[header[0]])
+        arrays = results_dictionary.arrays
+        index = results_dictionary.time_series
+        has_index = index is not None and len(index)
+
+        chunk_rows = get_chunk_rows(len(header), chunk_rows)
+
+        header_rows = cls._explode_header(header) if explode_header else [header]
+        yield [[""] + row for row in header_rows] if has_index else header_rows
+        for start in range(0, n_rows, chunk_rows):
+            end = min(start + chunk_rows, n_rows)
+            if isinstance(arrays, np.ndarray):
+                block = arrays[:, start:end]
+            else:
+                block = np.array([array[start:end] for array in arrays])
+            rows = block.T.tolist()
+            if has_index:
+                stamps = index[start:end]
+                # datetime64 arrays are written as standard datetime objects
+                stamps = stamps.tolist() if hasattr(stamps, "tolist") else list(stamps)
+                rows = [[str(stamp)] + row for stamp, row in zip(stamps, rows)]
+            yield rows
+
     @classmethod
     def get_table_shape(cls, table):
         """Read table dimensions."""
@@ -350,3 +462,56 @@ class ResultsWriter:
                 writer.writerow([title])
             for row in table:
                 writer.writerow(row)
+
+    @classmethod
+    def stream_dict_to_csv(
+        cls,
+        results_dictionary,
+        path,
+        explode_header,
+        delimiter,
+        append,
+        title,
+        compress=None,
+        chunk_rows=None,
+        **kwargs
+    ):
+        """
+        Write a results dictionary to a CSV file in chunks of rows.
+
+        The output matches 'write_table_to_csv' of the converted table.
+
+        Parameters
+        ----------
+        results_dictionary : ResultsDictionary
+            Results dictionary input.
+        path : str
+            The file path to which the CSV will be written.
+        explode_header : bool
+            Split variable into multiple rows if true,
+            otherwise put one variable into one row.
+        delimiter : str
+            The character used to separate fields in the CSV file.
+        append : bool
+            If True, append to the file; otherwise, overwrite the file.
+        title : str or None
+            If provided, this string is written as the first row of the CSV file.
+        compress : default None, bool
+            Write gzip compressed csv, None compresses when path ends with '.gz'.
+        chunk_rows : default None, int
+            Number of rows formatted and written at once, see 'get_chunk_rows'.
+        **kwargs : dict
+            Additional keyword arguments passed to `csv.writer`.
+
+        Returns
+        -------
+        None
+            This function does not return any value.
+        """
+        chunks = ResultsHandler.iter_table_chunks(results_dictionary, explode_header, chunk_rows)
+        with open_csv(path, append, compress) as csv_file:
+            writer = csv.writer(csv_file, delimiter=delimiter, **kwargs)
+            if title:
+                writer.writerow([title])
+            for rows in chunks:
+                writer.writerows(rows)
@@ -1,10 +1,14 @@
+import os
 import sqlite3
 from collections import OrderedDict
 from datetime import datetime, timedelta
 
-from db_eplusout_reader.constants import RP, TS, A, D, H, M
-from db_eplusout_reader.processing.esofile_reader import Variable
-from db_eplusout_reader.results_dict import ResultsDictionary
+import numpy as np
+
+from .constants import RP, TS, A, D, H, M
+from .exceptions import NoResults
+from .processing.esofile_reader import Variable
+from .results_dict import ResultsDictionary
 
 DATA_TABLE = "ReportData"
 DATA_DICT_TABLE = "ReportDataDictionary"
@@ -148,6 +152,29 @@ def get_ids_dict(conn, variables, sql_frequency, alike):
     return all_ids_dict
 
 
+def get_first_ids(conn, variables, sql_frequency, alike):
+    """
+    Find the first matching id for each requested 'Variable'.
+
+    The first id is the one which would be returned by
+    'ResultsDictionary.first_array' when requesting the variable alone.
+
+    Raises
+    ------
+    NoResults
+        When any of the requested variables cannot be found.
+
+    """
+    ids = []
+    for variable in variables:
+        rows = fetch_data_dict_rows(conn, variable, sql_frequency, alike)
+        ids_dict = sort_by_value(get_unsorted_sub_dict(rows))
+        if not ids_dict:
+            raise NoResults("Variable {} not found.".format(variable))
+        ids.append(next(iter(ids_dict)))
+    return ids
+
+
 def validate_time(timestamp, start_date, end_date):
     """Check if given timestamp lies between start and end dates."""
     if start_date and end_date:
@@ -161,26 +188,26 @@ def validate_time(timestamp, start_date, end_date):
     return valid
 
 
-def get_output_rows_with_time(conn, id_):
-    """Fetch output values with associated timestamp."""
-    statement = (
-        "SELECT ReportData.Value, "
-        "Time.IntervalType, Time.Year, Time.Month, Time.Day, Time.Hour, Time.Minute"
-        " FROM ReportData"
-        " JOIN Time ON ReportData.TimeIndex = Time.TimeIndex"
-        " WHERE ReportData.ReportDataDictionaryIndex = ?"
-    )
-    return conn.execute(statement, (id_,))
+def window_statement(time_ranges):
+    """Create condition limiting 'ReportData.TimeIndex' to given inclusive ranges."""
+    if time_ranges is None:
+        return ""
+    if not time_ranges:
+        return " AND 0"
+    conditions = [
+        "ReportData.TimeIndex BETWEEN {} AND {}".format(int(lo), int(hi))
+        for lo, hi in time_ranges
+    ]
+    return " AND (" + " OR ".join(conditions) + ")"
 
 
-def get_sliced_outputs(conn, id_, start_date, end_date):
-    """Get array of output values for given variable id sliced by given dates."""
-    results = []
-    for row in get_output_rows_with_time(conn, id_):
-        timestamp = parse_sql_timestamp(row[1:])
-        if validate_time(timestamp, start_date, end_date):
-            results.append(row[0])
-    return results
+def get_sliced_outputs(conn, id_, time_ranges):
+    """Get array of output values for given variable id sliced by TimeIndex ranges."""
+    statement = (
+        "SELECT ReportData.Value FROM ReportData"
+        " WHERE ReportData.ReportDataDictionaryIndex = ?"
+    ) + window_statement(time_ranges)
+    return [r[0] for r in conn.execute(statement, (id_,))]
 
 
 def get_outputs(conn, id_):
@@ -192,13 +219,81 @@ def get_outputs(conn, id_):
     return [r[0] for r in conn.execute(statement, (id_,))]
 
 
-def dates_statement(frequency):
-    """Create statement to fetch numeric output rows."""
-    switch = {TS: -1, H: 1, D: 2, M: 3, RP: 4, A: 5}
+def requested_ids_statement(ids):
+    """Create a 'VALUES' table holding (position, id) pairs of requested ids."""
+    # ids come from ReportDataDictionary so it's safe to inline them
+    rows = ",".join("({},{})".format(i, int(id_)) for i, id_ in enumerate(ids))
+    return "WITH Requested(Position, Id) AS (VALUES {})".format(rows)
+
+
+def count_outputs(conn, ids, time_ranges=None):
+    """Get number of stored output values for each given variable id."""
+    statement = requested_ids_statement(ids) + (
+        " SELECT Requested.Position, COUNT(ReportData.Value) FROM Requested"
+        " LEFT JOIN ReportData ON ReportData.ReportDataDictionaryIndex = Requested.Id"
+        + window_statement(time_ranges)
+        + " GROUP BY Requested.Position ORDER BY Requested.Position"
+    )
+    return [r[1] for r in conn.execute(statement)]
+
+
+def get_outputs_array(conn, ids, time_ranges=None, return_counts=False):
+    """
+    Get output values for all given variable ids using a single query.
+
+    Parameters
+    ----------
+    conn : sqlite3.Connection
+        Open connection to EnergyPlus .sql file.
+    ids : list of int
+        ReportDataDictionary ids, the order defines rows of the output array.
+    time_ranges : default None, list of (int, int)
+        Inclusive TimeIndex ranges to read, see 'get_window_ranges'.
+    return_counts : default False, bool
+        Also return the number of stored values of each variable.
+
+    Returns
+    -------
+    numpy.ndarray or tuple of (numpy.ndarray, list of int)
+        Float64 array of shape (n_variables, n_steps). When variables
+        do not share the same number of steps, shorter rows are padded by nan.
+        With 'return_counts', the array and the number of values of each row.
+
+    """
+    ids = list(ids)
+    if not ids:
+        array = np.empty((0, 0), dtype=np.float64)
+        return (array, []) if return_counts else array
+    counts = count_outputs(conn, ids, time_ranges)
+    n_steps = max(counts)
+    statement = requested_ids_statement(ids) + (
+        " SELECT ReportData.Value FROM Requested"
+        " JOIN ReportData ON ReportData.ReportDataDictionaryIndex = Requested.Id"
+        + window_statement(time_ranges)
+        + " ORDER BY Requested.Position, ReportData.TimeIndex"
+    )
+    values = (r[0] for r in conn.execute(statement))
+    if all(count == n_steps for count in counts):
+        # all variables share the same time index, rows come in the requested order
+        array = np.fromiter(values, dtype=np.float64, count=len(ids) * n_steps)
+        array = array.reshape(len(ids), n_steps)
+    else:
+        array = np.full((len(ids), n_steps), np.nan, dtype=np.float64)
+        for i, count in enumerate(counts):
+            array[i, :count] = np.fromiter(values, dtype=np.float64, count=count)
+    return (array, counts) if return_counts else array
+
+
+INTERVAL_TYPES = {TS: -1, H: 1, D: 2, M: 3, RP: 4, A: 5}
+
+
+def time_index_statement(frequency):
+    """Create statement to fetch time rows of given frequency."""
     statement = (
-        "SELECT Time.IntervalType, Time.Year, Time.Month, Time.Day,"
-        " Time.Hour, Time.Minute FROM Time"
-        " WHERE Time.IntervalType = {}".format(switch[frequency.lower()])
+        "SELECT Time.TimeIndex, IFNULL(Time.Year, 0), IFNULL(Time.Month, 1),"
+        " IFNULL(Time.Day, 1), IFNULL(Time.Hour, 0), IFNULL(Time.Minute, 0)"
+        " FROM Time WHERE Time.IntervalType = {}"
+        " ORDER BY Time.TimeIndex".format(INTERVAL_TYPES[frequency.lower()])
     )
     return statement
 
@@ -225,56 +320,131 @@ def parse_sql_timestamp(time_row):
     return corrected_datetime
 
 
-def parse_sql_timestamps(time_rows):
-    """Convert EnergyPlus timestamps to standard datetime."""
-    timestamps = []
-    for row in time_rows:
-        timestamps.append(parse_sql_timestamp(row))
-    return timestamps
+def parse_sql_timestamp_columns(interval, years, months, days, hours, minutes):
+    """
+    Convert EnergyPlus time columns to 'datetime64[m]' array.
 
+    This is a vectorized equivalent of 'parse_sql_timestamp'.
 
-def filter_timestamps(timestamps, start_date, end_date):
-    """
-    Filter timestamps within a specified date range.
-    
     Parameters
     ----------
-    timestamps : list of str or list of datetime
-        List of timestamps to be filtered.
-    start_date : str or datetime
-        The start date to filter timestamps. Timestamps before this date will be excluded.
-    end_date : str or datetime
-        The end date to filter timestamps. Timestamps after this date will be excluded.
-    
+    interval : int
+        Time.IntervalType shared by all rows.
+    years, months, days, hours, minutes : numpy.ndarray of int
+        Time table columns.
+
     Returns
     -------
-    list of str or list of datetime
-        A list of timestamps that fall within the specified date range [start_date, end_date].
+    numpy.ndarray of datetime64[m]
+        Parsed timestamps.
+
     """
-    valid_timestamps = []
-    for timestamp in timestamps:
-        if validate_time(timestamp, start_date, end_date):
-            valid_timestamps.append(timestamp)
-    return valid_timestamps
+    years = np.where(years == 0, 2002, years)
+    if interval == 2:
+        hours, minutes = np.zeros_like(hours), np.zeros_like(minutes)
+    elif interval == 3:
+        days = np.ones_like(days)
+        hours, minutes = np.zeros_like(hours), np.zeros_like(minutes)
+    elif interval in {4, 5}:
+        months, days = np.ones_like(months), np.ones_like(days)
+        hours, minutes = np.zeros_like(hours), np.zeros_like(minutes)
 
+    # hour 24 is the last step of the day, it rolls over to the next day
+    minutes = np.where(hours == 24, 0, minutes)
+    month_starts = ((years - 1970) * 12 + months - 1).astype("datetime64[M]")
+    offsets = (days - 1) * 1440 + hours * 60 + minutes
+    return month_starts.astype("datetime64[m]") + offsets.astype("timedelta64[m]")
 
-def get_timestamps_from_sql(path, frequency, start_date=None, end_date=None):
-    """Fetch timestamps for given frequency."""
-    conn = sqlite3.connect(path)
 
-    statement = dates_statement(frequency)
-    rows = conn.execute(statement)
-    timestamps = parse_sql_timestamps(rows)
+def get_time_index(conn, frequency):
+    """
+    Fetch TimeIndex and parsed timestamps of given frequency.
 
-    if start_date or end_date:
-        timestamps = filter_timestamps(timestamps, start_date, end_date)
+    Returns
+    -------
+    tuple of (numpy.ndarray of int, numpy.ndarray of datetime64[m])
+        TimeIndex values and corresponding timestamps.
+
+    """
+    rows = conn.execute(time_index_statement(frequency)).fetchall()
+    columns = np.array(rows, dtype=np.int64).reshape(-1, 6).T
+    interval = INTERVAL_TYPES[frequency.lower()]
+    return columns[0], parse_sql_timestamp_columns(interval, *columns[1:])
+
+
+def get_time_environments(conn, frequency):
+    """Fetch EnvironmentPeriodIndex of the time rows of given frequency, in 'get_time_index' order."""
+    rows = conn.execute(
+        "SELECT IFNULL(Time.EnvironmentPeriodIndex, 0) FROM Time WHERE Time.IntervalType = ?"
+        " ORDER BY Time.TimeIndex", (INTERVAL_TYPES[frequency.lower()],)
+    ).fetchall()
+    return np.array(rows, dtype=np.int64).reshape(-1)
+
+
+def get_window_mask(timestamps, start_date, end_date):
+    """Check which timestamps lie between start and end dates (inclusive)."""
+    mask = np.ones(len(timestamps), dtype=bool)
+    if start_date:
+        mask &= timestamps >= np.datetime64(start_date)
+    if end_date:
+        mask &= timestamps <= np.datetime64(end_date)
+    return mask
+
+
+def get_window_ranges(time_indices, mask):
+    """
+    Convert window mask into inclusive TimeIndex ranges.
+
+    Each run of consecutive valid steps becomes one (first, last)
+    TimeIndex pair so the window can be applied in the 'WHERE' clause.
+    Steps of other frequencies which lie in between are not relevant
+    as the variable does not report on them.
+    """
+    positions = np.flatnonzero(mask)
+    if positions.size == 0:
+        return []
+    breaks = np.flatnonzero(np.diff(positions) != 1)
+    starts = np.concatenate(([positions[0]], positions[breaks + 1]))
+    ends = np.concatenate((positions[breaks], [positions[-1]]))
+    return list(zip(time_indices[starts].tolist(), time_indices[ends].tolist()))
+
+
+def get_time_window(conn, frequency, start_date, end_date):
+    """
+    Resolve start and end dates into TimeIndex ranges.
+
+    Returns
+    -------
+    tuple of (list of (int, int) or None, numpy.ndarray of datetime64[m])
+        TimeIndex ranges to be passed into queries (None when no window
+        is requested) and timestamps within the window.
+
+    """
+    time_indices, timestamps = get_time_index(conn, frequency)
+    if not (start_date or end_date):
+        return None, timestamps
+    mask = get_window_mask(timestamps, start_date, end_date)
+    return get_window_ranges(time_indices, mask), timestamps[mask]
 
+
+def get_timestamps_from_sql(path, frequency, start_date=None, end_date=None):
+    """Fetch timestamps for given frequency as 'datetime64[m]' array."""
+    conn = sqlite3.connect(path)
+    _, timestamps = get_time_index(conn, frequency)
+    if start_date or end_date:
+        timestamps = timestamps[get_window_mask(timestamps, start_date, end_date)]
     conn.close()
     return timestamps
 
 
 def get_results_from_sql(
-    path, variables, frequency, alike=False, start_date=None, end_date=None
+    path,
+    variables,
+    frequency,
+    alike=False,
+    start_date=None,
+    end_date=None,
+    batched=False,
 ):
     """
     Extract output values from given EnergyPlus .sql file.
@@ -294,6 +464,10 @@ def get_results_from_sql(
         Lower datetime interval boundary, inclusive.
     end_date : default None, datetime.datetime
         Upper datetime interval boundary, inclusive.
+    batched : default False, bool
+        Fetch all matching variables with a single query into
+        a float64 (n_variables, n_steps) array, dictionary values
+        are rows of the array.
 
     Returns
     -------
@@ -305,11 +479,296 @@ def get_results_from_sql(
     sql_frequency = to_sql_frequency(frequency)
     ids_dict = get_ids_dict(conn, variables, sql_frequency, alike)
     rd = ResultsDictionary(frequency)
-    for id_, variable in ids_dict.items():
-        if start_date or end_date:
-            rd[variable] = get_sliced_outputs(conn, id_, start_date, end_date)
-        else:
-            rd[variable] = get_outputs(conn, id_)
-    rd.time_series = get_timestamps_from_sql(path, frequency, start_date, end_date)
+
+    # time window is resolved once into TimeIndex ranges and pushed into queries
+    time_ranges, timestamps = get_time_window(conn, frequency, start_date, end_date)
+
+    if batched:
+        rd.array = get_outputs_array(conn, ids_dict.keys(), time_ranges)
+        for variable, row in zip(ids_dict.values(), rd.array):
+            rd[variable] = row
+    else:
+        for id_, variable in ids_dict.items():
+            if time_ranges is not None:
+                rd[variable] = get_sliced_outputs(conn, id_, time_ranges)
+            else:
+                rd[variable] = get_outputs(conn, id_)
+    rd.time_series = timestamps
     conn.close()
     return rd
+
+
+def get_first_arrays_from_sql(
+    path, variables, frequency, alike=False, start_date=None, end_date=None
+):
+    """
+    Extract the first match of each requested variable using a single connection.
+
+    Parameters
+    ----------
+    path : str
+        A path to EnergyPlus .sql file output.
+    variables : Variable or List of Variable
+        Requested output variables.
+    frequency : str
+        An output interval, this can be one of {TS, H, D, M, A, RP} constants.
+    alike : default False, bool
+        Specify if full string or only part of variable attribute
+        needs to match.
+    start_date : default None, datetime.datetime
+        Lower datetime interval boundary, inclusive.
+    end_date : default None, datetime.datetime
+        Upper datetime interval boundary, inclusive.
+
+    Returns
+    -------
+    tuple of (numpy.ndarray, numpy.ndarray of datetime64[m])
+        Float64 array of shape (n_requested_variables, n_steps), rows
+        follow the order of requested variables, and result timestamps.
+
+    Raises
+    ------
+    NoResults
+        When any of the requested variables cannot be found.
+
+    """
+    conn = sqlite3.connect(path)
+    try:
+        variables = [variables] if isinstance(variables, Variable) else variables
+        ids = get_first_ids(conn, variables, to_sql_frequency(frequency), alike)
+        time_ranges, timestamps = get_time_window(conn, frequency, start_date, end_date)
+        array = get_outputs_array(conn, ids, time_ranges)
+    finally:
+        conn.close()
+    return array, timestamps
+
+
+SQLITE_MAX_ATTACHED = 10
+
+
+def get_attach_limit(conn):
+    """Number of databases which can be attached to the connection."""
+    try:
+        return conn.getlimit(sqlite3.SQLITE_LIMIT_ATTACHED)
+    except AttributeError:
+        # 'getlimit' is only available since Python 3.11, assume compile time default
+        return SQLITE_MAX_ATTACHED
+
+
+def match_first_id(rows, variable, alike):
+    """
+    Pick the first id matching 'Variable' from data dictionary rows.
+
+    Rows are (id, key, type, units) tuples of a single frequency, matching
+    follows 'fetch_data_dict_rows' and ordering follows 'sort_by_value'.
+
+    """
+    matches = []
+    for id_, key, type_, units in rows:
+        candidate = to_string(Variable(key, type_, units))
+        valid = True
+        for requested, value in zip(variable, candidate):
+            if requested is None:
+                continue
+            if alike:
+                valid = requested.lower() in value.lower()
+            else:
+                valid = requested == value
+            if not valid:
+                break
+        if valid:
+            matches.append((candidate, id_))
+    if not matches:
+        raise NoResults("Variable {} not found.".format(variable))
+    return min(matches, key=lambda x: x[0])[1]
+
+
+def get_federated_batch(conn, schemas, variables, frequency, alike, start_date, end_date):
+    """
+    Read requested variables from all databases attached under given schemas.
+
+    Data dictionaries, time tables and outputs of the whole batch are
+    each fetched by one 'UNION ALL' query.
+
+    Returns
+    -------
+    list of (int, numpy.ndarray, numpy.ndarray of datetime64[m])
+        Position of the schema, (n_variables, n_steps) array and timestamps
+        of every database holding all requested variables.
+
+    """
+    sql_frequency = to_sql_frequency(frequency)
+    statement = " UNION ALL ".join(
+        "SELECT {0}, ReportDataDictionaryIndex, KeyValue, Name, Units"
+        " FROM {1}.ReportDataDictionary WHERE ReportingFrequency = ?".format(i, schema)
+        for i, schema in enumerate(schemas)
+    )
+    dictionaries = [[] for _ in schemas]
+    for row in conn.execute(statement, (sql_frequency,) * len(schemas)):
+        dictionaries[row[0]].append(row[1:])
+
+    interval = INTERVAL_TYPES[frequency.lower()]
+    statement = " UNION ALL ".join(
+        "SELECT {0}, TimeIndex, IFNULL(Year, 0), IFNULL(Month, 1), IFNULL(Day, 1),"
+        " IFNULL(Hour, 0), IFNULL(Minute, 0) FROM {1}.Time WHERE IntervalType = {2}".format(
+            i, schema, interval
+        )
+        for i, schema in enumerate(schemas)
+    )
+    rows = np.array(conn.execute(statement + " ORDER BY 1, 2").fetchall(), dtype=np.int64).reshape(-1, 7)
+
+    requested, windows = [], {}
+    for i in range(len(schemas)):
+        try:
+            ids = [match_first_id(dictionaries[i], variable, alike) for variable in variables]
+        except NoResults:
+            continue
+        columns = rows[rows[:, 0] == i, 1:].T
+        timestamps = parse_sql_timestamp_columns(interval, *columns[1:])
+        time_ranges = None
+        if start_date or end_date:
+            mask = get_window_mask(timestamps, start_date, end_date)
+            time_ranges, timestamps = get_window_ranges(columns[0], mask), timestamps[mask]
+        requested.append((i, ids))
+        windows[i] = (time_ranges, timestamps)
+    if not requested:
+        return []
+
+    values = "VALUES " + ", ".join(
+        "({}, {}, {})".format(i, position, int(id_))
+        for i, ids in requested
+        for position, id_ in enumerate(ids)
+    )
+    statement = "WITH Requested(Db, Position, Id) AS ({}) ".format(values) + " UNION ALL ".join(
+        "SELECT Requested.Db, Requested.Position, ReportData.TimeIndex, ReportData.Value"
+        " FROM Requested JOIN {1}.ReportData AS ReportData"
+        " ON ReportData.ReportDataDictionaryIndex = Requested.Id"
+        " WHERE Requested.Db = {0}{2}".format(i, schemas[i], window_statement(windows[i][0]))
+        for i, _ in requested
+    )
+    data = np.array(conn.execute(statement + " ORDER BY 1, 2, 3").fetchall(), dtype=np.float64).reshape(-1, 4)
+
+    results = []
+    for i, ids in requested:
+        case_data = data[data[:, 0] == i]
+        positions = case_data[:, 1].astype(np.int64)
+        counts = np.bincount(positions, minlength=len(ids))
+        n_steps = int(counts.max()) if len(counts) else 0
+        array = np.full((len(ids), n_steps), np.nan, dtype=np.float64)
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        for position, (start, count) in enumerate(zip(starts, counts)):
+            array[position, :count] = case_data[start:start + count, 3]
+        results.append((i, array, windows[i][1]))
+    return results
+
+
+def iter_federated_arrays(
+    paths, variables, frequency, alike=False, start_date=None, end_date=None, batch_size=None
+):
+    """
+    Extract the first match of each requested variable from many .sql files.
+
+    Files are attached to a single connection in batches of up to the
+    attach limit, every batch is read by one 'UNION ALL' query per table.
+    Missing, corrupt and non-.sql files are left out of the batches.
+
+    Parameters
+    ----------
+    paths : list of str
+        Paths to EnergyPlus .sql file outputs.
+    variables : Variable or List of Variable
+        Requested output variables.
+    frequency : str
+        An output interval, this can be one of {TS, H, D, M, A, RP} constants.
+    alike : default False, bool
+        Specify if full string or only part of variable attribute
+        needs to match.
+    start_date : default None, datetime.datetime
+        Lower datetime interval boundary, inclusive.
+    end_date : default None, datetime.datetime
+        Upper datetime interval boundary, inclusive.
+    batch_size : default None, int
+        Number of files attached at once, limited by the attach limit.
+
+    Yields
+    ------
+    tuple of (str, numpy.ndarray, numpy.ndarray of datetime64[m])
+        Path, (n_requested_variables, n_steps) array and timestamps of
+        every file holding all requested variables.
+
+    """
+    variables = [variables] if isinstance(variables, Variable) else variables
+    conn = sqlite3.connect(":memory:")
+    try:
+        limit = get_attach_limit(conn)
+        batch_size = min(batch_size or limit, limit)
+        # attaching a missing path would create an empty database, .eso files cannot be attached
+        paths = [path for path in paths if os.path.isfile(path) and os.path.splitext(path)[1].lower() == ".sql"]
+        for first in range(0, len(paths), batch_size):
+            batch = paths[first:first + batch_size]
+            schemas, attached = [], []
+            for path in batch:
+                schema = "case{}".format(len(schemas))
+                try:
+                    conn.execute("ATTACH DATABASE ? AS {}".format(schema), (path,))
+                except sqlite3.Error as e:
+                    print("{}: {}".format(path, e))
+                    continue
+                try:
+                    tables = conn.execute(
+                        "SELECT COUNT(*) FROM {}.sqlite_master WHERE type = 'table'"
+                        " AND name IN ('ReportData', 'ReportDataDictionary', 'Time')".format(schema)
+                    ).fetchone()[0]
+                except sqlite3.Error as e:
+                    # truncated or corrupt file
+                    print("{}: {}".format(path, e))
+                    tables = 0
+                if tables < 3:
+                    # not an EnergyPlus output database
+                    conn.execute("DETACH DATABASE {}".format(schema))
+                    continue
+                schemas.append(schema)
+                attached.append(path)
+            batch = attached
+            try:
+                for i, array, timestamps in get_federated_batch(
+                    conn, schemas, variables, frequency, alike, start_date, end_date
+                ):
+                    yield batch[i], array, timestamps
+            finally:
+                for schema in schemas:
+                    conn.execute("DETACH DATABASE {}".format(schema))
+    finally:
+        conn.close()
+
+
+def get_federated_arrays(
+    paths, variables, frequency, alike=False, start_date=None, end_date=None, batch_size=None
+):
+    """
+    Extract requested variables from many .sql files into one array.
+
+    See 'iter_federated_arrays' for parameters.
+
+    Returns
+    -------
+    tuple of (list of str, numpy.ndarray, numpy.ndarray of datetime64[m])
+        Paths of files holding all requested variables, float64 array of
+        shape (n_cases, n_requested_variables, n_steps) and timestamps of
+        the longest case. Shorter cases are padded by nan.
+
+    """
+    valid_paths, arrays, timestamps = [], [], np.array([], dtype="datetime64[m]")
+    for path, array, case_timestamps in iter_federated_arrays(
+        paths, variables, frequency, alike, start_date, end_date, batch_size
+    ):
+        valid_paths.append(path)
+        arrays.append(array)
+        if len(case_timestamps) > len(timestamps):
+            timestamps = case_timestamps
+    n_variables = 1 if isinstance(variables, Variable) else len(variables)
+    n_steps = max((array.shape[1] for array in arrays), default=0)
+    cube = np.full((len(arrays), n_variables, n_steps), np.nan, dtype=np.float64)
+    for i, array in enumerate(arrays):
+        cube[i, :, :array.shape[1]] = array
+    return valid_paths, cube, timestamps
@@ -0,0 +1,165 @@
+import numpy as np
+from .db_eplusout_reader import exceptions
+from .reader import IDFResult, request_variables, read_cases
+from .utils import Monthly
+import os
+
+
+class DeltaResult:
+    """
+    Differences of every case against a baseline case.
+
+    All cases and variables are compared in one broadcasted pass over the
+    (cases, variables, steps) cube. `delta` and `ratio` are laid out as
+    variables * steps * cases, `savings` and `percent` (baseline total minus case total over
+    the steps) as variables * cases. The baseline is the first case.
+    """
+    __slots__ = ['variables', 'frequency', 'sql_list', 'baseline', 'delta', 'ratio', 'savings', 'percent']
+
+    def __init__(self, variables, frequency, cube, sql_list):
+        """
+        Compare the stacked cases against the first one.
+
+        Parameters
+        ----------
+        variables : list of Variable
+            Variables of the cube.
+        frequency : str
+            The temporal frequency of the data.
+        cube : numpy.ndarray
+            (cases, variables, steps) array, the baseline case first.
+        sql_list : list of str
+            SQL path of each case, the baseline first.
+        """
+        self.variables = variables
+        self.frequency = frequency
+        self.sql_list = sql_list
+        self.baseline = sql_list[0]
+        base = cube[0]
+        totals = np.nansum(cube, axis=2)
+        savings = totals[0] - totals
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratio = np.where(base != 0, cube / base, np.nan)
+            percent = np.where(totals[0] != 0, 100 * savings / totals[0], np.nan)
+        # case * variables * freq => variables * freq * case
+        self.delta = IDFResult(variables, frequency, np.moveaxis(cube - base, 0, -1), sql_list)
+        self.ratio = IDFResult(variables, frequency, np.moveaxis(ratio, 0, -1), sql_list)
+        self.savings = IDFResult(variables, frequency, savings.T, sql_list)
+        self.percent = IDFResult(variables, frequency, percent.T, sql_list)
+
+    def __repr__(self):
+        return f'DeltaResult(baseline={self.baseline}, {len(self.sql_list)} cases, {self.variables})'
+
+    def _savings(self, variable, percent):
+        """Savings of every case for one variable, by position or by Variable."""
+        if not isinstance(variable, (int, np.integer)):
+            variable = self.variables.index(variable)
+        return (self.percent if percent else self.savings)[variable]
+
+    def rank(self, variable=0, percent=False):
+        """
+        Rank all cases by savings against the baseline, largest first.
+
+        Parameters
+        ----------
+        variable : int or Variable, optional
+            Variable ranked, by position or by Variable. Default is 0.
+        percent : bool, optional
+            If True, ranks by percent savings instead of absolute savings. Default is False.
+
+        Returns
+        -------
+        list of tuple of (str, float)
+            SQL path and savings of each case, cases without a value last.
+        """
+        values = self._savings(variable, percent)
+        order = np.argsort(-values, kind='stable')
+        return [(self.sql_list[i], values[i]) for i in order]
+
+    def top(self, n: int, variable=0, percent=False):
+        """
+        The `n` cases saving the most against the baseline, without sorting all cases.
+
+        Parameters
+        ----------
+        n : int
+            Number of cases returned.
+        variable : int or Variable, optional
+            Variable ranked, by position or by Variable. Default is 0.
+        percent : bool, optional
+            If True, ranks by percent savings instead of absolute savings. Default is False.
+
+        Returns
+        -------
+        list of tuple of (str, float)
+            SQL path and savings of the selected cases, largest first.
+        """
+        values = self._savings(variable, percent)
+        n = min(int(n), len(values))
+        if n <= 0:
+            return []
+        # only the n selected cases are sorted
+        selected = np.argpartition(-values, n - 1)[:n]
+        selected = selected[np.argsort(-values[selected], kind='stable')]
+        return [(self.sql_list[i], values[i]) for i in selected]
+
+
+def get_delta_result(sql_list: list, baseline: str, variables, frequency=Monthly, alike=False,
+                     start_date=None, end_date=None, workers=1, catalogue=None, federated=False, warehouse=None):
+    """
+    Compare a list of cases against a baseline case, see `DeltaResult`.
+
+    Cases reporting a different number of steps than the baseline are reported and skipped.
+
+    Parameters
+    ----------
+    sql_list : list of str
+        List of file paths to SQL files of the compared cases.
+    baseline : str
+        Path to the SQL file of the baseline case.
+    variables : Variable or list of Variable
+        One or more Variable objects specifying the data variables to compare.
+    frequency : str, optional
+        The temporal frequency of the data (e.g. Monthly or Hourly). Default is Monthly.
+    alike : bool, optional
+        If True, allows approximate matching of variable names. Default is False.
+    start_date : datetime, optional
+        Start date for filtering the time range of data. Default is None.
+    end_date : datetime, optional
+        End date for filtering the time range of data. Default is None.
+    workers : int, optional
+        Number of processes reading the case files in parallel. Default is 1.
+    catalogue : VariableCatalogue, optional
+        Project catalogue used to resolve variable ids without querying SQLite. Default is None.
+    federated : bool, optional
+        If True, case files are attached in batches to one SQLite connection and read with
+        UNION ALL queries instead of going through the case cache. Default is False.
+    warehouse : Warehouse, optional
+        Project warehouse serving the cases it holds, other cases go through the case cache. Default is None.
+
+    Returns
+    -------
+    DeltaResult
+
+    Raises
+    ------
+    NoResults
+        When the variables cannot be read from the baseline case.
+    """
+    variables = request_variables(variables)
+    baseline = os.path.normpath(baseline)
+    sql_list = [baseline] + [sql for sql in sql_list if os.path.normpath(sql) != baseline]
+    print('Delta_result:', variables)
+    validSql, case_arrays = read_cases(sql_list, variables, frequency, alike, start_date, end_date, workers,
+                                       catalogue, federated, warehouse)
+    print()
+    if len(validSql) == 0 or validSql[0] != baseline:
+        raise exceptions.NoResults(f'Variables not found in baseline {baseline}')
+    keep = []
+    for i, array in enumerate(case_arrays):
+        if array.shape == case_arrays[0].shape:
+            keep.append(i)
+        else:
+            print(f'**********Steps differ from baseline, skipped {validSql[i]}')
+    cube = np.stack([case_arrays[i] for i in keep])
+    return DeltaResult(variables, frequency, cube, [validSql[i] for i in keep])
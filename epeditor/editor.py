@@ -5,8 +5,13 @@ import numpy as np
 import os, re, inspect
 
 from eppy.modeleditor import IDF
-from .simulator import simulate_local, find_sql,simulate_cloud
+from .simulator import simulate_local, find_sql,simulate_cloud, RESULT_DIR
 from .reader import Variable, get_group_result, get_case_result,get_group_summary
+from .catalogue import load_catalogue
+from .warehouse import build_warehouse, open_warehouse, WAREHOUSE_FILE
+from .ingest import ResultStore
+from .scheduler import Scheduler
+from .delta import get_delta_result
 from .processor import IDFEditor, IDFGroupEditor, IDFsearchresult
 from .utils import *
 
@@ -20,6 +25,9 @@ class IDFModel(IDF):
         folder: 记录导出路径
         sql: 记录结果sql路径
         variables: 记录结果所有的variables
+        catalogue: 所有算例结果variables的索引
+        warehouse: 汇总所有算例结果的数据仓库（未汇总时为None）
+        store: 模拟过程中逐个算例读取的结果（未设置ingest时为None）
 
         classmethod:
         get_objectdict() 获取所有idfobjects的dictionary
@@ -29,7 +37,7 @@ class IDFModel(IDF):
         search_filed() 增强idfobjects方法，方便直接根据name获取带关键词的field
 
     '''
-    __slots__ = ['objectdict', 'references', 'file_name', 'idd', 'folder', 'sql', 'variables']
+    __slots__ = ['objectdict', 'references', 'file_name', 'idd', 'folder', 'sql', 'variables', 'catalogue', 'warehouse', 'store', 'scheduler']
 
     def __init__(self, idf_file=None, epw=None, idd=None, folder=None):
         """
@@ -51,7 +59,8 @@ class IDFModel(IDF):
         -------
         None
         """
-
+        self.store = None
+        self.scheduler = None
         if folder is not None:
             for dirpath, dirnames, filenames in os.walk(folder):
                 for file in filenames:
@@ -63,6 +72,8 @@ class IDFModel(IDF):
             self.folder = None
             self.sql = None
             self.variables: dict | None = None
+            self.catalogue = None
+            self.warehouse = None
         if idf_file is None:
             return
 
@@ -475,7 +486,8 @@ class IDFModel(IDF):
             self.save(os.path.join(folder, idf_path))
             print(f'\rWriting idf: remained tasks....{group_editor.params_num - pNum - 1}', end='')
 
-    def simulation(self, epw, overwrite=True,local=True, process_count=4, stdout=sys.stdout,forceCPU=False, **kwargs):
+    def simulation(self, epw, overwrite=True,local=True, process_count=4, stdout=sys.stdout,forceCPU=False,
+                   consolidate=False, ingest=None, scheduler=None, timeout=None, retries=0, **kwargs):
         """
         Run an EnergyPlus simulation either locally or in the cloud.
         
@@ -493,6 +505,21 @@ class IDFModel(IDF):
             Output stream for logging simulation progress. Default is sys.stdout.
         forceCPU : bool, optional
             If True, forces the simulation to run on CPU even if GPU is available (applies only to local simulation). Default is False.
+        consolidate : bool or list of Variable, optional
+            If True, copies the outputs of all cases into the project warehouse once the simulation finished,
+            a list of Variable limits the copy to these variables, see `consolidate`. Default is False.
+        ingest : ResultStore, Variable or list of Variable, optional
+            Variables read from each case as soon as it finished (monthly for Variables, see `ingest.ResultStore`),
+            kept in `store` so that results of the finished cases can be grouped during the run and all
+            of them right when the last case ends. Applies only to local simulation. Default is None.
+        scheduler : Scheduler, optional
+            Scheduler running the cases, kept in `scheduler` to pause, resume or cancel the run and to read the
+            status of every case (see `scheduler.Scheduler`). Applies only to local simulation without forceCPU.
+            Default is None (a new one with `process_count` workers).
+        timeout : float, optional
+            Wall-clock seconds after which a case is killed, when no scheduler is given. Default is None (no limit).
+        retries : int, optional
+            Number of times a failed or timed out case is run again, when no scheduler is given. Default is 0.
         **kwargs : dict
             Additional keyword arguments passed to the simulation function.
         
@@ -504,7 +531,12 @@ class IDFModel(IDF):
         if self.folder is None:
             raise Exception('You should play IDFModel.write() first before simulation')
         else:
+            if ingest is not None:
+                self.store = ingest if isinstance(ingest, ResultStore) else ResultStore(ingest)
             if local:
+                if scheduler is None:
+                    scheduler = Scheduler(process_count, timeout=timeout, retries=retries)
+                self.scheduler = scheduler
                 simulate_local(self.folder,
                                epw=epw,
                                idd=self.idd,
@@ -512,6 +544,8 @@ class IDFModel(IDF):
                                prs_count=process_count,
                                stdout=stdout,
                                forceCPU = forceCPU,
+                               on_case=None if ingest is None else self.store.ingest_folder,
+                               scheduler=scheduler,
                                **kwargs)
             else:
                 simulate_cloud(self.folder,
@@ -519,6 +553,35 @@ class IDFModel(IDF):
                                overwrite=overwrite,
                                **kwargs)
         self.read_folder()
+        if consolidate is not False and consolidate is not None:
+            self.consolidate(None if consolidate is True else consolidate)
+
+    def consolidate(self, variables=None, frequency=None, alike=False):
+        """
+        Copy the outputs of all cases into one indexed SQLite warehouse in the `result` folder.
+
+        `group_result` and `case_result` then read the cases from the warehouse instead of opening
+        every case SQL file. Running it again only copies the cases added or changed since.
+
+        Parameters
+        ----------
+        variables : Variable or list of Variable, optional
+            Variables to copy. Default is None (all variables).
+        frequency : str or list of str, optional
+            Frequencies to copy (e.g. Hourly). Default is None (all frequencies).
+        alike : bool, optional
+            If True, allows approximate matching of variable names. Default is False.
+
+        Returns
+        -------
+        Warehouse
+        """
+        if self.sql is None:
+            raise Exception('You should play IDFModel.read_folder() first before consolidate')
+        print('Consolidate results:', self.folder)
+        self.warehouse = build_warehouse(os.path.join(self.folder, RESULT_DIR, WAREHOUSE_FILE),
+                                         list(self.sql.values()), variables, frequency, alike)
+        return self.warehouse
 
     def read_folder(self, folder: str = None):
         """
@@ -532,18 +595,23 @@ class IDFModel(IDF):
         Returns
         -------
         None
-            This function does not return any value. It updates the instance attributes `folder`, `sql`, and `variables`.
+            This function does not return any value. It updates the instance attributes `folder`, `sql`, `variables`
+            and `catalogue`, the variable catalogue of all cases persisted in the `result` folder, and `warehouse`
+            when the results were consolidated.
         """
         if folder is not None:
             self.folder = folder
         self.sql = find_sql(self.folder)
-        Working_Dir = os.path.join(self.folder, 'result')
+        Working_Dir = os.path.join(self.folder, RESULT_DIR)
         if not os.path.exists(Working_Dir):
             os.mkdir(Working_Dir)
-        self.variables = get_variables(list(self.sql.values())[0])
+        self.catalogue = load_catalogue(Working_Dir, list(self.sql.values()))
+        self.variables = self.catalogue.variables()
+        self.warehouse = open_warehouse(Working_Dir)
 
     def group_result(self, variable: Variable, calculator, frequency=Monthly, cases=None,
-                     alike=False, start_date=None, end_date=None,x='variables'):
+                     alike=False, start_date=None, end_date=None,x='variables', workers=1, federated=False,
+                     resample=None):
         """
         Group calculation results based on specified cases and parameters.
         
@@ -567,31 +635,99 @@ class IDFModel(IDF):
         x : str, optional
             Determines the type of grouping: if 'variables', returns detailed group results;
             otherwise, returns summary statistics. Default is 'variables'.
+        workers : int, optional
+            Number of processes reading the case SQL files in parallel. Default is 1.
+        federated : bool, optional
+            If True, case SQL files are attached in batches to one connection and read with
+            UNION ALL queries instead of going through the case cache. Default is False.
+        resample : bool, optional
+            If True, the Daily, Monthly, Annual and RunPeriod series of 'Sum' and 'Avg' variables are
+            aggregated from their cached hourly series instead of being read from the case files.
+            Default is None (`cache.RESAMPLE`).
         
         Returns
         -------
         result : pandas.DataFrame or similar
             The grouped result data, either as detailed results or summary depending on `x`.
         """
-        if cases is not None:
-            sql_list = []
-            if isinstance(cases, int) or isinstance(cases, str):
-                cases = [cases]
-            for case in cases:
-                if type(case) == int:
-                    case = os.path.basename(self.file_name)[:-4] + '_' + str(case)
-                try:
-                    sql_list.append(self.sql[case])
-                except:
-                    print(f'**********Cases: {case} Not Found')
-        else:
-            sql_list = list(self.sql.values())
+        sql_list = self.case_sql(cases)
         if x == 'variables':
             return get_group_result(sql_list, variable, calculator, frequency, alike, start_date,
-                                    end_date)
+                                    end_date, workers=workers, catalogue=self.catalogue,
+                                    federated=federated, warehouse=self.warehouse, resample=resample)
         else:
             return get_group_summary(sql_list, variable, calculator, frequency, alike, start_date,
-                                    end_date)
+                                    end_date, workers=workers, catalogue=self.catalogue,
+                                    federated=federated, warehouse=self.warehouse, resample=resample)
+
+    def case_sql(self, cases=None):
+        """
+        SQL paths of the given cases.
+
+        Parameters
+        ----------
+        cases : int, str, list of int/str, or None, optional
+            Case identifiers, an int is the case number appended to the baseline file name.
+            Default is None (all cases).
+
+        Returns
+        -------
+        list of str
+            SQL path of each case found, missing cases are reported.
+        """
+        if cases is None:
+            return list(self.sql.values())
+        sql_list = []
+        if isinstance(cases, int) or isinstance(cases, str):
+            cases = [cases]
+        for case in cases:
+            if type(case) == int:
+                case = os.path.basename(self.file_name)[:-4] + '_' + str(case)
+            try:
+                sql_list.append(self.sql[case])
+            except:
+                print(f'**********Cases: {case} Not Found')
+        return sql_list
+
+    def delta_result(self, variable: Variable, baseline, frequency=Monthly, cases=None,
+                     alike=False, start_date=None, end_date=None, workers=1, federated=False):
+        """
+        Compare cases against a baseline case: delta, ratio and ranked savings of every variable.
+
+        Parameters
+        ----------
+        variable : Variable or list of Variable
+            The variables compared.
+        baseline : int or str
+            Identifier of the baseline case, see `case_sql`.
+        frequency : type, optional
+            The frequency of the compared series, e.g. Monthly for per-month or Hourly for per-hour
+            differences. Default is Monthly.
+        cases : int, str, list of int/str, or None, optional
+            Cases compared against the baseline. Default is None (all cases).
+        alike : bool, optional
+            If True, allows approximate matching of variable names. Default is False.
+        start_date : str or datetime-like, optional
+            The start date for filtering results. Default is None.
+        end_date : str or datetime-like, optional
+            The end date for filtering results. Default is None.
+        workers : int, optional
+            Number of processes reading the case SQL files in parallel. Default is 1.
+        federated : bool, optional
+            If True, case SQL files are attached in batches to one connection and read with
+            UNION ALL queries instead of going through the case cache. Default is False.
+
+        Returns
+        -------
+        DeltaResult
+            Baseline first; `top(n)` selects the cases saving the most.
+        """
+        baseline_sql = self.case_sql(baseline)
+        if len(baseline_sql) == 0:
+            raise Exception(f'Baseline case {baseline} not found')
+        return get_delta_result(self.case_sql(cases), baseline_sql[0], variable, frequency, alike, start_date,
+                                end_date, workers=workers, catalogue=self.catalogue, federated=federated,
+                                warehouse=self.warehouse)
 
     def case_result(self, variable: Variable, case: int, frequency=Monthly,
                     alike=False, start_date=None, end_date=None):
@@ -627,7 +763,8 @@ class IDFModel(IDF):
         for _case in case:
             if isinstance(_case, int):
                 _case = os.path.basename(self.file_name)[:-4] + '_' + str(_case)
-            all_result.append(get_case_result(self.sql[_case], variable, frequency, alike, start_date, end_date))
+            all_result.append(get_case_result(self.sql[_case], variable, frequency, alike, start_date, end_date,
+                                              catalogue=self.catalogue, warehouse=self.warehouse))
         return all_result
 
     def variables_to_file(self, file_path: str):
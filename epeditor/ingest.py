@@ -0,0 +1,134 @@
+from .reader import request_variables, get_group_result, get_group_summary, get_case_result
+from .cache import get_cached_arrays
+from .simulator import find_sql
+from .utils import Monthly
+import threading
+import os
+
+
+class ResultStore:
+    """
+    Outputs of the simulation cases, read as soon as each case finishes.
+
+    `ingest_folder` is passed as `on_case` to `simulate_local`, so the configured variables of every
+    case are extracted from its SQL file in the parent process while the other cases are still
+    running. The arrays are kept in the case cache, group results over the cases ingested so far
+    are served from it without reading SQLite again.
+    """
+    __slots__ = ['variables', 'frequency', 'alike', 'cases', 'lock']
+
+    def __init__(self, variables, frequency=Monthly, alike=False):
+        """
+        Create an empty store.
+
+        Parameters
+        ----------
+        variables : Variable or list of Variable
+            Variables extracted from each case, see `request_variables`.
+        frequency : str, optional
+            The temporal frequency of the data. Default is Monthly.
+        alike : bool, optional
+            If True, allows approximate matching of variable names. Default is False.
+        """
+        self.variables = request_variables(variables)
+        self.frequency = frequency
+        self.alike = alike
+        # SQL path : number of steps, in ingestion order
+        self.cases = {}
+        self.lock = threading.Lock()
+
+    def __repr__(self):
+        return f'ResultStore({len(self)} cases, {self.frequency}, {self.variables})'
+
+    def __len__(self):
+        return len(self.cases)
+
+    @property
+    def sql_list(self):
+        """SQL paths of the cases ingested so far, in the order they finished."""
+        with self.lock:
+            return list(self.cases)
+
+    def ingest(self, sql: str):
+        """
+        Extract the configured variables of a finished case and append it to the store.
+
+        Parameters
+        ----------
+        sql : str
+            Path to the SQL (or .eso) output of the case.
+
+        Returns
+        -------
+        bool
+            True if the case was added, False if it misses one of the variables.
+        """
+        sql = os.path.normpath(sql)
+        try:
+            array, _ = get_cached_arrays(sql, self.variables, self.frequency, self.alike)
+        except Exception as e:
+            print(f'**********Ingest skipped {sql}: {e}')
+            return False
+        with self.lock:
+            self.cases[sql] = array.shape[1]
+        return True
+
+    def ingest_folder(self, case_dir: str):
+        """
+        Ingest the outputs found in the folder of a finished case, see `simulator.case_folder`.
+
+        Parameters
+        ----------
+        case_dir : str
+            Output folder of the case.
+
+        Returns
+        -------
+        int
+            Number of cases added.
+        """
+        return sum(self.ingest(sql) for sql in find_sql(case_dir).values())
+
+    def group_result(self, calculator, variables=None, start_date=None, end_date=None, x='variables'):
+        """
+        Group the results of the cases ingested so far, see `reader.get_group_result`.
+
+        Parameters
+        ----------
+        calculator : callable or Reducer
+            The calculator applied over the cases.
+        variables : Variable or list of Variable, optional
+            Subset of the stored variables. Default is None (all stored variables).
+        start_date : datetime, optional
+            Start date for filtering the time range of data. Default is None.
+        end_date : datetime, optional
+            End date for filtering the time range of data. Default is None.
+        x : str, optional
+            If 'variables', returns detailed group results, otherwise summary statistics
+            (see `reader.get_group_summary`). Default is 'variables'.
+
+        Returns
+        -------
+        IDFResult
+        """
+        variables = self.variables if variables is None else variables
+        if x == 'variables':
+            return get_group_result(self.sql_list, variables, calculator, self.frequency, self.alike,
+                                    start_date, end_date)
+        return get_group_summary(self.sql_list, variables, calculator, self.frequency, self.alike,
+                                 start_date, end_date)
+
+    def case_result(self, sql: str, variables=None, start_date=None, end_date=None):
+        """
+        Result of one ingested case, see `reader.get_case_result`.
+
+        Returns
+        -------
+        IDFResult or None
+            None if the case was not ingested.
+        """
+        sql = os.path.normpath(sql)
+        if sql not in self.cases:
+            return None
+        variables = self.variables if variables is None else variables
+        return get_case_result(sql, variables, self.frequency, self.alike, start_date, end_date)
@@ -323,10 +323,11 @@ class IDFEditor(IDFsearchresult):
         self.params = []
         for param in self.sampler.run(*self.args):
             try:
-                if self.obj.getrange(self.field)['maximum'] is not None or self.obj.getrange(self.field)['minimum'] is not None:
-                    if param < self.obj.getrange(self.field)['minimum'] or param < self.obj.getrange(self.field)['maximum']:
-                        print(f'**********Warning: parameters out of range: {self.idfclass}=>{self.name}=>{self.field},value={param}')
-                        continue
+                fieldRange = self.obj.getrange(self.field)
+                if (fieldRange['minimum'] is not None and param < fieldRange['minimum']) or \
+                        (fieldRange['maximum'] is not None and param > fieldRange['maximum']):
+                    print(f'**********Warning: parameters out of range: {self.idfclass}=>{self.name}=>{self.field},value={param}')
+                    continue
             except:
                 pass
                 # print(f'**********Warning: parameters maybe not valid: {self.idfclass}=>{self.name}=>{self.field},value={param}')
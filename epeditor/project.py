@@ -139,8 +139,7 @@ class project:
         for edit in self.editor:
             edit.save(os.path.join(saveTempFolder, 'edt_' + generate_code(6) + '.edt'))
         for res in self.result:
-            if res.dump:
-                res.load()
+            # memory-mapped results are copied file to file
             res.save(os.path.join(saveTempFolder, 'res_' + generate_code(6) + '.npy'))
         for gen in self.generator:
             gen.run_to_py(os.path.join(saveTempFolder, f'gen_' + generate_code(6) + '.py'))
@@ -1,15 +1,91 @@
 import numpy as np
 from .db_eplusout_reader import Variable, get_results, exceptions
 from .utils import Hourly, Daily, Monthly, Annually, generate_code, bar
+from .cache import get_cached_arrays
+from .db_eplusout_reader.sql_reader import iter_federated_arrays
+from .db_eplusout_reader.results_dict import open_csv, get_chunk_rows
+from .reducers import Reducer, CaseReduction, as_reducer
+from .calculators import apply_calculator
 from datetime import datetime
-import os, shutil
+from collections import OrderedDict
+import os, shutil, weakref
+from multiprocessing.pool import Pool
+
+Working_Dir = os.path.join('.', '_epeditortemp')
+# results larger than this number of elements are kept on disk and memory-mapped
+Spill_Threshold = 100000
+# bytes of result data kept in memory per process, least recently used results spill first
+Memory_Budget = 512 * 1024 ** 2
+_resident = OrderedDict()
+
+
+def set_result_policy(working_dir: str = None, spill_threshold: int = None, memory_budget: int = None):
+    """
+    Configure where and when IDFResult data of this process is moved to disk.
+
+    Parameters
+    ----------
+    working_dir : str, optional
+        Folder receiving the .npy files of spilled results.
+    spill_threshold : int, optional
+        Results with more elements than this are written to disk as soon as they are created.
+    memory_budget : int, optional
+        Bytes of result data kept in memory; beyond it the least recently used results are spilled.
+    """
+    global Working_Dir, Spill_Threshold, Memory_Budget
+    if working_dir is not None:
+        Working_Dir = working_dir
+    if spill_threshold is not None:
+        Spill_Threshold = spill_threshold
+    if memory_budget is not None:
+        Memory_Budget = memory_budget
+    _enforce_budget()
+
+
+def working_dir():
+    """
+    Get the working folder of this process, creating it if needed.
+
+    Returns
+    -------
+    str
+    """
+    if not os.path.exists(Working_Dir):
+        os.makedirs(Working_Dir)
+    return Working_Dir
+
+
+def _touch(result):
+    _resident[id(result)] = weakref.ref(result)
+    _resident.move_to_end(id(result))
+    _enforce_budget(result)
+
+
+def _enforce_budget(keep=None):
+    total = 0
+    for key in reversed(list(_resident.keys())):
+        result = _resident[key]()
+        if result is None or result.nbytes_in_memory == 0:
+            del _resident[key]
+            continue
+        total += result.nbytes_in_memory
+        if total > Memory_Budget and result is not keep:
+            total -= result.nbytes_in_memory
+            result.spill()
+            _resident.pop(key, None)
+
+
+def _remove_spill(path):
+    for file in [path, path[:-4] + '_variables.npy']:
+        try:
+            os.remove(file)
+        except OSError:
+            pass
 
-Working_Dir = r'.\_epeditortemp'
-if not os.path.exists(Working_Dir):
-    os.mkdir(Working_Dir)
 
 class IDFResult:
-    __slots__ = ['variables', 'frequency', 'dump', '__cache', 'sql_list', 'metaData']
+    __slots__ = ['variables', 'frequency', 'dump', '__cache', '__map', '__spill', 'sql_list', 'metaData',
+                 '__weakref__']
 
     def __init__(self, variables, frequency, data, sql_list):
         """
@@ -22,8 +98,9 @@ class IDFResult:
         frequency : str
             String indicating the frequency of the data (e.g., 'D' for daily, 'M' for monthly).
         data : str or array-like
-            If a string, it should be a file path to load data from; if array-like, it should be a 2D array 
-            with shape matching the number of variables. If the size exceeds 100,000 elements, data is saved automatically.
+            If a string, it should be a file path to a .npy file which is memory-mapped; if array-like, it should
+            be an array whose first axis matches the number of variables. Arrays larger than `Spill_Threshold`
+            elements are written to `Working_Dir` and memory-mapped, see `set_result_policy`.
         sql_list : list
             List of SQL commands or strings associated with the data.
         
@@ -35,34 +112,88 @@ class IDFResult:
         self.frequency = frequency
         self.dump = None
         self.__cache = None
+        self.__map = None
+        self.__spill = None
         self.metaData = {}
         self.sql_list = sql_list
         if isinstance(data, str):
             if os.path.isfile(data):
                 self.dump = data
         else:
+            data = np.asarray(data)
             if len(variables) != len(data):
                 raise Exception('Illegal variables or data: they should have the same len')
             self.__cache = data
+            if data.size > Spill_Threshold:
+                self.spill()
+            else:
+                _touch(self)
 
-        if self.__cache.shape[0] * self.__cache.shape[1] > 100000:
-            self.save()
+    @property
+    def nbytes_in_memory(self):
+        """Bytes of data held in memory, 0 once the result lives on disk."""
+        return self.__cache.nbytes if self.__cache is not None else 0
 
     @property
     def data(self):
         """
-        Property that returns the processed data from either a saved dump or an internal cache.
+        Property that returns the data, memory-mapped (read-only) when it lives on disk.
         
         Returns
         -------
-        numpy.ndarray
-            The loaded data array with the first column removed if loading from `dump`, 
-            otherwise returns the cached data stored in `__cache`.
+        numpy.ndarray or numpy.memmap
+            The memory-mapped `dump` file, otherwise the cached data stored in `__cache`.
         """
-        if self.dump is not None:
-            return np.load(self.dump)[:, 1:]
-        else:
+        if self.__cache is not None:
+            _touch(self)
             return self.__cache
+        if self.dump is not None:
+            if self.__map is None:
+                self.__map = np.load(self.dump, mmap_mode='r')
+            return self.__map
+        return None
+
+    def __getitem__(self, item):
+        return np.array(self.data[item])
+
+    def select(self, variables=None, steps=None, cases=None):
+        """
+        Read part of the result without loading the rest.
+        
+        Parameters
+        ----------
+        variables : int, Variable or list of them, optional
+            Variables to keep, by position or by Variable. Default is None (all).
+        steps : int, slice or list of int, optional
+            Time steps to keep, by position. Default is None (all).
+        cases : int, str or list of them, optional
+            Cases to keep, by position or SQL path, for results holding a case axis. Default is None (all).
+        
+        Returns
+        -------
+        numpy.ndarray
+            The selected block, axes follow `data`.
+        """
+        index = [slice(None)] * len(self.data.shape)
+        if variables is not None:
+            if isinstance(variables, (int, np.integer, Variable)):
+                variables = [variables]
+            index[0] = [v if isinstance(v, (int, np.integer)) else list(self.variables).index(v) for v in variables]
+        if steps is not None:
+            index[1] = [steps] if isinstance(steps, (int, np.integer)) else steps
+        if cases is not None:
+            if len(index) < 3:
+                raise Exception('The result has no case axis')
+            if isinstance(cases, (int, np.integer, str)):
+                cases = [cases]
+            sql_list = [os.path.normpath(sql) for sql in self.sql_list]
+            index[2] = [c if isinstance(c, (int, np.integer)) else sql_list.index(os.path.normpath(c)) for c in cases]
+        block = self.data
+        # apply one axis after the other, so lists on several axes are not broadcast together
+        for axis, idx in enumerate(index):
+            if not (isinstance(idx, slice) and idx == slice(None)):
+                block = block[(slice(None),) * axis + (idx,)]
+        return np.array(block)
 
     @classmethod
     def from_npy(cls, path):
@@ -80,22 +211,42 @@ class IDFResult:
         cls
             An instance of the class initialized with the loaded variables, inferred frequency, and path.
         """
-        data = np.load(path)
-        variables = [eval(var) for var in np.load(path[:-4]) + '_variables.npy']
-        frequency = len(data[0])
+        data = np.load(path, mmap_mode='r')
+        variables = np.load(path[:-4] + '_variables.npy', allow_pickle=True)
+        variables = [eval(var) if isinstance(var, str) else Variable(*var) for var in variables.tolist()]
+        frequency = data.shape[1] if len(data.shape) > 1 else 1
         if frequency <= 1:
             frequency = Annually
         elif frequency <= 12:
             frequency = Monthly
-        elif frequency <= 365:
+        elif frequency <= 366:
             frequency = Daily
         else:
-            frequency = Daily
+            frequency = Hourly
         del data
-        res = cls(variables, frequency, path)
+        res = cls(variables, frequency, path, [])
         return res
 
-    def save(self, path: str = os.path.join(Working_Dir, generate_code(6) + '.npy')):
+    def spill(self):
+        """
+        Move the in-memory data to a .npy file in `Working_Dir` and memory-map it from now on.
+
+        The file is removed when the result is garbage collected, loaded back or saved elsewhere.
+        """
+        if self.__cache is not None:
+            path = os.path.join(working_dir(), generate_code(6) + '.npy')
+            self.save(path)
+            self.__spill = weakref.finalize(self, _remove_spill, path)
+
+    def _release_spill(self):
+        """Remove the spill file once the data lives elsewhere."""
+        if self.__spill is not None:
+            # the memory map keeps the file open on Windows
+            self.__map = None
+            self.__spill()
+            self.__spill = None
+
+    def save(self, path: str = None):
         """
         Save the current state of the object to a file.
         
@@ -109,19 +260,28 @@ class IDFResult:
         -------
         None
         """
+        if path is None:
+            path = os.path.join(working_dir(), generate_code(6) + '.npy')
         if self.__cache is None and self.dump is not None:
-            if path != self.dump:
+            if os.path.abspath(path) != os.path.abspath(self.dump):
                 shutil.copy(self.dump, path)
-            self.dump = path
+                self._release_spill()
         elif self.__cache is not None:
             np.save(path, self.__cache)
-            np.save(path[:-4] + '_variables.npy', self.variables)
-            self.dump = path
             self.__cache = None
+            _resident.pop(id(self), None)
+        else:
+            return
+        np.save(path[:-4] + '_variables.npy', np.array([v.__repr__() for v in self.variables]))
+        self.dump = path
+        self.__map = None
 
-    def to_csv(self, path: str, seq: str = ','):
+    def to_csv(self, path: str, seq: str = ',', compress: bool = None, chunk_rows: int = None):
         """
         Write data to a CSV file in a formatted string sequence.
+
+        Rows are formatted and written in chunks straight from the (possibly memory-mapped) data,
+        so the whole table is never held in memory.
         
         Parameters
         ----------
@@ -129,25 +289,36 @@ class IDFResult:
             The file path where the CSV will be saved.
         seq : str, optional
             The delimiter sequence used to separate values in the CSV. Default is ','.
+        compress : bool, optional
+            Write a gzip compressed CSV. Default is None (compress when `path` ends with .gz).
+        chunk_rows : int, optional
+            Number of rows formatted at once. Default is None (about `CHUNK_CELLS` values per chunk).
         
         Returns
         -------
         None
             This function does not return any value.
         """
-        streams = []
-        if len(np.array(self.data).shape) == 2:
-            streamData = np.array(self.__cache).T
-            streams += [seq.join(['directory'] + [v.__repr__() for v in self.variables])]
-            streams += [seq.join(np.append([os.path.dirname(file)], line.astype(str))) for line, file in
-                        zip(streamData, self.sql_list)]
-        if len(np.array(self.data).shape) == 3:
-            for i, v in enumerate(self.variables):
-                streams += [v.__repr__()]
-                streams += [seq.join([os.path.dirname(file).split('\\')[-1] for file in self.sql_list])]
-                streams += [seq.join(line.astype(str)) for line in np.array(self.__cache[i])]
-        with open(path, 'w+') as f:
-            f.write('\n'.join(streams))
+        data = self.data
+        chunk_rows = get_chunk_rows(data.shape[0] if len(data.shape) == 2 else data.shape[-1], chunk_rows)
+        with open_csv(path, compress=compress, newline=None) as f:
+            if len(data.shape) == 2:
+                f.write(seq.join(['directory'] + [v.__repr__() for v in self.variables]))
+                for start in range(0, data.shape[1], chunk_rows):
+                    # repr of python floats matches numpy str formatting and is much faster
+                    lines = np.asarray(data[:, start:start + chunk_rows]).T.tolist()
+                    files = self.sql_list[start:start + chunk_rows]
+                    f.write(''.join('\n' + seq.join([os.path.dirname(file)] + list(map(repr, line)))
+                                    for line, file in zip(lines, files)))
+            if len(data.shape) == 3:
+                for i, v in enumerate(self.variables):
+                    if i:
+                        f.write('\n')
+                    f.write(v.__repr__() + '\n')
+                    f.write(seq.join([os.path.dirname(file).split('\\')[-1] for file in self.sql_list]))
+                    for start in range(0, data.shape[1], chunk_rows):
+                        lines = np.asarray(data[i, start:start + chunk_rows]).tolist()
+                        f.write(''.join('\n' + seq.join(map(repr, line)) for line in lines))
 
     def load(self):
         """
@@ -168,13 +339,353 @@ class IDFResult:
         if self.__cache is None and self.dump is not None:
             self.__cache = np.load(self.dump)
             self.dump = None
+            self.__map = None
+            self._release_spill()
+            _touch(self)
         return self.__cache
 
 
+def request_variables(variables):
+    """
+    Normalize requested variables into a list.
+
+    Parameters
+    ----------
+    variables : Variable or list of Variable
+        Requested variables; a 'None' string key is treated as any key.
+
+    Returns
+    -------
+    list of Variable
+    """
+    if isinstance(variables, Variable):
+        variables = [variables]
+    return [Variable(None, v.type, v.units) if v.key == 'None' else v for v in variables]
+
+
+def iter_case_results(sql_list: list, variables, frequency=Monthly,
+                      alike=False, start_date=None, end_date=None, catalogue=None, federated=False,
+                      warehouse=None, resample=None):
+    """
+    Read all requested variables from each case file in a single pass.
+
+    Every case file is opened once and all variables are fetched together, variables read before
+    are served from the case cache; cases missing any of the variables are reported and skipped.
+
+    Parameters
+    ----------
+    sql_list : list of str
+        List of file paths to SQL files.
+    variables : list of Variable
+        Requested variables, see `request_variables`.
+    frequency : str, optional
+        The temporal frequency of the data. Default is Monthly.
+    alike : bool, optional
+        If True, allows approximate matching of variable names. Default is False.
+    start_date : datetime, optional
+        Start date for filtering the time range of data. Default is None.
+    end_date : datetime, optional
+        End date for filtering the time range of data. Default is None.
+    catalogue : VariableCatalogue, optional
+        Project catalogue used to resolve variable ids without querying SQLite. Default is None.
+    federated : bool, optional
+        If True, case SQL files are attached in batches to one SQLite connection and read with
+        UNION ALL queries instead of going through the case cache, .eso cases are still read one by one.
+        Default is False.
+    warehouse : Warehouse, optional
+        Project warehouse serving the cases it holds, other cases go through the case cache. Default is None.
+    resample : bool, optional
+        If True, the Daily, Monthly, Annual and RunPeriod series of 'Sum' and 'Avg' variables are aggregated
+        from their cached hourly or timestep series instead of being read from SQLite, see
+        `cache.get_cached_arrays`. Cases read federated or served by the warehouse keep their reported
+        series. Default is None (`cache.RESAMPLE`).
+
+    Yields
+    ------
+    tuple of (str, numpy.ndarray, numpy.ndarray)
+        Normalized SQL path, (variables, steps) data array and timestamps of each valid case.
+    """
+    if federated:
+        sql_list = [os.path.normpath(sql) for sql in sql_list]
+        # .eso cases cannot be attached, they are read one by one in their place
+        attached = iter_federated_arrays([sql for sql in sql_list if sql.lower().endswith('.sql')], variables,
+                                         frequency, alike, start_date, end_date)
+        found = next(attached, None)
+        for i, sql in enumerate(sql_list):
+            bar(i, len(sql_list), 1)
+            if not sql.lower().endswith('.sql'):
+                try:
+                    array, time_series = get_cached_arrays(sql, variables, frequency, alike, start_date, end_date,
+                                                           catalogue, resample)
+                except Exception as e:
+                    print(e)
+                    continue
+                yield sql, array, time_series
+            elif found is not None and found[0] == sql:
+                yield found
+                found = next(attached, None)
+            else:
+                print(f'**********Variables not found in {sql}')
+        return
+    for i in range(len(sql_list)):
+        sql = os.path.normpath(sql_list[i])
+        try:
+            result = None
+            if warehouse is not None:
+                result = warehouse.first_arrays(sql, variables, frequency, alike, start_date, end_date)
+            if result is None:
+                result = get_cached_arrays(sql, variables, frequency, alike, start_date, end_date, catalogue,
+                                           resample)
+            array, time_series = result
+        except Exception as e:
+            print(e)
+            continue
+        finally:
+            bar(i, len(sql_list), 1)
+        yield sql, array, time_series
+
+
+def stack_cases(case_arrays: list, n_variables: int):
+    """
+    Stack case arrays into a case * variable * step cube.
+
+    Cases reporting fewer steps than the longest one are filled with -999.
+
+    Parameters
+    ----------
+    case_arrays : list of numpy.ndarray
+        (variables, steps) array of each case.
+    n_variables : int
+        Number of requested variables, used when there is no valid case.
+
+    Returns
+    -------
+    numpy.ndarray
+        Array of shape (cases, variables, steps).
+    """
+    if len(case_arrays) == 0:
+        return np.empty((0, n_variables, 0))
+    maxLenth = max(array.shape[1] for array in case_arrays)
+    cube = np.full((len(case_arrays), n_variables, maxLenth), -999.)
+    for i, array in enumerate(case_arrays):
+        if array.shape[1] == maxLenth:
+            cube[i] = array
+    return cube
+
+
+def _read_shard(args):
+    """
+    Read one shard of case files in a worker process.
+
+    The stacked cube is written to a .npy memory map under the working folder of the parent,
+    so only the file path, the valid SQL paths and the step count of each case travel back.
+
+    Parameters
+    ----------
+    args : tuple
+        (sql_list, variables, frequency, alike, start_date, end_date, catalogue, federated, warehouse, resample,
+        folder) of the shard.
+
+    Returns
+    -------
+    tuple of (str or None, list of str, list of int)
+        Memory map path, valid SQL paths and number of steps of each valid case.
+    """
+    variables, folder = args[1], args[-1]
+    validSql, case_arrays = [], []
+    for sql, array, _ in iter_case_results(*args[:-1]):
+        validSql.append(sql)
+        case_arrays.append(array)
+    if len(case_arrays) == 0:
+        return None, validSql, []
+    lengths = [array.shape[1] for array in case_arrays]
+    path = os.path.join(folder, 'shard' + generate_code(8) + '.npy')
+    cube = np.lib.format.open_memmap(path, mode='w+', dtype=np.float64,
+                                     shape=(len(case_arrays), len(variables), max(lengths)))
+    for i, array in enumerate(case_arrays):
+        cube[i, :, :lengths[i]] = array
+    cube.flush()
+    del cube
+    return path, validSql, lengths
+
+
+def read_cases(sql_list: list, variables, frequency=Monthly, alike=False,
+               start_date=None, end_date=None, workers=1, catalogue=None, federated=False, warehouse=None,
+               resample=None):
+    """
+    Read all requested variables from a list of case files, optionally with a process pool.
+
+    With several workers `sql_list` is split into contiguous shards, so the valid cases
+    keep the same order as in the serial path.
+
+    Parameters
+    ----------
+    sql_list : list of str
+        List of file paths to SQL files.
+    variables : list of Variable
+        Requested variables, see `request_variables`.
+    frequency : str, optional
+        The temporal frequency of the data. Default is Monthly.
+    alike : bool, optional
+        If True, allows approximate matching of variable names. Default is False.
+    start_date : datetime, optional
+        Start date for filtering the time range of data. Default is None.
+    end_date : datetime, optional
+        End date for filtering the time range of data. Default is None.
+    workers : int, optional
+        Number of worker processes. Default is 1 (read in the current process).
+    catalogue : VariableCatalogue, optional
+        Project catalogue used to resolve variable ids without querying SQLite. Default is None.
+    federated : bool, optional
+        If True, case files are attached in batches to one SQLite connection and read with
+        UNION ALL queries instead of going through the case cache. Default is False.
+    warehouse : Warehouse, optional
+        Project warehouse serving the cases it holds, other cases go through the case cache. Default is None.
+    resample : bool, optional
+        If True, the Daily, Monthly, Annual and RunPeriod series of 'Sum' and 'Avg' variables are aggregated
+        from their cached hourly or timestep series instead of being read from SQLite, see
+        `cache.get_cached_arrays`. Default is None (`cache.RESAMPLE`).
+
+    Returns
+    -------
+    tuple of (list of str, list of numpy.ndarray)
+        Valid SQL paths and the (variables, steps) array of each valid case.
+    """
+    workers = min(int(workers or 1), len(sql_list))
+    if workers <= 1:
+        validSql, case_arrays = [], []
+        for sql, array, _ in iter_case_results(sql_list, variables, frequency, alike, start_date, end_date, catalogue,
+                                               federated, warehouse, resample):
+            validSql.append(sql)
+            case_arrays.append(array)
+        return validSql, case_arrays
+
+    bounds = np.linspace(0, len(sql_list), workers + 1).astype(int)
+    folder = os.path.abspath(working_dir())
+    shards = [(sql_list[bounds[i]:bounds[i + 1]], variables, frequency, alike, start_date, end_date, catalogue,
+               federated, warehouse, resample, folder) for i in range(workers)]
+    prs_pool = Pool(workers)
+    try:
+        shard_results = prs_pool.map(_read_shard, shards)
+    finally:
+        prs_pool.close()
+        prs_pool.join()
+
+    validSql, case_arrays = [], []
+    for path, shardSql, lengths in shard_results:
+        if path is None:
+            continue
+        cube = np.load(path, mmap_mode='r')
+        for i in range(len(shardSql)):
+            case_arrays.append(np.array(cube[i, :, :lengths[i]]))
+        validSql.extend(shardSql)
+        del cube
+        os.remove(path)
+    return validSql, case_arrays
+
+
+def _reduce_shard(args):
+    """
+    Reduce one shard of case files in a worker process.
+
+    Parameters
+    ----------
+    args : tuple
+        (sql_list, variables, frequency, alike, start_date, end_date, catalogue, federated, warehouse, resample,
+        reducer) of the shard.
+
+    Returns
+    -------
+    tuple of (list of str, CaseReduction)
+        Valid SQL paths and the reduction state of the shard.
+    """
+    reduction = CaseReduction(args[-1].empty())
+    validSql = []
+    for sql, array, _ in iter_case_results(*args[:-1]):
+        validSql.append(sql)
+        reduction.update(array)
+    return validSql, reduction
+
+
+def reduce_cases(sql_list: list, variables, reducer: Reducer, frequency=Monthly, alike=False,
+                 start_date=None, end_date=None, workers=1, catalogue=None, federated=False, warehouse=None,
+                 resample=None):
+    """
+    Reduce all requested variables over a list of case files without stacking the cases.
+
+    Each case updates the reducer as soon as it is read, so memory stays at one
+    (variables, steps) state whatever the number of cases. With several workers every
+    contiguous shard is reduced in its own process and the states are merged in order.
+
+    Parameters
+    ----------
+    sql_list : list of str
+        List of file paths to SQL files.
+    variables : list of Variable
+        Requested variables, see `request_variables`.
+    reducer : Reducer
+        Empty reducer applied over the cases, see `reducers.as_reducer`.
+    frequency : str, optional
+        The temporal frequency of the data. Default is Monthly.
+    alike : bool, optional
+        If True, allows approximate matching of variable names. Default is False.
+    start_date : datetime, optional
+        Start date for filtering the time range of data. Default is None.
+    end_date : datetime, optional
+        End date for filtering the time range of data. Default is None.
+    workers : int, optional
+        Number of worker processes. Default is 1 (read in the current process).
+    catalogue : VariableCatalogue, optional
+        Project catalogue used to resolve variable ids without querying SQLite. Default is None.
+    federated : bool, optional
+        If True, case files are attached in batches to one SQLite connection and read with
+        UNION ALL queries instead of going through the case cache. Default is False.
+    warehouse : Warehouse, optional
+        Project warehouse serving the cases it holds, other cases go through the case cache. Default is None.
+    resample : bool, optional
+        If True, the Daily, Monthly, Annual and RunPeriod series of 'Sum' and 'Avg' variables are aggregated
+        from their cached hourly or timestep series instead of being read from SQLite, see
+        `cache.get_cached_arrays`. Default is None (`cache.RESAMPLE`).
+
+    Returns
+    -------
+    tuple of (list of str, numpy.ndarray)
+        Valid SQL paths and the (variables, steps) reduced array.
+    """
+    workers = min(int(workers or 1), len(sql_list))
+    if workers <= 1:
+        validSql, reduction = _reduce_shard((sql_list, variables, frequency, alike, start_date, end_date, catalogue,
+                                             federated, warehouse, resample, reducer))
+        return validSql, reduction.result(len(variables))
+
+    bounds = np.linspace(0, len(sql_list), workers + 1).astype(int)
+    shards = [(sql_list[bounds[i]:bounds[i + 1]], variables, frequency, alike, start_date, end_date, catalogue,
+               federated, warehouse, resample, reducer) for i in range(workers)]
+    prs_pool = Pool(workers)
+    try:
+        shard_results = prs_pool.map(_reduce_shard, shards)
+    finally:
+        prs_pool.close()
+        prs_pool.join()
+
+    validSql, reduction = [], CaseReduction(reducer.empty())
+    for shardSql, shard_reduction in shard_results:
+        validSql.extend(shardSql)
+        reduction.merge(shard_reduction)
+    return validSql, reduction.result(len(variables))
+
+
 def get_group_result(sql_list: list, variables: Variable, calculator, frequency=Monthly,
-                     alike=False, start_date=None, end_date=None, dump_path=None):
+                     alike=False, start_date=None, end_date=None, dump_path=None, workers=1, catalogue=None,
+                     federated=False, warehouse=None, resample=None):
     """
     Compute aggregated results for a list of SQL files and variables using a specified calculator function.
+
+    Each case file is read once for all variables. Calculators with an online equivalent
+    (np.sum, np.mean, np.min, np.max, np.var, np.std, len or a `reducers.Reducer`) are updated
+    case by case; other callables, including the exact np.median and `calculators.Percentile`,
+    are applied to the stacked cases afterward, as a single NumPy reduction when registered in
+    `calculators`. Pass `reducers.Quantile` explicitly for an approximate streamed quantile.
     
     Parameters
     ----------
@@ -182,8 +693,9 @@ def get_group_result(sql_list: list, variables: Variable, calculator, frequency=
         List of file paths to SQL files from which data will be retrieved.
     variables : Variable or list of Variable
         One or more Variable objects specifying the data variables to extract and process.
-    calculator : callable
-        A function that takes a data series (array-like) and returns a computed scalar or array value.
+    calculator : callable or Reducer
+        A function that takes a data series (array-like) and returns a computed scalar or array value,
+        or a `reducers.Reducer` such as `Quantile(0.9)`.
     frequency : type, optional
         The temporal frequency/resolution of the data (e.g., Monthly). Default is Monthly.
     alike : bool, optional
@@ -195,6 +707,19 @@ def get_group_result(sql_list: list, variables: Variable, calculator, frequency=
     dump_path : str, optional
         If provided, the resulting group data will be saved to this file path in .npy format.
         Also saves associated variables. Returns the path string instead of IDFResult if used. Default is None.
+    workers : int, optional
+        Number of processes reading the case files in parallel. Default is 1.
+    catalogue : VariableCatalogue, optional
+        Project catalogue used to resolve variable ids without querying SQLite. Default is None.
+    federated : bool, optional
+        If True, case files are attached in batches to one SQLite connection and read with
+        UNION ALL queries instead of going through the case cache. Default is False.
+    warehouse : Warehouse, optional
+        Project warehouse serving the cases it holds, other cases go through the case cache. Default is None.
+    resample : bool, optional
+        If True, the Daily, Monthly, Annual and RunPeriod series of 'Sum' and 'Avg' variables are aggregated
+        from their cached hourly or timestep series instead of being read from SQLite, see
+        `cache.get_cached_arrays`. Default is None (`cache.RESAMPLE`).
     
     Returns
     -------
@@ -202,39 +727,22 @@ def get_group_result(sql_list: list, variables: Variable, calculator, frequency=
         An IDFResult object containing variables, frequency, computed group results, and valid SQL file paths.
         If dump_path is specified and valid, returns the dump_path string after saving the results.
     """
-    group_result = []
-    if isinstance(variables, Variable):
-        variables = [variables]
-    for variable in variables:
-        print('Group_result:', variable)
-        if variable.key == 'None':
-            variable = Variable(None, variable.type, variable.units)
-            # print(variable)
-        _result = []
-        validSql = []
-        # print(sql_list)
-        for i in range(len(sql_list)):
-            sql = os.path.normpath(sql_list[i])
-            try:
-                # print()
-                # print(sql, variable, frequency)
-                # print(get_results(sql, variable, frequency, alike=True))
-                # print()
-                _result.append(get_results(sql, variable, frequency, alike, start_date, end_date).first_array)
-                validSql.append(sql)
-            except Exception as e:
-                print(e)
-            bar(i, len(sql_list), 1)
-        maxLenth = 0
-        for res in _result:
-            maxLenth = max(len(res), maxLenth)
-        for i in range(len(_result)):
-            if len(_result[i]) < maxLenth:
-                _result[i] = np.reshape(-999, maxLenth)
-        group_result.append(np.array([calculator(data_series) for data_series in np.array(_result).T]))
+    variables = request_variables(variables)
+    print('Group_result:', variables)
+    reducer = as_reducer(calculator)
+    if reducer is not None:
+        validSql, group_result = reduce_cases(sql_list, variables, reducer, frequency, alike,
+                                              start_date, end_date, workers, catalogue, federated, warehouse,
+                                              resample)
         print()
+    else:
+        validSql, _result = read_cases(sql_list, variables, frequency, alike, start_date, end_date, workers, catalogue,
+                                       federated, warehouse, resample)
+        print()
+        # case * variables * freq
+        cube = stack_cases(_result, len(variables))
+        group_result = apply_calculator(calculator, cube, axis=0)
 
-    group_result = np.array(group_result)
     if dump_path is not None and os.path.isfile(dump_path):
         np.save(dump_path, group_result)
         np.save(dump_path[:-4] + '_variables.npy', variables)
@@ -242,9 +750,13 @@ def get_group_result(sql_list: list, variables: Variable, calculator, frequency=
     return IDFResult(variables, frequency, group_result, validSql)
 
 def get_group_summary(sql_list: list, variables: Variable, calculator, frequency=Monthly,
-                     alike=False, start_date=None, end_date=None, dump_path=None):
+                     alike=False, start_date=None, end_date=None, dump_path=None, workers=1, catalogue=None,
+                     federated=False, warehouse=None, resample=None):
     """
     Summarize group results from multiple SQL case files using specified variables and a calculator function.
+
+    Registered calculators (see `calculators`) summarize all cases with a single NumPy reduction,
+    other callables are called once per time step of each case.
     
     Parameters
     ----------
@@ -265,6 +777,19 @@ def get_group_summary(sql_list: list, variables: Variable, calculator, frequency
     dump_path : str, optional
         File path to save the output as a .npy file. If provided, `group_result` is saved and returned as path. 
         Default is None (no saving).
+    workers : int, optional
+        Number of processes reading the case files in parallel. Default is 1.
+    catalogue : VariableCatalogue, optional
+        Project catalogue used to resolve variable ids without querying SQLite. Default is None.
+    federated : bool, optional
+        If True, case files are attached in batches to one SQLite connection and read with
+        UNION ALL queries instead of going through the case cache. Default is False.
+    warehouse : Warehouse, optional
+        Project warehouse serving the cases it holds, other cases go through the case cache. Default is None.
+    resample : bool, optional
+        If True, the Daily, Monthly, Annual and RunPeriod series of 'Sum' and 'Avg' variables are aggregated
+        from their cached hourly or timestep series instead of being read from SQLite, see
+        `cache.get_cached_arrays`. Default is None (`cache.RESAMPLE`).
     
     Returns
     -------
@@ -273,21 +798,27 @@ def get_group_summary(sql_list: list, variables: Variable, calculator, frequency
         and list of valid SQL file paths that were successfully processed.
     """
     group_result,validSql = [],[]
-    if isinstance(variables, Variable):
-        variables = [variables]
-    for i in range(len(sql_list)):
-
-        sql = os.path.normpath(sql_list[i])
-        try:
-            _result = get_case_result(sql, variables, frequency, alike, start_date, end_date)
+    variables = request_variables(variables)
+    caseSql, case_arrays = read_cases(sql_list, variables, frequency, alike, start_date, end_date, workers, catalogue,
+                                       federated, warehouse, resample)
+    try:
+        # cases of the same length are summarized with one reduction over the variable axis
+        cube = stack_cases(case_arrays, len(variables)) if len(set(a.shape for a in case_arrays)) == 1 else None
+        if cube is not None:
+            group_result, validSql = list(apply_calculator(calculator, cube, axis=1)), caseSql
+    except Exception as e:
+        print(e)
+        cube = None
+    if cube is None:
+        for sql, array in zip(caseSql, case_arrays):
+            try:
+                _result = apply_calculator(calculator, array, axis=0)
+            except Exception as e:
+                print(e)
+                continue
             validSql.append(sql)
-            _result = np.array([calculator(data_series) for data_series in np.array(_result.data).T])
             group_result.append(_result)
-        except Exception as e:
-            print(e)
-            continue
-        bar(i, len(sql_list), 1)
-        print('Case Summary:', sql,end='')
+            print('Case Summary:', sql,end='')
 
     print()
     group_result = np.array(group_result)
@@ -309,7 +840,7 @@ def get_group_summary(sql_list: list, variables: Variable, calculator, frequency
         group_result = dump_path
     return IDFResult(variables, frequency, group_result, validSql)
 def get_case_result(sql: str, variables: Variable, frequency=Monthly,
-                    alike=False, start_date=None, end_date=None, dump_path=None):
+                    alike=False, start_date=None, end_date=None, dump_path=None, catalogue=None, warehouse=None):
     """
     Retrieve simulation results for a given SQL query and variable, optionally saving to disk.
     
@@ -331,6 +862,10 @@ def get_case_result(sql: str, variables: Variable, frequency=Monthly,
     dump_path : str, optional
         If provided, saves the result array and variables to the specified .npy file path.
         The result returned will be the path string. Default is None.
+    catalogue : VariableCatalogue, optional
+        Project catalogue used to resolve variable ids without querying SQLite. Default is None.
+    warehouse : Warehouse, optional
+        Project warehouse serving the cases it holds, other cases go through the case cache. Default is None.
     
     Returns
     -------
@@ -342,12 +877,16 @@ def get_case_result(sql: str, variables: Variable, frequency=Monthly,
     if isinstance(variables, Variable):
         variables = [variables]
     try:
-        result = get_results(sql, variables, frequency, alike, start_date, end_date).arrays
+        result = None
+        if warehouse is not None:
+            result = warehouse.first_arrays(sql, variables, frequency, alike, start_date, end_date)
+        if result is None:
+            result = get_cached_arrays(sql, variables, frequency, alike, start_date, end_date, catalogue)
+        result, _ = result
     except exceptions.NoResults:
         print('**********Variable not found. Return None')
         return None
 
-    result = np.array(result)
     if dump_path is not None and os.path.isfile(dump_path):
         np.save(dump_path, result)
         np.save(dump_path[:-4] + '_variables.npy', variables)
@@ -0,0 +1,366 @@
+import numpy as np
+
+PADDING = -999.
+
+
+class Reducer:
+    """
+    Online reduction over cases.
+
+    Each case contributes a (variables, steps) array through `update`, the state only keeps
+    (variables, steps) arrays so memory does not grow with the number of cases. States built on
+    separate shards of cases are combined with `merge`.
+    """
+    __slots__ = ['n']
+
+    def __init__(self):
+        self.n = 0
+
+    def __repr__(self):
+        return f'{type(self).__name__}(n={self.n})'
+
+    def empty(self):
+        """
+        Create a fresh reducer with the same settings.
+
+        Returns
+        -------
+        Reducer
+        """
+        return type(self)()
+
+    def update(self, array):
+        """
+        Add one case.
+
+        Parameters
+        ----------
+        array : numpy.ndarray
+            (variables, steps) array of the case.
+        """
+        raise NotImplementedError
+
+    def merge(self, other):
+        """
+        Add all cases collected by another reducer of the same kind.
+
+        Parameters
+        ----------
+        other : Reducer
+            Reducer built on another set of cases.
+        """
+        raise NotImplementedError
+
+    def result(self):
+        """
+        Get the reduced values.
+
+        Returns
+        -------
+        numpy.ndarray
+            (variables, steps) array.
+        """
+        raise NotImplementedError
+
+
+class Count(Reducer):
+    __slots__ = ['shape']
+
+    def __init__(self):
+        super().__init__()
+        self.shape = None
+
+    def update(self, array):
+        self.shape = np.shape(array)
+        self.n += 1
+
+    def merge(self, other):
+        if other.n > 0:
+            self.shape = other.shape
+            self.n += other.n
+
+    def result(self):
+        return np.full(self.shape, float(self.n))
+
+
+class Sum(Reducer):
+    __slots__ = ['total']
+
+    def __init__(self):
+        super().__init__()
+        self.total = None
+
+    def update(self, array):
+        array = np.asarray(array, dtype=np.float64)
+        self.total = array.copy() if self.n == 0 else self.total + array
+        self.n += 1
+
+    def merge(self, other):
+        if other.n > 0:
+            self.total = other.total.copy() if self.n == 0 else self.total + other.total
+            self.n += other.n
+
+    def result(self):
+        return self.total
+
+
+class Mean(Sum):
+    __slots__ = []
+
+    def result(self):
+        return self.total / self.n
+
+
+class Min(Reducer):
+    __slots__ = ['value']
+    function = staticmethod(np.minimum)
+
+    def __init__(self):
+        super().__init__()
+        self.value = None
+
+    def update(self, array):
+        array = np.asarray(array, dtype=np.float64)
+        self.value = array.copy() if self.n == 0 else self.function(self.value, array)
+        self.n += 1
+
+    def merge(self, other):
+        if other.n > 0:
+            self.value = other.value.copy() if self.n == 0 else self.function(self.value, other.value)
+            self.n += other.n
+
+    def result(self):
+        return self.value
+
+
+class Max(Min):
+    __slots__ = []
+    function = staticmethod(np.maximum)
+
+
+class Var(Reducer):
+    """
+    Population variance (ddof=0 as `np.var`) by Welford's update, merged with Chan's formula.
+    """
+    __slots__ = ['mean', 'm2']
+
+    def __init__(self):
+        super().__init__()
+        self.mean = None
+        self.m2 = None
+
+    def update(self, array):
+        array = np.asarray(array, dtype=np.float64)
+        if self.n == 0:
+            self.mean = array.copy()
+            self.m2 = np.zeros_like(self.mean)
+            self.n = 1
+            return
+        self.n += 1
+        delta = array - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (array - self.mean)
+
+    def merge(self, other):
+        if other.n == 0:
+            return
+        if self.n == 0:
+            self.n, self.mean, self.m2 = other.n, other.mean.copy(), other.m2.copy()
+            return
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        self.mean = self.mean + delta * other.n / n
+        self.m2 = self.m2 + other.m2 + delta ** 2 * self.n * other.n / n
+        self.n = n
+
+    def result(self):
+        return self.m2 / self.n
+
+
+class Std(Var):
+    __slots__ = []
+
+    def result(self):
+        return np.sqrt(self.m2 / self.n)
+
+
+class Quantile(Reducer):
+    """
+    Mergeable quantile sketch over cases, in the manner of KLL compactors.
+
+    Cases are buffered as they come; once a level holds `k` arrays they are sorted per cell and
+    every other value is promoted to the next level with twice the weight. Results are exact
+    (same as `np.quantile`) until the first compaction, and within about 1/k in rank afterwards.
+
+    The sketch is only used when passed explicitly, np.median and `calculators.Percentile` stay exact.
+    """
+    __slots__ = ['q', 'k', 'levels', 'seed', 'rng']
+
+    def __init__(self, q=0.5, k=200, seed=None):
+        """
+        Parameters
+        ----------
+        q : float, optional
+            Quantile to compute, between 0 and 1. Default is 0.5 (median).
+        k : int, optional
+            Capacity of each compactor level. Default is 200.
+        seed : int, optional
+            Seed of the random offsets used by compaction. Default is None.
+        """
+        super().__init__()
+        self.q = q
+        self.k = k
+        self.levels = [[]]
+        self.seed = seed
+        # one generator for all compactions, so that the kept parity varies between them
+        self.rng = np.random.RandomState(seed)
+
+    def __repr__(self):
+        return f'Quantile(q={self.q}, n={self.n})'
+
+    def empty(self):
+        return Quantile(self.q, self.k, self.seed)
+
+    def compact(self):
+        level = 0
+        while level < len(self.levels):
+            if len(self.levels[level]) >= self.k:
+                stacked = np.sort(np.stack(self.levels[level]), axis=0)
+                if len(stacked) % 2:
+                    # keep the odd one at this level
+                    self.levels[level] = [stacked[-1]]
+                    stacked = stacked[:-1]
+                else:
+                    self.levels[level] = []
+                if level + 1 == len(self.levels):
+                    self.levels.append([])
+                self.levels[level + 1].extend(stacked[self.rng.randint(2)::2])
+            level += 1
+
+    def update(self, array):
+        self.levels[0].append(np.array(array, dtype=np.float64))
+        self.n += 1
+        if len(self.levels[0]) >= self.k:
+            self.compact()
+
+    def merge(self, other):
+        for level, items in enumerate(other.levels):
+            if level == len(self.levels):
+                self.levels.append([])
+            self.levels[level].extend(np.array(item) for item in items)
+        self.n += other.n
+        self.compact()
+
+    def result(self):
+        if len(self.levels) == 1:
+            return np.quantile(np.stack(self.levels[0]), self.q, axis=0)
+        values = np.stack([item for items in self.levels for item in items])
+        weights = np.concatenate([np.full(len(items), 2. ** level) for level, items in enumerate(self.levels)])
+        order = np.argsort(values, axis=0)
+        cumulated = np.cumsum(weights[order], axis=0)
+        position = np.argmax(cumulated >= self.q * cumulated[-1], axis=0)
+        return np.take_along_axis(values, np.take_along_axis(order, position[None], axis=0), axis=0)[0]
+
+
+class CaseReduction:
+    """
+    Apply a reducer to cases of possibly different lengths.
+
+    As in `stack_cases`, cases with fewer steps than the longest one count as filled with -999,
+    so only the reducer of the current longest length is kept and shorter cases are counted.
+    """
+    __slots__ = ['reducer', 'n_steps', 'n_short']
+
+    def __init__(self, reducer: Reducer):
+        """
+        Parameters
+        ----------
+        reducer : Reducer
+            Empty reducer to apply.
+        """
+        self.reducer = reducer
+        self.n_steps = None
+        self.n_short = 0
+
+    def update(self, array):
+        """
+        Add one (variables, steps) case array.
+        """
+        n_steps = np.shape(array)[1]
+        if self.n_steps is None or n_steps > self.n_steps:
+            self.n_short += self.reducer.n
+            self.reducer = self.reducer.empty()
+            self.n_steps = n_steps
+        if n_steps < self.n_steps:
+            self.n_short += 1
+        else:
+            self.reducer.update(array)
+
+    def merge(self, other):
+        """
+        Add the cases of another reduction.
+        """
+        if other.n_steps is None:
+            return
+        if self.n_steps is None or other.n_steps > self.n_steps:
+            self.n_short += self.reducer.n
+            self.reducer = self.reducer.empty()
+            self.n_steps = other.n_steps
+        if other.n_steps < self.n_steps:
+            self.n_short += other.reducer.n + other.n_short
+        else:
+            self.reducer.merge(other.reducer)
+            self.n_short += other.n_short
+
+    def result(self, n_variables: int):
+        """
+        Get the (variables, steps) result, an empty (variables, 0) array if there was no case.
+        """
+        if self.n_steps is None:
+            return np.empty((n_variables, 0))
+        padding = np.full((n_variables, self.n_steps), PADDING)
+        for _ in range(self.n_short):
+            self.reducer.update(padding)
+        self.n_short = 0
+        return self.reducer.result()
+
+
+REDUCERS = {
+    np.sum: Sum,
+    np.mean: Mean,
+    np.min: Min,
+    np.amin: Min,
+    min: Min,
+    np.max: Max,
+    np.amax: Max,
+    max: Max,
+    np.var: Var,
+    np.std: Std,
+    len: Count,
+    sum: Sum,
+}
+
+
+def as_reducer(calculator):
+    """
+    Map a calculator onto an online reducer where possible.
+
+    Parameters
+    ----------
+    calculator : callable or Reducer
+        A NumPy reduction such as `np.mean`, a Reducer class or a Reducer instance.
+
+    Returns
+    -------
+    Reducer or None
+        A fresh reducer, None if the calculator has no exact online equivalent (e.g. np.median).
+    """
+    if isinstance(calculator, Reducer):
+        return calculator.empty()
+    if isinstance(calculator, type) and issubclass(calculator, Reducer):
+        return calculator()
+    try:
+        reducer = REDUCERS.get(calculator)
+    except TypeError:
+        return None
+    return reducer() if reducer is not None else None
@@ -0,0 +1,116 @@
+import numpy as np
+from .db_eplusout_reader import constants
+
+# ReportDataDictionary.Type of the variables summed when resampled, 'Avg' variables are averaged
+SUMMED = 'sum'
+AVERAGED = 'avg'
+# target frequency -> datetime64 unit of its periods
+PERIODS = {constants.D: 'D', constants.M: 'M', constants.A: 'Y', constants.RP: None}
+# frequencies resampled from, finest last
+SOURCES = [constants.H, constants.TS]
+
+
+def is_known(var_type):
+    """
+    Check whether a variable of this type can be resampled, i.e. EnergyPlus reported it as 'Sum' or 'Avg'.
+
+    Parameters
+    ----------
+    var_type : str or None
+        `ReportDataDictionary.Type` of the variable.
+
+    Returns
+    -------
+    bool
+    """
+    return var_type is not None and str(var_type).strip().lower() in (SUMMED, AVERAGED)
+
+
+def is_summed(var_type):
+    """
+    Check whether a variable of this type is summed ('Sum') or averaged ('Avg') when resampled.
+
+    Parameters
+    ----------
+    var_type : str or None
+        `ReportDataDictionary.Type` of the variable.
+
+    Returns
+    -------
+    bool
+    """
+    return var_type is not None and str(var_type).strip().lower() == SUMMED
+
+
+def period_starts(timestamps, frequency, environments=None):
+    """
+    Split interval-end timestamps into periods of a coarser frequency.
+
+    A period never spans two environments (e.g. two design days of the same date), as EnergyPlus
+    reports every environment on its own.
+
+    Parameters
+    ----------
+    timestamps : numpy.ndarray of datetime64[m]
+        End of each high-frequency interval, sorted within each environment.
+    frequency : str
+        Target frequency, one of Daily, Monthly, Annually and RunPeriod.
+    environments : numpy.ndarray of int, optional
+        `EnvironmentPeriodIndex` of each interval. Default is None (a single environment).
+
+    Returns
+    -------
+    tuple of (numpy.ndarray of int, numpy.ndarray of datetime64[m])
+        First position of each period and the period timestamps, stamped as the SQL reader stamps them.
+    """
+    timestamps = np.asarray(timestamps, dtype='datetime64[m]')
+    if len(timestamps) == 0:
+        return np.empty(0, dtype=int), timestamps
+    # an interval ending at midnight belongs to the day before
+    periods = timestamps - np.timedelta64(1, 'm')
+    unit = PERIODS[frequency]
+    periods = periods.astype(f'datetime64[{unit or "Y"}]')
+    if unit is None:
+        # one run period per environment, stamped with its first year
+        changes = np.zeros(len(timestamps) - 1, dtype=bool)
+    else:
+        changes = periods[1:] != periods[:-1]
+    if environments is not None:
+        environments = np.asarray(environments)
+        changes |= environments[1:] != environments[:-1]
+    starts = np.concatenate(([0], np.flatnonzero(changes) + 1))
+    return starts, periods[starts].astype('datetime64[m]')
+
+
+def resample(array, timestamps, frequency, types, environments=None):
+    """
+    Aggregate a high-frequency (variables, steps) array into a coarser frequency.
+
+    Variables EnergyPlus reports as 'Sum' are summed over each period, 'Avg' variables are averaged.
+
+    Parameters
+    ----------
+    array : numpy.ndarray
+        (variables, steps) array of hourly or timestep values.
+    timestamps : numpy.ndarray of datetime64[m]
+        Interval-end timestamps of the steps.
+    frequency : str
+        Target frequency, one of Daily, Monthly, Annually and RunPeriod.
+    types : list of str
+        `ReportDataDictionary.Type` of each variable, see `is_summed`.
+    environments : numpy.ndarray of int, optional
+        `EnvironmentPeriodIndex` of each step, see `period_starts`. Default is None (a single environment).
+
+    Returns
+    -------
+    tuple of (numpy.ndarray, numpy.ndarray of datetime64[m])
+        (variables, periods) array and period timestamps.
+    """
+    array = np.asarray(array, dtype=np.float64)
+    starts, period_stamps = period_starts(timestamps, frequency, environments)
+    if len(starts) == 0:
+        return np.empty((len(array), 0)), period_stamps
+    totals = np.add.reduceat(array[:, :len(timestamps)], starts, axis=1)
+    counts = np.diff(np.append(starts, len(timestamps)))
+    summed = np.array([is_summed(t) for t in types], dtype=bool)
+    return np.where(summed[:, None], totals, totals / counts), period_stamps
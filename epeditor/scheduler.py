@@ -0,0 +1,396 @@
+from multiprocessing import Process, Pipe
+from subprocess import call, DEVNULL
+from .simulator import simulate_file, case_folder, make_return_callback, scratch_folder
+import threading
+import queue
+import shutil
+import signal
+import time
+import os
+
+PENDING = 'pending'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+# seconds between two checks of the running jobs
+POLL = 0.2
+# seconds given to a killed job process to exit
+STOP_TIMEOUT = 5.
+
+
+class Job:
+    """
+    Status record of one case run by a `Scheduler`.
+
+    `state` goes from 'pending' to 'running', then to 'done', 'failed' or 'cancelled'. A failed or
+    timed out attempt goes back to 'pending' while retries are left.
+    """
+    __slots__ = ['id', 'idf_path', 'epw', 'priority', 'args', 'kwargs', 'case_dir', 'state', 'attempts',
+                 'message', 'submitted', 'started', 'ended', 'not_before', 'process', 'conn']
+
+    def __init__(self, id, idf_path, epw, priority, args, kwargs, case_dir):
+        self.id = id
+        self.idf_path = idf_path
+        self.epw = epw
+        self.priority = priority
+        self.args = args
+        self.kwargs = kwargs
+        self.case_dir = case_dir
+        self.state = PENDING
+        self.attempts = 0
+        self.message = ''
+        self.submitted = time.time()
+        self.started = None
+        self.ended = None
+        # earliest start of the next attempt, see Scheduler.backoff
+        self.not_before = 0
+        self.process = None
+        self.conn = None
+
+    def __repr__(self):
+        return f'Job({self.id}, {self.state}, attempts={self.attempts}, {self.idf_path})'
+
+    @property
+    def duration(self):
+        """Wall-clock seconds of the last attempt, None if it never started."""
+        if self.started is None:
+            return None
+        return (time.time() if self.ended is None else self.ended) - self.started
+
+    def record(self):
+        """
+        The status of the job as a plain dictionary, e.g. to be dumped in json or csv.
+
+        Returns
+        -------
+        dict
+        """
+        return {'id': self.id, 'idf': self.idf_path, 'epw': self.epw, 'priority': self.priority,
+                'state': self.state, 'attempts': self.attempts, 'message': self.message,
+                'submitted': self.submitted, 'started': self.started, 'ended': self.ended,
+                'duration': self.duration}
+
+
+def run_job(conn, args, kwargs):
+    """
+    Body of a job process: runs `simulate_file` and sends (succeeded, message) back through `conn`.
+
+    On POSIX the process leads its own process group, so that `kill_tree` also reaches EnergyPlus.
+    """
+    if hasattr(os, 'setsid'):
+        os.setsid()
+    try:
+        conn.send((True, simulate_file(*args, **kwargs)))
+    except Exception as e:
+        conn.send((False, f'{type(e).__name__}: {e}'))
+    finally:
+        conn.close()
+
+
+def kill_tree(pid: int):
+    """
+    Kill a job process and the EnergyPlus processes it started.
+
+    Parameters
+    ----------
+    pid : int
+        Process id of the job process.
+
+    Returns
+    -------
+    bool
+        False if the process group was not found, e.g. when the job process has not called `setsid` yet.
+    """
+    if os.name == 'nt':
+        call(['taskkill', '/F', '/T', '/PID', str(pid)], stdout=DEVNULL, stderr=DEVNULL)
+        return True
+    try:
+        os.killpg(pid, signal.SIGKILL)
+    except OSError:
+        return False
+    return True
+
+
+class Scheduler:
+    """
+    Runs simulation cases in parallel processes, one process per attempt.
+
+    Jobs wait in a bounded queue and the highest priority one starts whenever a worker is free,
+    in submission order among equal priorities. An attempt running longer than `timeout` is killed
+    with its EnergyPlus process, failed and timed out attempts are retried after an exponential
+    backoff. The queue can be paused, resumed and cancelled while the cases run, `status` gives
+    the record of every job.
+
+    The jobs are dispatched by a background thread. `on_case` and the messages of the finished jobs
+    are handled in another thread, so that ingesting a large case never delays launches and timeouts.
+    `submit` and `join` call `on_wait` in the calling thread while they wait, e.g.
+    `QApplication.processEvents` to keep a GUI responsive.
+
+    A job fails when `simulate_file` raises, which it does when EnergyPlus exits with an error code
+    or reports a fatal error.
+    """
+    __slots__ = ['workers', 'timeout', 'retries', 'backoff', 'maxsize', 'on_case', 'on_wait',
+                 'jobs', 'pending', 'running', 'paused', 'lock', 'thread', 'finished', 'notifier']
+
+    def __init__(self, workers=4, timeout=None, retries=0, backoff=30., maxsize=256, on_case=None, on_wait=None):
+        """
+        Create an idle scheduler.
+
+        Parameters
+        ----------
+        workers : int, optional
+            Number of cases running at the same time. Default is 4.
+        timeout : float, optional
+            Wall-clock seconds after which an attempt is killed. Default is None (no limit).
+        retries : int, optional
+            Number of times a failed or timed out job is run again. Default is 0.
+        backoff : float, optional
+            Seconds before the first retry of a job, doubled at each further retry. Default is 30.
+        maxsize : int, optional
+            Number of pending jobs above which `submit` blocks. Default is 256.
+        on_case : callable, optional
+            Called with the output folder of each case that finished, see `simulator.make_return_callback`.
+            Default is None.
+        on_wait : callable, optional
+            Called repeatedly by `submit` and `join` while they wait. Default is None.
+        """
+        self.workers = max(int(workers), 1)
+        self.timeout = timeout
+        self.retries = int(retries)
+        self.backoff = backoff
+        self.maxsize = max(int(maxsize), 1)
+        self.on_case = on_case
+        self.on_wait = on_wait
+        self.jobs = []
+        self.pending = []
+        self.running = []
+        self.paused = False
+        self.lock = threading.Condition()
+        self.thread = None
+        # jobs done, waiting for their callbacks
+        self.finished = queue.Queue()
+        self.notifier = None
+
+    def __repr__(self):
+        states = {}
+        for job in self.jobs:
+            states[job.state] = states.get(job.state, 0) + 1
+        return f'Scheduler({self.workers} workers, {states})'
+
+    def submit(self, idf_path: str, epw: str, idd: str = None, overwrite=False, verbose='q', long_dir=False,
+               priority=0, **kwargs):
+        """
+        Queue a case, blocking while `maxsize` jobs are already pending.
+
+        Parameters
+        ----------
+        idf_path : str
+            Path to the IDF file of the case.
+        epw : str
+            Path to the EPW weather file.
+        idd : str, optional
+            Path to the IDD file. Default is None.
+        overwrite : bool, optional
+            If True, overwrites existing output files. Default is False.
+        verbose : str, optional
+            Verbosity level of EnergyPlus, see `simulate_file`. Default is 'q'.
+        long_dir : bool, optional
+            If True, the output folder combines the IDF and EPW base names. Default is False.
+        priority : float, optional
+            Jobs with a higher priority start first. Default is 0.
+        **kwargs
+            Additional keyword arguments passed to `simulate_file`.
+
+        Returns
+        -------
+        Job
+        """
+        args = (idf_path, epw, idd, overwrite, verbose, None, long_dir)
+        while True:
+            with self.lock:
+                if len(self.pending) < self.maxsize:
+                    job = Job(len(self.jobs), idf_path, epw, priority, args, kwargs,
+                              case_folder(idf_path, epw, long_dir))
+                    self.jobs.append(job)
+                    self.pending.append(job)
+                    if self.thread is None:
+                        self.thread = threading.Thread(target=self._dispatch, daemon=True)
+                        self.thread.start()
+                    if self.notifier is None:
+                        self.notifier = threading.Thread(target=self._notify, daemon=True)
+                        self.notifier.start()
+                    self.lock.notify_all()
+                    return job
+                self.lock.wait(POLL)
+            if self.on_wait is not None:
+                self.on_wait()
+
+    def pause(self):
+        """Stop starting pending jobs, the running ones go on."""
+        with self.lock:
+            self.paused = True
+
+    def resume(self):
+        """Start pending jobs again after `pause`."""
+        with self.lock:
+            self.paused = False
+            self.lock.notify_all()
+
+    def cancel(self, job: Job = None):
+        """
+        Cancel a job, or all the pending and running jobs. Running attempts are killed.
+
+        Parameters
+        ----------
+        job : Job, optional
+            The job cancelled. Default is None (all of them).
+        """
+        with self.lock:
+            jobs = self.pending + self.running if job is None else [job]
+            for job in jobs:
+                if job in self.pending:
+                    self.pending.remove(job)
+                elif job in self.running:
+                    self.running.remove(job)
+                    self._stop(job)
+                else:
+                    continue
+                job.state = CANCELLED
+                job.ended = time.time()
+                print(f'**********Cancelled:{job.idf_path}')
+            self.lock.notify_all()
+
+    def join(self):
+        """
+        Wait until no job is pending or running.
+
+        Returns
+        -------
+        list of dict
+            The status records, see `status`.
+        """
+        while True:
+            with self.lock:
+                # the dispatching thread ends with the last job, then its callbacks have to return
+                if self.thread is None and self.finished.unfinished_tasks == 0:
+                    break
+                self.lock.wait(POLL)
+            if self.on_wait is not None:
+                self.on_wait()
+        return self.status()
+
+    def status(self, state: str = None):
+        """
+        Status records of the jobs, see `Job.record`.
+
+        Parameters
+        ----------
+        state : str, optional
+            Only the jobs in this state, e.g. 'failed'. Default is None (all jobs).
+
+        Returns
+        -------
+        list of dict
+        """
+        with self.lock:
+            return [job.record() for job in self.jobs if state is None or job.state == state]
+
+    def _dispatch(self):
+        """Loop of the dispatching thread, ends when no job is left."""
+        while True:
+            with self.lock:
+                for job in self._reap():
+                    self.finished.put(job)
+                if not self.paused:
+                    self._launch()
+                if not self.pending and not self.running:
+                    self.thread = None
+                    self.lock.notify_all()
+                    return
+                self.lock.wait(POLL)
+
+    def _notify(self):
+        """Loop of the notifying thread, runs the callbacks of the finished jobs in order."""
+        while True:
+            job = self.finished.get()
+            try:
+                make_return_callback(self.on_case, job.case_dir if job.idf_path.endswith('.idf') else None)(job.message)
+            finally:
+                self.finished.task_done()
+                with self.lock:
+                    self.lock.notify_all()
+
+    def _launch(self):
+        """Start the eligible pending jobs while workers are free."""
+        now = time.time()
+        while len(self.running) < self.workers:
+            ready = [job for job in self.pending if job.not_before <= now]
+            if not ready:
+                return
+            job = max(ready, key=lambda j: (j.priority, -j.id))
+            self.pending.remove(job)
+            job.conn, child_conn = Pipe(duplex=False)
+            job.process = Process(target=run_job, args=(child_conn, job.args, job.kwargs), daemon=True)
+            job.process.start()
+            child_conn.close()
+            job.state = RUNNING
+            job.attempts += 1
+            job.started = time.time()
+            job.ended = None
+            self.running.append(job)
+
+    def _reap(self):
+        """Collect the attempts that ended or ran out of time, returns the jobs done."""
+        finished = []
+        now = time.time()
+        for job in list(self.running):
+            if job.process.is_alive():
+                if self.timeout is not None and now - job.started > self.timeout:
+                    self.running.remove(job)
+                    self._stop(job)
+                    self._fail(job, f'Timeout after {self.timeout}s')
+                continue
+            self.running.remove(job)
+            succeeded, message = False, f'Process exited with code {job.process.exitcode}'
+            try:
+                if job.conn.poll():
+                    succeeded, message = job.conn.recv()
+            except (EOFError, OSError):
+                pass
+            job.process.join()
+            job.conn.close()
+            if succeeded:
+                job.state = DONE
+                job.message = message
+                job.ended = time.time()
+                finished.append(job)
+            else:
+                self._fail(job, message)
+        return finished
+
+    def _stop(self, job: Job):
+        """Kill the running attempt of a job, and remove its scratch folder."""
+        if not kill_tree(job.process.pid):
+            # the process does not lead its group yet, nothing else was started
+            job.process.kill()
+        job.process.join(STOP_TIMEOUT)
+        job.conn.close()
+        if job.kwargs.get('scratch') is not None:
+            shutil.rmtree(scratch_folder(job.case_dir, job.kwargs['scratch']), ignore_errors=True)
+
+    def _fail(self, job: Job, message: str):
+        """Queue a failed attempt again while retries are left, otherwise mark the job as failed."""
+        job.message = message
+        job.ended = time.time()
+        if job.attempts <= self.retries:
+            # partial outputs would be taken as an existing result
+            if job.idf_path.endswith('.idf'):
+                shutil.rmtree(job.case_dir, ignore_errors=True)
+            job.state = PENDING
+            job.not_before = job.ended + self.backoff * 2 ** (job.attempts - 1)
+            self.pending.append(job)
+            print(f'****Process Error: {job.idf_path}, {message}, retry {job.attempts}/{self.retries}')
+        else:
+            job.state = FAILED
+            print(f'****Process Error: {job.idf_path}, {message}')
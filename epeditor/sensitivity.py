@@ -0,0 +1,776 @@
+import numpy as np
+from .processor import IDFEditor, IDFGroupEditor
+from .generator import enumerate as enumerate_sampler
+from .simulator import simulate_local, find_sql
+from .reader import IDFResult, request_variables, iter_case_results
+from .reducers import PADDING
+from .utils import RunPeriod
+import os, re
+
+# bootstrap values estimated at once when computing Sobol confidence intervals
+BOOTSTRAP_CELLS = 2 ** 22
+
+
+def editor_factors(*editors):
+    """
+    Flatten editors into the list of factors of a sensitivity design.
+
+    Parameters
+    ----------
+    editors : IDFEditor, list of IDFEditor or IDFGroupEditor
+        Editors whose parameters are varied, every IDFEditor is one factor.
+
+    Returns
+    -------
+    list of IDFEditor
+    """
+    factors = []
+    for edit in editors:
+        if isinstance(edit, IDFEditor):
+            factors.append(edit)
+        elif isinstance(edit, IDFGroupEditor):
+            factors += list(edit.editors)
+        else:
+            factors += editor_factors(*edit)
+    return factors
+
+
+def editor_bounds(factors: list):
+    """
+    Range of the sampled parameters of each factor.
+
+    Parameters
+    ----------
+    factors : list of IDFEditor
+        Factors of the design, see `editor_factors`.
+
+    Returns
+    -------
+    numpy.ndarray
+        (factors, 2) array of minimum and maximum parameter.
+    """
+    bounds = []
+    for edit in factors:
+        try:
+            params = np.asarray(edit.params, dtype=np.float64)
+        except (TypeError, ValueError):
+            raise Exception(f'Parameters of {edit.__repr__()} are not numeric')
+        bounds.append([params.min(), params.max()])
+    return np.array(bounds).reshape(-1, 2)
+
+
+def design_editor(factors: list, design):
+    """
+    Group editor applying a design matrix, the editors given are left untouched.
+
+    Parameters
+    ----------
+    factors : list of IDFEditor
+        Factors of the design, see `editor_factors`.
+    design : numpy.ndarray
+        (runs, factors) parameter values.
+
+    Returns
+    -------
+    IDFGroupEditor
+        One case per row of the design.
+    """
+    return IDFGroupEditor(*[IDFEditor(edit, field=edit.field, _sampler=enumerate_sampler, args=[design[:, i]])
+                            for i, edit in enumerate(factors)])
+
+
+def field_values(model, editors):
+    """
+    Current value of the field edited by each editor in a model.
+
+    Parameters
+    ----------
+    model : IDFModel
+        The model holding the edited objects.
+    editors : list of IDFEditor
+        Editors whose fields are read.
+
+    Returns
+    -------
+    list
+        Value of each field, None when the object is not in the model.
+    """
+    values = []
+    for edit in editors:
+        value = None
+        for obj in model.idfobjects[edit.idfclass]:
+            if obj.fieldvalues[1] == edit.name:
+                value = obj[edit.field]
+                break
+        values.append(value)
+    return values
+
+
+def run_design(model, geditor, epw, folder: str, prefix: str, process_count=4, overwrite=False, **kwargs):
+    """
+    Write and simulate the cases of a design with `simulate_local`.
+
+    The project folder and the field values of `model` are kept, the design cases live in their own folder.
+
+    Parameters
+    ----------
+    model : IDFModel
+        Baseline model the design is applied to.
+    geditor : IDFGroupEditor
+        Design to simulate, see `design_editor`.
+    epw : str
+        Path to the EPW weather file.
+    folder : str
+        Folder of the design cases.
+    prefix : str
+        Case names are `prefix_<run>`.
+    process_count : int, optional
+        Number of simulation processes. Default is 4.
+    overwrite : bool, optional
+        If True, overwrites existing simulation outputs. Default is False.
+    **kwargs : dict
+        Additional keyword arguments passed to `simulate_local`.
+
+    Returns
+    -------
+    list of str or None
+        SQL path of each run, None for runs without output.
+    """
+    file_names = [f'{prefix}_{i}.idf' for i in range(geditor.params_num)]
+    project_folder = model.folder
+    baseline = field_values(model, geditor.editors)
+    try:
+        model.write(geditor, folder, file_names)
+    finally:
+        model.folder = project_folder
+        # write edits the objects of the model in place, the baseline is put back
+        for edit, value in zip(geditor.editors, baseline):
+            if value is not None:
+                model.changeValue(edit.idfclass, edit.name, edit.field, value)
+    print()
+    simulate_local(folder, epw, idd=model.idd, overwrite=overwrite, prs_count=process_count, **kwargs)
+    sql = find_sql(folder)
+    return [sql.get(name[:-4]) for name in file_names]
+
+
+def read_design_outputs(sql_list: list, variables, frequency=RunPeriod, alike=False, start_date=None,
+                        end_date=None):
+    """
+    Read the outputs of every run of a design into one array.
+
+    Parameters
+    ----------
+    sql_list : list of str or None
+        SQL path of each run, see `run_design`.
+    variables : Variable or list of Variable
+        Outputs read.
+    frequency : str, optional
+        The temporal frequency of the data. Default is RunPeriod.
+    alike : bool, optional
+        If True, allows approximate matching of variable names. Default is False.
+    start_date : datetime, optional
+        Start date for filtering the time range of data. Default is None.
+    end_date : datetime, optional
+        End date for filtering the time range of data. Default is None.
+
+    Returns
+    -------
+    numpy.ndarray
+        (runs, variables, steps) array, runs without output (or with a different number of steps) are NaN.
+    """
+    variables = request_variables(variables)
+    runs = {os.path.normpath(sql): i for i, sql in enumerate(sql_list) if sql is not None}
+    outputs = None
+    for sql, array, _ in iter_case_results(list(runs), variables, frequency, alike, start_date, end_date):
+        if outputs is None:
+            outputs = np.full((len(sql_list),) + array.shape, np.nan)
+        if array.shape != outputs.shape[1:]:
+            print(f'**********Steps differ, skipped {sql}')
+            continue
+        outputs[runs[sql]] = array
+    print()
+    if outputs is None:
+        return np.full((len(sql_list), len(variables), 0), np.nan)
+    return outputs
+
+
+def case_runs(sql_list: list):
+    """
+    Run index of each case, parsed from its `<name>_<run>` folder as written by `IDFModel.write`.
+
+    Returns
+    -------
+    numpy.ndarray
+        Run index of each case, -1 when the folder name has no run number.
+    """
+    runs = []
+    for sql in sql_list:
+        case = os.path.basename(os.path.dirname(os.path.normpath(sql))).split('+')[0]
+        match = re.search(r'_(\d+)$', case)
+        runs.append(int(match.group(1)) if match else -1)
+    return np.array(runs, dtype=int)
+
+
+def result_outputs(result, n_runs: int):
+    """
+    Outputs of every run from a group result keeping every case.
+
+    Parameters
+    ----------
+    result : IDFResult
+        Result of `group_result(variables, np.array, frequency)`, laid out as variables * steps * cases.
+    n_runs : int
+        Number of runs of the design.
+
+    Returns
+    -------
+    numpy.ndarray
+        (runs, variables, steps) array, NaN for runs without a case.
+    """
+    data = np.asarray(result.data)
+    if data.shape[-1] != len(result.sql_list):
+        raise Exception('The result should keep every case, e.g. group_result(variables, np.array, frequency)')
+    cases = np.moveaxis(data, -1, 0)
+    # cases reporting fewer steps are padded by `stack_cases`
+    cases = np.where(cases == PADDING, np.nan, cases)
+    runs = case_runs(result.sql_list)
+    valid = (runs >= 0) & (runs < n_runs)
+    outputs = np.full((n_runs,) + cases.shape[1:], np.nan)
+    outputs[runs[valid]] = cases[valid]
+    return outputs
+
+
+def morris_design(n_factors: int, trajectories=10, levels=4, seed=None):
+    """
+    Morris trajectory design in the unit hypercube.
+
+    Each trajectory starts at a random grid point and moves one factor at a time by
+    `levels / (2 * (levels - 1))`, in a random order and direction.
+
+    Parameters
+    ----------
+    n_factors : int
+        Number of factors.
+    trajectories : int, optional
+        Number of trajectories. Default is 10.
+    levels : int, optional
+        Number of grid levels, an even number. Default is 4.
+    seed : int, optional
+        Seed of the random generator. Default is None.
+
+    Returns
+    -------
+    numpy.ndarray
+        (trajectories * (n_factors + 1), n_factors) design, trajectories are consecutive blocks of rows.
+    """
+    rng = np.random.default_rng(seed)
+    delta = levels / (2 * (levels - 1))
+    # strictly lower triangular B of the Morris orientation matrix B* = (J x* + delta/2 ((2B - J) D* + J)) P*
+    lower = np.tril(np.ones((n_factors + 1, n_factors)), -1)
+    start = rng.integers(0, levels // 2, size=(trajectories, 1, n_factors)) / (levels - 1)
+    directions = rng.choice([-1., 1.], size=(trajectories, 1, n_factors))
+    design = start + delta / 2 * ((2 * lower - 1) * directions + 1)
+    order = np.argsort(rng.random((trajectories, 1, n_factors)), axis=2)
+    design = np.take_along_axis(design, np.broadcast_to(order, design.shape), axis=2)
+    return design.reshape(-1, n_factors)
+
+
+def elementary_effects(design, outputs, trajectories: int):
+    """
+    Elementary effects of every factor on every output, computed for all trajectories at once.
+
+    Parameters
+    ----------
+    design : numpy.ndarray
+        (runs, factors) unit design, see `morris_design`.
+    outputs : numpy.ndarray
+        (runs, ...) outputs of each run.
+    trajectories : int
+        Number of trajectories of the design.
+
+    Returns
+    -------
+    numpy.ndarray
+        (trajectories, factors, ...) effects, NaN where a run has no output.
+    """
+    n_factors = design.shape[1]
+    design = design.reshape(trajectories, n_factors + 1, n_factors)
+    outputs = np.asarray(outputs, dtype=np.float64)
+    shape = outputs.shape[1:]
+    outputs = outputs.reshape(trajectories, n_factors + 1, -1)
+    steps = np.diff(design, axis=1)
+    # the factor moved between consecutive points and the signed size of the move
+    moved = np.argmax(np.abs(steps), axis=2)
+    size = np.take_along_axis(steps, moved[..., None], axis=2)
+    effects = np.diff(outputs, axis=1) / size
+    effects = np.take_along_axis(effects, np.argsort(moved, axis=1)[..., None], axis=1)
+    return effects.reshape((trajectories, n_factors) + shape)
+
+
+class DesignStudy:
+    """
+    Sampling design over the range of the sampled parameters of editors.
+
+    The design is applied to copies of the editors, runs are simulated with `simulate_local` and their
+    outputs are read back from the case SQL files, or from a `group_result` keeping every case.
+    """
+    __slots__ = ['factors', 'bounds', 'unit', 'design', 'sql_list', 'variables']
+    prefix = 'design'
+
+    def __init__(self, editors, unit):
+        """
+        Scale a unit design to the range of the editors.
+
+        Parameters
+        ----------
+        editors : tuple of IDFEditor, list of IDFEditor or IDFGroupEditor
+            Editors of the study, every IDFEditor is one factor, see `editor_factors`.
+        unit : numpy.ndarray or callable
+            (runs, factors) design in the unit hypercube, or a function building it from the number of factors.
+        """
+        self.factors = editor_factors(*editors)
+        self.bounds = editor_bounds(self.factors)
+        self.unit = unit(len(self.factors)) if callable(unit) else unit
+        self.design = self.bounds[:, 0] + self.unit * (self.bounds[:, 1] - self.bounds[:, 0])
+        self.sql_list = None
+        self.variables = None
+
+    def group_editor(self):
+        """
+        Group editor of the design, one case per run.
+
+        Returns
+        -------
+        IDFGroupEditor
+        """
+        return design_editor(self.factors, self.design)
+
+    def run(self, model, epw, folder: str = None, process_count=4, overwrite=False, **kwargs):
+        """
+        Write and simulate the cases of the design with `simulate_local`.
+
+        Parameters
+        ----------
+        model : IDFModel
+            Baseline model the editors belong to.
+        epw : str
+            Path to the EPW weather file.
+        folder : str, optional
+            Folder of the design cases. Default is None (`<baseline>_<prefix>` next to the baseline file).
+        process_count : int, optional
+            Number of simulation processes. Default is 4.
+        overwrite : bool, optional
+            If True, overwrites existing simulation outputs. Default is False.
+        **kwargs : dict
+            Additional keyword arguments passed to `simulate_local`.
+
+        Returns
+        -------
+        list of str or None
+            SQL path of each run.
+        """
+        if folder is None:
+            folder = model.file_name[:-4] + '_' + self.prefix
+        self.sql_list = run_design(model, self.group_editor(), epw, folder, self.prefix, process_count, overwrite,
+                                   **kwargs)
+        return self.sql_list
+
+    def outputs(self, variables=None, frequency=RunPeriod, alike=False, start_date=None, end_date=None,
+                result=None):
+        """
+        Outputs of every run of the design.
+
+        Parameters
+        ----------
+        variables : Variable or list of Variable, optional
+            Outputs read from the runs simulated by `run`.
+        frequency : str, optional
+            The temporal frequency of the outputs. Default is RunPeriod.
+        alike : bool, optional
+            If True, allows approximate matching of variable names. Default is False.
+        start_date : datetime, optional
+            Start date for filtering the time range of data. Default is None.
+        end_date : datetime, optional
+            End date for filtering the time range of data. Default is None.
+        result : IDFResult or numpy.ndarray, optional
+            Outputs read elsewhere: a `group_result` keeping every case (calculator `np.array`) of the cases
+            written from `group_editor`, or a (runs, variables, steps) array. Default is None.
+
+        Returns
+        -------
+        numpy.ndarray
+            (runs, variables, steps) array, NaN for runs without output.
+        """
+        if isinstance(result, IDFResult):
+            self.variables = result.variables
+            return result_outputs(result, len(self.design))
+        if result is not None:
+            self.variables = request_variables(variables) if variables is not None else None
+            return np.asarray(result, dtype=np.float64)
+        if self.sql_list is None:
+            raise Exception(f'You should play {type(self).__name__}.run() first')
+        self.variables = request_variables(variables)
+        return read_design_outputs(self.sql_list, self.variables, frequency, alike, start_date, end_date)
+
+    def variable_index(self, variable):
+        """Position of an output variable, given by position or by Variable."""
+        if isinstance(variable, (int, np.integer)):
+            return variable
+        return self.variables.index(variable)
+
+    def editor_names(self):
+        """'class > name > field' of every factor."""
+        return [' > '.join([edit.idfclass, edit.name, edit.field]) for edit in self.factors]
+
+
+class MorrisScreening(DesignStudy):
+    """
+    Morris elementary-effects screening of editors before a full design.
+
+    The trajectory design spans the range of the sampled parameters of each editor, it needs
+    `trajectories * (editors + 1)` simulations. Editors with a small `mu_star` (mean absolute
+    elementary effect) hardly change the chosen output and can be dropped from the full design.
+    """
+    __slots__ = ['trajectories', 'levels', 'mu', 'mu_star', 'sigma']
+    prefix = 'morris'
+
+    def __init__(self, *editors, trajectories=10, levels=4, seed=None):
+        """
+        Build the trajectory design of the editors.
+
+        Parameters
+        ----------
+        editors : IDFEditor, list of IDFEditor or IDFGroupEditor
+            Editors screened, every IDFEditor is one factor.
+        trajectories : int, optional
+            Number of trajectories. Default is 10.
+        levels : int, optional
+            Number of grid levels, an even number. Default is 4.
+        seed : int, optional
+            Seed of the random generator. Default is None.
+        """
+        super(MorrisScreening, self).__init__(editors, lambda k: morris_design(k, trajectories, levels, seed))
+        self.trajectories = trajectories
+        self.levels = levels
+        self.mu = self.mu_star = self.sigma = None
+
+    def __repr__(self):
+        return f'MorrisScreening(editors={len(self.factors)}, trajectories={self.trajectories}, ' \
+               f'runs={len(self.design)})'
+
+    def analyze(self, variables=None, frequency=RunPeriod, alike=False, start_date=None, end_date=None,
+                result=None):
+        """
+        Compute the elementary effects of every editor on the chosen outputs.
+
+        Parameters
+        ----------
+        variables : Variable or list of Variable, optional
+            Outputs screened against, read from the runs simulated by `run`.
+        frequency : str, optional
+            The temporal frequency of the outputs, every step is analyzed. Default is RunPeriod.
+        alike : bool, optional
+            If True, allows approximate matching of variable names. Default is False.
+        start_date : datetime, optional
+            Start date for filtering the time range of data. Default is None.
+        end_date : datetime, optional
+            End date for filtering the time range of data. Default is None.
+        result : IDFResult or numpy.ndarray, optional
+            Outputs read elsewhere, see `DesignStudy.outputs`. Default is None.
+
+        Returns
+        -------
+        numpy.ndarray
+            (editors, variables, steps) `mu_star`, see also `mu` and `sigma`.
+        """
+        outputs = self.outputs(variables, frequency, alike, start_date, end_date, result)
+        effects = elementary_effects(self.unit, outputs, self.trajectories)
+        # trajectories with a failed run are left out
+        with np.errstate(invalid='ignore'):
+            self.mu = np.nanmean(effects, axis=0)
+            self.mu_star = np.nanmean(np.abs(effects), axis=0)
+            self.sigma = np.nanstd(effects, axis=0, ddof=1)
+        return self.mu_star
+
+    def influence(self, variable=0):
+        """
+        Influence of each editor on a variable, `mu_star` summed over the steps relative to the largest.
+
+        Parameters
+        ----------
+        variable : int or Variable, optional
+            Output variable, by position or by Variable. Default is 0.
+
+        Returns
+        -------
+        numpy.ndarray
+            (editors,) influence in [0, 1].
+        """
+        if self.mu_star is None:
+            raise Exception('You should play MorrisScreening.analyze() first')
+        score = np.nansum(self.mu_star[:, self.variable_index(variable)], axis=-1)
+        return score / score.max() if score.max() > 0 else score
+
+    def report(self, variable=0):
+        """
+        Print the editors ranked by influence on a variable.
+
+        Parameters
+        ----------
+        variable : int or Variable, optional
+            Output variable, by position or by Variable. Default is 0.
+
+        Returns
+        -------
+        list of tuple of (str, float)
+            Editor and influence, most influential first.
+        """
+        influence = self.influence(variable)
+        names = self.editor_names()
+        ranked = [(names[i], influence[i]) for i in np.argsort(-influence, kind='stable')]
+        for editorStr, value in ranked:
+            print(f'{value:8.3f}\t{editorStr}')
+        return ranked
+
+    def prune(self, threshold=0.1, variable=0):
+        """
+        Split the editors by influence on a variable.
+
+        Parameters
+        ----------
+        threshold : float, optional
+            Editors with an influence below it are dropped. Default is 0.1.
+        variable : int or Variable, optional
+            Output variable, by position or by Variable. Default is 0.
+
+        Returns
+        -------
+        tuple of (list of IDFEditor, list of IDFEditor)
+            Kept and dropped editors, the full design is built from the kept ones.
+        """
+        influence = self.influence(variable)
+        kept = [edit for edit, value in zip(self.factors, influence) if value >= threshold]
+        dropped = [edit for edit, value in zip(self.factors, influence) if value < threshold]
+        for edit in dropped:
+            print(f'**********Low influence, dropped: {edit.__repr__()}')
+        return kept, dropped
+
+    def drop(self, group_editor: IDFGroupEditor, threshold=0.1, variable=0):
+        """
+        Drop the low-influence editors from a group editor, see `IDFGroupEditor.drop`.
+
+        Parameters
+        ----------
+        group_editor : IDFGroupEditor
+            Full design the screened editors belong to.
+        threshold : float, optional
+            Editors with an influence below it are dropped. Default is 0.1.
+        variable : int or Variable, optional
+            Output variable, by position or by Variable. Default is 0.
+
+        Returns
+        -------
+        list of IDFEditor
+            Dropped editors.
+        """
+        _, dropped = self.prune(threshold, variable)
+        group_editor.drop(*['>'.join([edit.idfclass, edit.name, edit.field]) for edit in dropped])
+        return dropped
+
+
+def saltelli_design(n_factors: int, n=256, seed=None):
+    """
+    Saltelli design in the unit hypercube for first-order and total Sobol indices.
+
+    Parameters
+    ----------
+    n_factors : int
+        Number of factors.
+    n : int, optional
+        Number of base samples. Default is 256.
+    seed : int, optional
+        Seed of the random generator. Default is None.
+
+    Returns
+    -------
+    numpy.ndarray
+        (n * (n_factors + 2), n_factors) design made of the blocks A, B and AB_1 ... AB_k,
+        AB_i being A with column i taken from B.
+    """
+    rng = np.random.default_rng(seed)
+    a = rng.random((n, n_factors))
+    b = rng.random((n, n_factors))
+    ab = np.repeat(a[None], n_factors, axis=0)
+    factors = np.arange(n_factors)
+    ab[factors, :, factors] = b.T
+    return np.concatenate([a, b, ab.reshape(-1, n_factors)])
+
+
+def sobol_estimates(f_a, f_b, f_ab):
+    """
+    First-order (Saltelli 2010) and total (Jansen) Sobol indices, samples on axis -2.
+
+    Parameters
+    ----------
+    f_a : numpy.ndarray
+        (..., n, outputs) outputs of block A.
+    f_b : numpy.ndarray
+        (..., n, outputs) outputs of block B.
+    f_ab : numpy.ndarray
+        (factors, ..., n, outputs) outputs of blocks AB_i.
+
+    Returns
+    -------
+    tuple of (numpy.ndarray, numpy.ndarray)
+        (factors, ..., outputs) first-order and total indices.
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        variance = np.var(np.concatenate([f_a, f_b], axis=-2), axis=-2)
+        first = np.mean(f_b * (f_ab - f_a), axis=-2) / variance
+        total = 0.5 * np.mean((f_a - f_ab) ** 2, axis=-2) / variance
+    return first, total
+
+
+def sobol_indices(outputs, n_factors: int, n_boot=100, conf_level=0.95, seed=None):
+    """
+    Sobol indices of every output with bootstrap confidence intervals.
+
+    All outputs are estimated at once, the bootstrap resamples are estimated in batches of outputs
+    holding about `BOOTSTRAP_CELLS` values.
+
+    Parameters
+    ----------
+    outputs : numpy.ndarray
+        (runs, ...) outputs of a `saltelli_design`, NaN for failed runs.
+    n_factors : int
+        Number of factors of the design.
+    n_boot : int, optional
+        Number of bootstrap resamples, 0 skips the confidence intervals. Default is 100.
+    conf_level : float, optional
+        Level of the percentile confidence intervals. Default is 0.95.
+    seed : int, optional
+        Seed of the bootstrap resampling. Default is None.
+
+    Returns
+    -------
+    tuple of numpy.ndarray
+        (factors, ...) first-order and total indices, (2, factors, ...) lower and upper bounds of both.
+    """
+    outputs = np.asarray(outputs, dtype=np.float64)
+    shape = outputs.shape[1:]
+    blocks = outputs.reshape(n_factors + 2, -1, int(np.prod(shape, dtype=int)))
+    # samples with a failed run are left out
+    blocks = blocks[:, ~np.isnan(blocks).any(axis=(0, 2))]
+    f_a, f_b, f_ab = blocks[0], blocks[1], blocks[2:]
+    first, total = sobol_estimates(f_a, f_b, f_ab)
+
+    n, m = f_a.shape
+    first_interval = np.full((2,) + first.shape, np.nan)
+    total_interval = np.full((2,) + total.shape, np.nan)
+    if n_boot and n:
+        q = [50 * (1 - conf_level), 50 * (1 + conf_level)]
+        samples = np.random.default_rng(seed).integers(0, n, size=(n_boot, n))
+        chunk = max(1, BOOTSTRAP_CELLS // (n_boot * n * (n_factors + 2)))
+        for start in range(0, m, chunk):
+            part = slice(start, start + chunk)
+            boot_first, boot_total = sobol_estimates(f_a[samples, part], f_b[samples, part], f_ab[:, samples, part])
+            first_interval[:, :, part] = np.nanpercentile(boot_first, q, axis=1)
+            total_interval[:, :, part] = np.nanpercentile(boot_total, q, axis=1)
+    return first.reshape((n_factors,) + shape), total.reshape((n_factors,) + shape), \
+        first_interval.reshape((2, n_factors) + shape), total_interval.reshape((2, n_factors) + shape)
+
+
+class SobolAnalysis(DesignStudy):
+    """
+    Variance-based (Sobol) sensitivity of outputs to editors.
+
+    The Saltelli design spans the range of the sampled parameters of each editor, it needs
+    `n * (editors + 2)` simulations. First-order indices measure the share of the output variance
+    explained by an editor alone, total indices include its interactions with the other editors.
+    """
+    __slots__ = ['n', 'first', 'total', 'first_interval', 'total_interval']
+    prefix = 'sobol'
+
+    def __init__(self, *editors, n=256, seed=None):
+        """
+        Build the Saltelli design of the editors.
+
+        Parameters
+        ----------
+        editors : IDFEditor, list of IDFEditor or IDFGroupEditor
+            Editors analyzed, every IDFEditor is one factor.
+        n : int, optional
+            Number of base samples. Default is 256.
+        seed : int, optional
+            Seed of the random generator. Default is None.
+        """
+        super(SobolAnalysis, self).__init__(editors, lambda k: saltelli_design(k, n, seed))
+        self.n = n
+        self.first = self.total = self.first_interval = self.total_interval = None
+
+    def __repr__(self):
+        return f'SobolAnalysis(editors={len(self.factors)}, n={self.n}, runs={len(self.design)})'
+
+    def analyze(self, variables=None, frequency=RunPeriod, alike=False, start_date=None, end_date=None,
+                result=None, n_boot=100, conf_level=0.95, seed=None):
+        """
+        Compute the Sobol indices of every editor on all outputs and steps at once.
+
+        Parameters
+        ----------
+        variables : Variable or list of Variable, optional
+            Outputs analyzed, read from the runs simulated by `run`.
+        frequency : str, optional
+            The temporal frequency of the outputs, every step is analyzed. Default is RunPeriod.
+        alike : bool, optional
+            If True, allows approximate matching of variable names. Default is False.
+        start_date : datetime, optional
+            Start date for filtering the time range of data. Default is None.
+        end_date : datetime, optional
+            End date for filtering the time range of data. Default is None.
+        result : IDFResult or numpy.ndarray, optional
+            Outputs read elsewhere, e.g. `IDFModel.group_result(variables, np.array, frequency)` after
+            writing `group_editor`, see `DesignStudy.outputs`. Default is None.
+        n_boot : int, optional
+            Number of bootstrap resamples, 0 skips the confidence intervals. Default is 100.
+        conf_level : float, optional
+            Level of the confidence intervals. Default is 0.95.
+        seed : int, optional
+            Seed of the bootstrap resampling. Default is None.
+
+        Returns
+        -------
+        tuple of (numpy.ndarray, numpy.ndarray)
+            (editors, variables, steps) first-order and total indices, see also `first_interval`
+            and `total_interval`.
+        """
+        outputs = self.outputs(variables, frequency, alike, start_date, end_date, result)
+        self.first, self.total, self.first_interval, self.total_interval = \
+            sobol_indices(outputs, len(self.factors), n_boot, conf_level, seed)
+        return self.first, self.total
+
+    def report(self, variable=0, step=0):
+        """
+        Print the indices of every editor on one output step, largest total index first.
+
+        Parameters
+        ----------
+        variable : int or Variable, optional
+            Output variable, by position or by Variable. Default is 0.
+        step : int, optional
+            Output step. Default is 0.
+
+        Returns
+        -------
+        list of tuple of (str, float, float)
+            Editor, first-order and total index.
+        """
+        if self.first is None:
+            raise Exception('You should play SobolAnalysis.analyze() first')
+        variable = self.variable_index(variable)
+        first, total = self.first[:, variable, step], self.total[:, variable, step]
+        names = self.editor_names()
+        ranked = [(names[i], first[i], total[i]) for i in np.argsort(-total, kind='stable')]
+        for editorStr, s1, st in ranked:
+            print(f'S1 {s1:8.3f}\tST {st:8.3f}\t{editorStr}')
+        return ranked
@@ -8,10 +8,22 @@ from eppy.modeleditor import IDF
 import os, shutil, re
 import numpy as np
 from multiprocessing.pool import Pool
+from multiprocessing import Manager
 from .utils import *
 from eppy.runner.run_functions import install_paths, parse_error, CalledProcessError, check_call, StringIO
 import sys
 import tempfile
+import hashlib
+from .affinity import place_workers, pinned_popen, COMPACT
+
+# root of the scratch execution mode, a RAM disk on Linux
+SCRATCH_ROOT = '/dev/shm'
+# outputs copied back from the scratch folder
+KEEP_OUTPUTS = ('.sql', '.err')
+# project folder holding the catalogue and the warehouse, not a case
+RESULT_DIR = 'result'
+
+
 def run_with_cpu(
         idf=None,
         weather=None,
@@ -83,8 +95,8 @@ def run_with_cpu(
         EnergyPlus version, used to find install directory. Required if run() is
         called with an IDF file path rather than an IDF object.
 
-    cpu_index: int
-        Index of CPU cores to use (default: None)
+    cpu_index: int or tuple of int
+        CPU or CPUs the EnergyPlus process is pinned to, see `affinity.pinned_popen` (default: None)
 
     Returns
     -------
@@ -167,10 +179,12 @@ def run_with_cpu(
                 args[arg] = ""
             cmd.extend(["--{}".format(arg.replace("_", "-"))])
             if args[arg] != "":
-                if os.path.isfile(args[arg]):
+                if os.path.isfile(args[arg]) and os.name == 'nt':
                     args[arg] = "\""+args[arg]+"\""
                 cmd.extend([args[arg]])
-    cmd.extend(["\""+idf_path+"\""])
+    cmd.extend(["\""+idf_path+"\"" if os.name == 'nt' else idf_path])
+    # a command line on Windows, an argument list elsewhere
+    command = " ".join(cmd) if os.name == 'nt' else cmd
 
     # allocate CPUs to the process
 
@@ -180,23 +194,21 @@ def run_with_cpu(
     sys.stderr = tmp_err
     try:
         # print(" ".join(cmd))
-        import win32process
-        from subprocess import Popen
+        if cpu_index is not None:
+            print(f'allocate to {cpu_index}->{idf_path}')
         if verbose == "v":
             print("\r\n" + " ".join(cmd) + "\r\n")
-            proc = Popen(" ".join(cmd))
+            proc = pinned_popen(command, cpu_index)
         elif verbose == "q":
-            proc = Popen(" ".join(cmd), stdout=open(os.devnull, "w"))
+            proc = pinned_popen(command, cpu_index, stdout=open(os.devnull, "w"))
         elif verbose == "s":
             with open(os.devnull, "w") as null:
                 # Null can be written to, so this is not expected to affect issue #245.
-                proc = Popen(" ".join(cmd), stdout=null, stderr=null)
-        if cpu_index:
-            mask = 1 << cpu_index
-            print(f'allocate to {mask}:{cpu_index}->{idf_path}')
-            win32process.SetProcessAffinityMask(proc._handle, mask)
+                proc = pinned_popen(command, cpu_index, stdout=null, stderr=null)
         # 3) 阻塞等待结束
         proc.wait()
+        if proc.returncode != 0 or has_fatal_error(err_path(output_dir, output_prefix)):
+            raise CalledProcessError(proc.returncode, command)
         return "OK"
         # if verbose == "v":
         #     print("\r\n" + " ".join(cmd) + "\r\n")
@@ -210,11 +222,7 @@ def run_with_cpu(
         # else:
         #     raise ValueError("Unknown verbose mode: {}".format(verbose))
     except CalledProcessError:
-        if output_prefix:
-            err_file = os.path.join(output_dir, output_prefix + ".err")
-        else:
-            err_file = os.path.join(output_dir, "eplusout.err")
-        message = parse_error(tmp_err, err_file)
+        message = parse_error(tmp_err, err_path(output_dir, output_prefix))
         raise RuntimeError(message)
     finally:
         sys.stderr = old_err
@@ -222,26 +230,31 @@ def run_with_cpu(
     return "OK"
 
 
-def occupy(idf_path):
+def err_path(output_dir: str, output_prefix=None):
+    """Path to the .err file EnergyPlus writes in `output_dir`."""
+    if output_prefix:
+        return os.path.join(output_dir, output_prefix + ".err")
+    return os.path.join(output_dir, "eplusout.err")
+
+
+def has_fatal_error(err_file: str):
     """
-    Check if a file lock can be acquired by creating a 'start' file.
-    
+    Check whether an EnergyPlus run terminated on a fatal error, as reported in its .err file.
+
     Parameters
     ----------
-    idf_path : str
-        The path to the directory where the 'start' file will be created or checked.
-    
+    err_file : str
+        Path to the .err file.
+
     Returns
     -------
     bool
-        True if the 'start' file already exists (indicating the resource is occupied),
-        False otherwise (indicating the lock was successfully acquired).
+        False if the file is missing.
     """
-    if os.path.exists(idf_path + 'start'):
-        return True
-    with open(idf_path + 'start', "w") as f:
-        f.write("1")
-    return False
+    if not os.path.isfile(err_file):
+        return False
+    with open(err_file, 'r', errors='ignore') as f:
+        return 'Terminated--Fatal Error' in f.read()
 
 
 def make_eplaunch_options(idf, **kwargs):
@@ -302,7 +315,127 @@ def return_callback(msg):
     print(msg)
 
 
-def simulate_file(idf_path: str, epw: str, idd: str = None, overwrite=False, verbose='q', cpu_index=None,long_dir=False, **kwargs):
+def make_return_callback(on_case=None, case_dir=None):
+    """
+    Build the pool callback of a simulation task.
+
+    Messages returned by `simulate_file` are printed by `return_callback`, then the output folders of the
+    cases run by the task are passed to `on_case`, in the parent process, as soon as the task returns.
+
+    Parameters
+    ----------
+    on_case : callable, optional
+        Called with the output folder of each finished case, e.g. `ResultStore.ingest_folder`. Default is None.
+    case_dir : str, optional
+        Output folder of the case run by a `simulate_file` task, see `case_folder`. `simulate_sequence`
+        and `simulate_queue` tasks return the folders of their cases instead. Default is None.
+
+    Returns
+    -------
+    callable
+        Callback taking the return value of the task.
+    """
+    def callback(result):
+        if isinstance(result, list):
+            case_dirs = result
+        else:
+            return_callback(result)
+            case_dirs = [] if case_dir is None else [case_dir]
+        if on_case is None:
+            return
+        for folder in case_dirs:
+            try:
+                on_case(folder)
+            except Exception as e:
+                print(f'****Ingest Error: {folder}, {e}')
+    return callback
+
+
+def case_folder(idf_path: str, epw: str, long_dir=False):
+    """
+    Output folder of a simulated case, named after the IDF (and weather) file.
+
+    Parameters
+    ----------
+    idf_path : str
+        Path to the IDF file of the case.
+    epw : str
+        Path to the EPW weather file.
+    long_dir : bool, default False
+        If True, the folder name combines the IDF and EPW base names.
+
+    Returns
+    -------
+    str
+    """
+    if long_dir:
+        return idf_path[:-4] + "+" + os.path.basename(epw)[:-4]
+    return idf_path[:-4]
+
+
+def scratch_folder(case_dir: str, scratch=True):
+    """
+    Scratch folder where a case runs in the scratch execution mode, see `simulate_file`.
+
+    The name is derived from the output folder of the case, so that a folder left by a killed run is found again.
+
+    Parameters
+    ----------
+    case_dir : str
+        Output folder of the case, see `case_folder`.
+    scratch : bool or str, default True
+        Scratch root folder, True for `SCRATCH_ROOT` (the temporary folder when it does not exist).
+
+    Returns
+    -------
+    str
+    """
+    root = SCRATCH_ROOT if scratch is True else scratch
+    if not os.path.isdir(root):
+        root = tempfile.gettempdir()
+    key = hashlib.md5(os.path.abspath(case_dir).encode('utf-8')).hexdigest()[:10]
+    return os.path.join(root, f'epeditor-{key}-{os.path.basename(case_dir)}')
+
+
+def copy_back(run_dir: str, target_dir: str, keep=KEEP_OUTPUTS):
+    """
+    Copy the kept outputs of a case from its scratch folder to its output folder.
+
+    Each file is copied next to its destination first, then renamed over it, so that a reader never sees
+    a partial output. A copy that fails leaves the destination as it was.
+
+    Parameters
+    ----------
+    run_dir : str
+        Scratch folder of the case.
+    target_dir : str
+        Output folder of the case.
+    keep : tuple of str, optional
+        Extensions of the files copied back. Default is ('.sql', '.err').
+
+    Returns
+    -------
+    list of str
+        Paths of the copied files.
+    """
+    copied = []
+    for file in os.listdir(run_dir):
+        if not file.lower().endswith(tuple(keep)):
+            continue
+        target = os.path.join(target_dir, file)
+        try:
+            shutil.copyfile(os.path.join(run_dir, file), target + '.part')
+            os.replace(target + '.part', target)
+        except OSError:
+            if os.path.exists(target + '.part'):
+                os.remove(target + '.part')
+            raise
+        copied.append(target)
+    return copied
+
+
+def simulate_file(idf_path: str, epw: str, idd: str = None, overwrite=False, verbose='q', cpu_index=None,long_dir=False,
+                  scratch=None, keep=KEEP_OUTPUTS, **kwargs):
     """
     Simulate an EnergyPlus model using specified input files and configuration.
     
@@ -318,10 +451,17 @@ def simulate_file(idf_path: str, epw: str, idd: str = None, overwrite=False, ver
         If True, overwrites existing output files; otherwise, preserves them.
     verbose : str, default 'q'
         Verbosity level for EnergyPlus output ('q' for quiet, 'v' for verbose).
-    cpu_index : int, optional
-        Index of the CPU core to use for the simulation. If None, uses default behavior.
+    cpu_index : int or tuple of int, optional
+        CPU or CPUs the simulation is pinned to, see `affinity.place_workers`. If None, uses default behavior.
     long_dir : bool, default False
         If True, uses a long directory name for output files; otherwise, uses short name.
+    scratch : bool or str, optional
+        If set, the case runs in a scratch folder under this root (True for `SCRATCH_ROOT`, a RAM disk on Linux),
+        only the `keep` outputs are copied back to the output folder, and the scratch folder is removed even if
+        the run fails, see `scratch_folder`. A failed run copies back its kept outputs but the .sql file, so
+        that its .err file can be read. Default is None (the case runs in its output folder).
+    keep : tuple of str, optional
+        Extensions of the outputs copied back in scratch mode. Default is ('.sql', '.err').
     **kwargs : dict
         Additional keyword arguments passed to the EnergyPlus simulation environment.
     
@@ -359,10 +499,7 @@ def simulate_file(idf_path: str, epw: str, idd: str = None, overwrite=False, ver
         if idd is None:
             idd = get_idd(idf_path)
         IDF.setiddname(idd)
-        if long_dir:
-            target_dir = idf_path[:-4] +"+"+ os.path.basename(epw)[:-4]
-        else:
-            target_dir = idf_path[:-4]
+        target_dir = case_folder(idf_path, epw, long_dir)
         new_idf_path = os.path.join(target_dir, os.path.basename(epw)) + '.idf'
         if os.path.exists(target_dir):
             if os.path.exists(new_idf_path + '.start'):
@@ -378,16 +515,23 @@ def simulate_file(idf_path: str, epw: str, idd: str = None, overwrite=False, ver
             os.mkdir(target_dir)
 
         print(f'Case Start:{idf_path}')
-        shutil.copy(idf_path, new_idf_path)
-        idf = IDF(new_idf_path,epw=epw)
+        run_dir = target_dir
+        if scratch is not None:
+            # outputs are written to the scratch folder, the output folder only receives the kept ones
+            run_dir = scratch_folder(target_dir, scratch)
+            shutil.rmtree(run_dir, ignore_errors=True)
+            os.makedirs(run_dir)
+        run_idf_path = os.path.join(run_dir, os.path.basename(new_idf_path))
+        shutil.copy(idf_path, run_idf_path)
+        idf = IDF(run_idf_path,epw=epw)
         if len(idf.idfobjects['Output:SQLite']) == 0:
             sql = idf.newidfobject('Output:SQLite')
             sql.Option_Type = 'Simple'
             idf.save()
-            print(f'add SQL to:{new_idf_path}')
+            print(f'add SQL to:{run_idf_path}')
         theoptions = make_eplaunch_options(idf, **kwargs)
 
-        if cpu_index:
+        if cpu_index is not None:
             theoptions['cpu_index'] = cpu_index
         """
         edited from eppy.modeleditor and add the function to allocate cpu.
@@ -449,9 +593,14 @@ def simulate_file(idf_path: str, epw: str, idd: str = None, overwrite=False, ver
         idd = kwargs.pop("idd", idf.iddname)
         epw = kwargs.pop("weather", idf.epw)
 
+        succeeded = False
         try:
             run_with_cpu(idf, weather=epw, idd=idd, **theoptions)
+            succeeded = True
         finally:
+            if scratch is not None and os.path.isdir(run_dir):
+                # a failed run keeps its .err, a partial .sql would be taken for a result
+                copy_back(run_dir, target_dir, keep if succeeded else [ext for ext in keep if ext != '.sql'])
             # idf.idfname = idfname
             # idf.idfabsname = idfabsname
             # os.remove(temp_name)
@@ -461,13 +610,17 @@ def simulate_file(idf_path: str, epw: str, idd: str = None, overwrite=False, ver
 
     kwargs['verbose'] = verbose
     if os.path.isfile(idf_path) and os.path.exists(idf_path):
-        if verbose == 's':
-            with hiddenPrint() as log:
-                new_idf_path = _processing(idf_path, epw, idd, overwrite,long_dir, **kwargs)
-                log.dump(new_idf_path[:-4] + '.log')
-                msg = ''
-        else:
-            msg = _processing(idf_path, epw, idd, overwrite,long_dir, **kwargs)
+        try:
+            if verbose == 's':
+                with hiddenPrint() as log:
+                    new_idf_path = _processing(idf_path, epw, idd, overwrite,long_dir, **kwargs)
+                    log.dump(new_idf_path[:-4] + '.log')
+                    msg = ''
+            else:
+                msg = _processing(idf_path, epw, idd, overwrite,long_dir, **kwargs)
+        finally:
+            if scratch is not None:
+                shutil.rmtree(scratch_folder(case_folder(idf_path, epw, long_dir), scratch), ignore_errors=True)
         return msg
     else:
         return f'IDF not found: {idf_path}'
@@ -489,8 +642,8 @@ def simulate_sequence(idfs: list, epw: str, idd: str = None, overwrite=False, ve
         If True, overwrites existing output files; otherwise, skips simulation if outputs exist.
     verbose : str, default 'q'
         Verbosity level for EnergyPlus simulation output ('q' for quiet, 'v' for verbose, etc.).
-    cpu_index : int, optional
-        Identifier for the CPU/process running the simulation, used in logging.
+    cpu_index : int or tuple of int, optional
+        CPU or CPUs the simulations are pinned to, also used in logging.
     long_dir : bool, default False
         If True, uses long directory names for output; otherwise, uses short names.
     **kwargs : dict
@@ -498,23 +651,108 @@ def simulate_sequence(idfs: list, epw: str, idd: str = None, overwrite=False, ve
     
     Returns
     -------
-    None
-        This function does not return any value. It runs simulations and prints timing information.
+    list of str
+        Output folders of the cases simulated by this sequence, see `case_folder`. It also prints timing information.
     """
     import time
     t1 = time.time()
+    case_dirs = []
     for idf_path in idfs:
         if os.path.isfile(idf_path):
-            if occupy(idf_path): continue
             simulate_file(idf_path, epw, idd, overwrite, verbose, cpu_index,long_dir, **kwargs)
         elif isinstance(idf_path, IDF):
-            simulate_file(idf_path.idfabsname, epw, idd, overwrite, verbose, cpu_index,long_dir, **kwargs)
+            idf_path = idf_path.idfabsname
+            simulate_file(idf_path, epw, idd, overwrite, verbose, cpu_index,long_dir, **kwargs)
+        else:
+            continue
+        case_dirs.append(case_folder(idf_path, epw, long_dir))
     print(f'**********Sequence on CPU:{cpu_index} Done**********')
     print("duration:", time.time() - t1)
+    return case_dirs
+
+
+def simulate_queue(work, idd: str = None, overwrite=False, verbose='q', cpu_index=None, long_dir=False, done=None,
+                   **kwargs):
+    """
+    Simulate the cases pulled from a work queue shared by pinned workers, until the queue is empty.
+
+    Each case is taken by exactly one worker, so the workers never scan the same files and the last
+    cases are spread over whichever workers are free.
+
+    Parameters
+    ----------
+    work : queue.Queue
+        Shared queue (e.g. from `multiprocessing.Manager`) of (IDF path, EPW path) pairs, filled before the workers start.
+    idd : str, optional
+        Path to the IDD file. If not provided, the default IDD is used.
+    overwrite : bool, default False
+        If True, overwrites existing output files; otherwise, skips simulation if outputs exist.
+    verbose : str, default 'q'
+        Verbosity level for EnergyPlus simulation output ('q' for quiet, 'v' for verbose, etc.).
+    cpu_index : int or tuple of int, optional
+        CPU or CPUs the simulations of this worker are pinned to, also used in logging.
+    long_dir : bool, default False
+        If True, uses long directory names for output; otherwise, uses short names.
+    done : queue.Queue, optional
+        Shared queue receiving the output folder of each case as soon as it finished, see `drain_cases`.
+        Default is None.
+    **kwargs : dict
+        Additional keyword arguments passed to the simulate_file function.
+
+    Returns
+    -------
+    list of str
+        Output folders of the cases simulated by this worker, see `case_folder`. It also prints timing information.
+    """
+    t1 = time.time()
+    case_dirs = []
+    while True:
+        try:
+            idf_path, epw = work.get_nowait()
+        except queue.Empty:
+            break
+        try:
+            simulate_file(idf_path, epw, idd, overwrite, verbose, cpu_index, long_dir, **kwargs)
+        except Exception as e:
+            error_callback(f'{idf_path}, {e}')
+            continue
+        case_dirs.append(case_folder(idf_path, epw, long_dir))
+        if done is not None:
+            done.put(case_dirs[-1])
+    print(f'**********Worker on CPU:{cpu_index} Done, {len(case_dirs)} cases**********')
+    print("duration:", time.time() - t1)
+    return case_dirs
+
+
+def drain_cases(done, results, on_case):
+    """
+    Pass the case folders reported by the workers to `on_case` as they arrive, until all workers returned.
+
+    Parameters
+    ----------
+    done : queue.Queue
+        Shared queue the workers put the output folder of each finished case in, see `simulate_queue`.
+    results : list of multiprocessing.pool.AsyncResult
+        Pool tasks of the workers.
+    on_case : callable
+        Called in this process with each output folder, see `make_return_callback`.
+    """
+    callback = make_return_callback(on_case)
+    while True:
+        # checked before reading, so that an empty queue afterwards means nothing is left
+        finished = all(result.ready() for result in results)
+        try:
+            folder = done.get(timeout=0.2)
+        except queue.Empty:
+            if finished:
+                return
+            continue
+        callback([folder])
 
 
 def simulate_local(idf_path: str, epw: str, idd: str = None, overwrite=False, stdout=sys.stdout, verbose='q',
-                   prs_count=7, forceCPU=False, **kwargs):
+                   prs_count=7, forceCPU=False, on_case=None, scheduler=None, timeout=None, retries=0, priority=None,
+                   placement=COMPACT, avoid_smt=False, scratch=None, keep=KEEP_OUTPUTS, **kwargs):
     """
     Simulate EnergyPlus models locally from IDF and EPW files, either single or multiple runs.
     
@@ -535,7 +773,31 @@ def simulate_local(idf_path: str, epw: str, idd: str = None, overwrite=False, st
     prs_count : int, optional
         Number of parallel processes to use when simulating multiple files. Default is 7.
     forceCPU : bool, optional
-        If True, forces distribution of work across CPUs even if the number of processes is high. Default is False.
+        If True, `prs_count` workers pinned to CPUs (see `placement`) pull the cases from a shared queue
+        instead of going through the scheduler. Default is False.
+    on_case : callable, optional
+        Called in this process with the output folder of each case as soon as the case finished, in forceCPU
+        mode as well, e.g. `ResultStore.ingest_folder` to read results while the other cases are still running.
+        Default is None.
+    scheduler : Scheduler, optional
+        Scheduler running the cases of a folder, see `scheduler.Scheduler`. Its handle allows to pause, resume
+        or cancel the run and gives the status of every case. Default is None (a new one with `prs_count` workers).
+    timeout : float, optional
+        Wall-clock seconds after which a case is killed, when no scheduler is given. Default is None (no limit).
+    retries : int, optional
+        Number of times a failed or timed out case is run again, when no scheduler is given. Default is 0.
+    priority : dict, optional
+        Priority of the IDF files by file name, cases with a higher priority start first. Default is None (all 0).
+    placement : str, optional
+        How the forceCPU workers are pinned: 'compact', 'spread' or 'numa', see `affinity.place_workers`,
+        None keeps the forceCPU workers and their shared queue but does not pin them. Default is 'compact'.
+    avoid_smt : bool, optional
+        If True, forceCPU workers are only pinned to the first hardware thread of each core. Default is False.
+    scratch : bool or str, optional
+        Scratch root where the cases run, True for `SCRATCH_ROOT` (/dev/shm), see `simulate_file`.
+        Default is None (the cases run in their output folders).
+    keep : tuple of str, optional
+        Extensions of the outputs copied back from the scratch folders. Default is ('.sql', '.err').
     **kwargs
         Additional keyword arguments passed to underlying simulation functions.
     
@@ -550,41 +812,58 @@ def simulate_local(idf_path: str, epw: str, idd: str = None, overwrite=False, st
     if os.path.isfile(idf_path):
         if isinstance(epw,list):
             for epwi in epw:
-                return simulate_file(idf_path, epwi, idd, overwrite, verbose,long_dir=True)
+                msg = simulate_file(idf_path, epwi, idd, overwrite, verbose,long_dir=True, scratch=scratch, keep=keep)
+                if on_case is not None:
+                    on_case(case_folder(idf_path, epwi, True))
+                return msg
         else:
-            return simulate_file(idf_path, epw, idd, overwrite, verbose, long_dir=True)
+            msg = simulate_file(idf_path, epw, idd, overwrite, verbose, long_dir=True, scratch=scratch, keep=keep)
+            if on_case is not None:
+                on_case(case_folder(idf_path, epw, True))
+            return msg
     elif os.path.isdir(idf_path):
-        prs_pool = Pool(prs_count)
         if isinstance(epw,list):
             long_dir = True
         else:
             epw = [epw]
             long_dir = False
-        for epwi in epw:
-            if prs_count <= os.cpu_count() and forceCPU:
-                idfs = [os.path.join(idf_path, file) for file in os.listdir(idf_path)]
-                idfs = [idf for idf in idfs if idf.endswith('.idf')]
-
-                for cpu_index in range(1, prs_count + 1):
-                    # st = (cpu_index - 1) * np.floor(len(idfs) / prs_count)
-                    # ed = cpu_index * np.floor(len(idfs) / prs_count) if cpu_index < prs_count else len(idfs)
-                    prs_pool.apply_async(func=simulate_sequence,
-                                         args=(idfs[cpu_index - 1:], epwi, idd, overwrite, verbose, cpu_index,long_dir,),
-                                         callback=return_callback,
-                                         error_callback=error_callback)
-
-            else:
-                for file in os.listdir(idf_path):
-                    file = os.path.join(idf_path, file)
-                    prs_pool.apply_async(func=simulate_file,
-                                         args=(file, epwi, idd, overwrite, verbose, None,long_dir,),
-                                         callback=return_callback,
-                                         error_callback=error_callback)
-        prs_pool.close()
-        prs_pool.join()
-        idfstart = [os.path.join(idf_path, file) for file in os.listdir(idf_path) if file.endswith('.idfstart')]
-        for f in idfstart:
-            os.remove(f)
+        idfs = [os.path.join(idf_path, file) for file in os.listdir(idf_path)]
+        idfs = [idf for idf in idfs if idf.endswith('.idf')]
+        if prs_count <= os.cpu_count() and forceCPU:
+            cpu_sets = [None] * prs_count if placement is None else place_workers(prs_count, placement, avoid_smt)
+            with Manager() as manager:
+                # every case is queued once, the pinned workers pull them until none is left
+                work = manager.Queue()
+                for epwi in epw:
+                    for file in idfs:
+                        work.put((file, epwi))
+                # finished cases are reported one by one, not when a worker has drained the queue
+                done = None if on_case is None else manager.Queue()
+                prs_pool = Pool(prs_count)
+                results = [prs_pool.apply_async(func=simulate_queue,
+                                                args=(work, idd, overwrite, verbose, cpu_sets[cpu_index], long_dir,
+                                                      done,),
+                                                kwds={'scratch': scratch, 'keep': keep},
+                                                error_callback=error_callback)
+                           for cpu_index in range(prs_count)]
+                prs_pool.close()
+                if done is not None:
+                    drain_cases(done, results, on_case)
+                prs_pool.join()
+        else:
+            from .scheduler import Scheduler
+            if scheduler is None:
+                scheduler = Scheduler(prs_count, timeout=timeout, retries=retries)
+            if on_case is not None:
+                scheduler.on_case = on_case
+            priority = {} if priority is None else priority
+            for epwi in epw:
+                for file in idfs:
+                    scheduler.submit(file, epwi, idd, overwrite, verbose, long_dir,
+                                     priority=priority.get(os.path.basename(file), 0), scratch=scratch, keep=keep)
+            scheduler.join()
+            for record in scheduler.status('failed'):
+                print(f'**********Failed after {record["attempts"]} attempts:{record["idf"]}, {record["message"]}')
         print('**********ALL DONE**********')
         return 1
 
@@ -770,6 +1049,9 @@ def sshRunCmd(address, simDir):
 def find_sql(idf_dir: str):
     """
     Find SQL files in a given directory and map them by case name.
+
+    Cases without a SQL file fall back to their ESO output, so legacy runs reported as .eso only are still read.
+    The `result` folder of the project (catalogue, warehouse) is not searched.
     
     Parameters
     ----------
@@ -779,15 +1061,23 @@ def find_sql(idf_dir: str):
     Returns
     -------
     dict
-        A dictionary mapping case names (derived from the parent directory of each SQL file) to the full path of the SQL file.
+        A dictionary mapping case names (derived from the parent directory of each SQL file) to the full path of the SQL file,
+        or of the .eso file for cases without one.
     """
     file_package = os.walk(idf_dir)
-    sql = {}
+    sql, eso = {}, {}
     for dirpath, dirnames, filenames in file_package:
+        if RESULT_DIR in dirnames:
+            dirnames.remove(RESULT_DIR)
         for file in filenames:
-            if re.search('\.sql', file, re.IGNORECASE) != None:
-                case = os.path.normpath(dirpath).split(os.sep)[-1]
+            case = os.path.normpath(dirpath).split(os.sep)[-1]
+            if re.search(r'\.sql$', file, re.IGNORECASE) != None:
                 sql[case] = os.path.join(dirpath, file)
+            elif re.search(r'\.eso$', file, re.IGNORECASE) != None:
+                eso[case] = os.path.join(dirpath, file)
+    for case in eso:
+        if case not in sql:
+            sql[case] = eso[case]
     return sql
 
 
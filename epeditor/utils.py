@@ -1,6 +1,5 @@
-import db_eplusout_reader.constants
-from db_eplusout_reader.sql_reader import get_ids_dict,to_sql_frequency
-from db_eplusout_reader import Variable
+from .db_eplusout_reader import Variable, constants
+from .db_eplusout_reader.sql_reader import get_ids_dict,to_sql_frequency
 import sqlite3
 import string
 import random
@@ -11,12 +10,12 @@ from .epluspath import idd_files
 
 cPath = os.listdir(r'C:\\')
 epPath = os.path.realpath(os.path.join(os.path.dirname(__file__), r'../'))
-TimeStep = db_eplusout_reader.constants.TS
-Hourly = db_eplusout_reader.constants.H
-Daily = db_eplusout_reader.constants.D
-Monthly = db_eplusout_reader.constants.M
-Annually = db_eplusout_reader.constants.A
-RunPeriod = db_eplusout_reader.constants.RP
+TimeStep = constants.TS
+Hourly = constants.H
+Daily = constants.D
+Monthly = constants.M
+Annually = constants.A
+RunPeriod = constants.RP
 
 ANYTHING = 0
 CLASS = 1
@@ -91,14 +90,9 @@ def get_variables(sql_file)->dict:
         A dictionary where keys are frequency types (as converted by to_sql_frequency) 
         and values are lists of variables associated with each frequency.
     """
-    sql_variables={}
-    conn = sqlite3.connect(sql_file)
-    frequency = [to_sql_frequency(freq) for freq in [TimeStep,Hourly,Daily,Monthly,Annually,RunPeriod]]
-    for freq in frequency:
-        idsDict = get_ids_dict(conn,[Variable(None,None,None)], freq, True)
-        sql_variables[freq]=[variable for id_,variable in idsDict.items()]
-    conn.close()
-    return sql_variables
+    # a single scan of the data dictionary instead of one LIKE query per frequency
+    from .catalogue import VariableCatalogue
+    return VariableCatalogue.build([sql_file]).variables()
 def generate_code(bit_num):
     """
     Generate a random hexadecimal string of specified length.
@@ -0,0 +1,245 @@
+import numpy as np
+from .db_eplusout_reader import Variable
+from .db_eplusout_reader.sql_reader import get_ids_dict, to_sql_frequency, match_first_id, INTERVAL_TYPES, \
+    parse_sql_timestamp_columns, get_window_mask, get_window_ranges, window_statement
+from .catalogue import sql_stamp
+from .utils import bar
+import sqlite3
+import os
+
+# not a .sql extension, so that find_sql never takes the warehouse for a case
+WAREHOUSE_FILE = 'warehouse.db'
+
+SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS Cases (CaseIndex INTEGER PRIMARY KEY, Path TEXT UNIQUE, Size INTEGER,"
+    " MTime INTEGER)",
+    "CREATE TABLE IF NOT EXISTS ReportDataDictionary (CaseIndex INTEGER, ReportDataDictionaryIndex INTEGER,"
+    " KeyValue TEXT, Name TEXT, Units TEXT, ReportingFrequency TEXT, Stored INTEGER,"
+    " PRIMARY KEY (CaseIndex, ReportDataDictionaryIndex)) WITHOUT ROWID",
+    "CREATE TABLE IF NOT EXISTS Time (CaseIndex INTEGER, TimeIndex INTEGER, Year INTEGER, Month INTEGER,"
+    " Day INTEGER, Hour INTEGER, Minute INTEGER, IntervalType INTEGER,"
+    " PRIMARY KEY (CaseIndex, TimeIndex)) WITHOUT ROWID",
+    "CREATE TABLE IF NOT EXISTS ReportData (CaseIndex INTEGER, ReportDataDictionaryIndex INTEGER,"
+    " TimeIndex INTEGER, Value REAL, PRIMARY KEY (CaseIndex, ReportDataDictionaryIndex, TimeIndex)) WITHOUT ROWID",
+]
+
+
+class Warehouse:
+    """
+    Project warehouse holding the outputs of all cases in one indexed SQLite file.
+
+    `ReportData` rows are keyed by (case, variable id, time index), so reading a case is a range
+    scan on the primary key. Cases whose SQL file changed since consolidation are not served.
+    """
+    __slots__ = ['path', 'cases']
+
+    def __init__(self, path: str):
+        """
+        Open a warehouse built by `build_warehouse`.
+
+        Parameters
+        ----------
+        path : str
+            Path to the warehouse file.
+        """
+        self.path = path
+        conn = sqlite3.connect(path)
+        try:
+            self.cases = {p: (i, size, mtime) for i, p, size, mtime in
+                          conn.execute("SELECT CaseIndex, Path, Size, MTime FROM Cases")}
+        finally:
+            conn.close()
+
+    def __repr__(self):
+        return f'Warehouse({self.path}, {len(self.cases)} cases)'
+
+    def case_index(self, sql: str):
+        """
+        Index of a case in the warehouse, None if it is missing or its SQL file changed.
+        """
+        sql = os.path.normpath(os.path.abspath(sql))
+        if sql not in self.cases:
+            return None
+        index, size, mtime = self.cases[sql]
+        if not os.path.isfile(sql) or sql_stamp(sql) != (size, mtime):
+            return None
+        return index
+
+    def first_arrays(self, sql: str, variables, frequency, alike=False, start_date=None, end_date=None):
+        """
+        Read the first match of each requested variable of a case, see `get_first_arrays`.
+
+        Parameters
+        ----------
+        sql : str
+            Path to the case SQL file.
+        variables : Variable or list of Variable
+            Requested variables.
+        frequency : str
+            The temporal frequency of the data.
+        alike : bool, optional
+            If True, allows approximate matching of variable names. Default is False.
+        start_date : datetime, optional
+            Start date for filtering the time range of data. Default is None.
+        end_date : datetime, optional
+            End date for filtering the time range of data. Default is None.
+
+        Returns
+        -------
+        tuple of (numpy.ndarray, numpy.ndarray) or None
+            (variables, steps) float64 array and datetime64[m] timestamps, None when the case or one
+            of its variables was not consolidated.
+
+        Raises
+        ------
+        NoResults
+            When any of the requested variables cannot be found.
+        """
+        case = self.case_index(sql)
+        if case is None:
+            return None
+        if isinstance(variables, Variable):
+            variables = [variables]
+        conn = sqlite3.connect(self.path)
+        try:
+            rows = conn.execute("SELECT ReportDataDictionaryIndex, KeyValue, Name, Units, Stored"
+                                " FROM ReportDataDictionary WHERE CaseIndex = ? AND ReportingFrequency = ?"
+                                " ORDER BY ReportDataDictionaryIndex", (case, to_sql_frequency(frequency))).fetchall()
+            ids = [match_first_id([row[:4] for row in rows], variable, alike) for variable in variables]
+            stored = {row[0] for row in rows if row[4]}
+            if not all(id_ in stored for id_ in ids):
+                return None
+
+            interval = INTERVAL_TYPES[frequency.lower()]
+            columns = np.array(conn.execute(
+                "SELECT TimeIndex, IFNULL(Year, 0), IFNULL(Month, 1), IFNULL(Day, 1), IFNULL(Hour, 0),"
+                " IFNULL(Minute, 0) FROM Time WHERE CaseIndex = ? AND IntervalType = ? ORDER BY TimeIndex",
+                (case, interval)).fetchall(), dtype=np.int64).reshape(-1, 6).T
+            timestamps = parse_sql_timestamp_columns(interval, *columns[1:])
+            time_ranges = None
+            if start_date or end_date:
+                mask = get_window_mask(timestamps, start_date, end_date)
+                time_ranges, timestamps = get_window_ranges(columns[0], mask), timestamps[mask]
+
+            # one primary key range scan per variable
+            rows = [[r[0] for r in conn.execute(
+                "SELECT Value FROM ReportData WHERE CaseIndex = ? AND ReportDataDictionaryIndex = ?"
+                + window_statement(time_ranges) + " ORDER BY TimeIndex", (case, id_))] for id_ in ids]
+            array = np.full((len(ids), max((len(r) for r in rows), default=0)), np.nan)
+            for position, values in enumerate(rows):
+                array[position, :len(values)] = values
+        finally:
+            conn.close()
+        return array, timestamps
+
+
+def build_warehouse(path: str, sql_list: list, variables=None, frequencies=None, alike=False):
+    """
+    Consolidate the outputs of case SQL files into one warehouse file.
+
+    Cases already consolidated and unchanged are skipped, changed cases are replaced.
+
+    Parameters
+    ----------
+    path : str
+        Path to the warehouse file, created if missing.
+    sql_list : list of str
+        Paths to the case SQL files.
+    variables : Variable or list of Variable, optional
+        Variables whose `ReportData` rows are copied. Default is None (all variables).
+    frequencies : str or list of str, optional
+        Frequencies to copy (e.g. Hourly). Default is None (all frequencies).
+    alike : bool, optional
+        If True, allows approximate matching of variable names. Default is False.
+
+    Returns
+    -------
+    Warehouse
+    """
+    if isinstance(variables, Variable):
+        variables = [variables]
+    if isinstance(frequencies, str):
+        frequencies = [frequencies]
+    conn = sqlite3.connect(path)
+    try:
+        for statement in SCHEMA:
+            conn.execute(statement)
+        known = {p: (i, size, mtime) for i, p, size, mtime in
+                 conn.execute("SELECT CaseIndex, Path, Size, MTime FROM Cases")}
+        for n, sql in enumerate(sql_list):
+            bar(n, len(sql_list), 1)
+            sql = os.path.normpath(os.path.abspath(sql))
+            if sql == os.path.normpath(os.path.abspath(path)):
+                continue
+            if os.path.splitext(sql)[1].lower() != '.sql':
+                # .eso cases keep being read from their own file
+                continue
+            stamp = sql_stamp(sql)
+            if sql in known:
+                if known[sql][1:] == stamp:
+                    continue
+                for table in ['Cases', 'ReportDataDictionary', 'Time', 'ReportData']:
+                    conn.execute(f"DELETE FROM {table} WHERE CaseIndex = ?", (known[sql][0],))
+            attached = False
+            try:
+                ids = None
+                if variables is not None or frequencies is not None:
+                    source = sqlite3.connect(sql)
+                    try:
+                        ids = set()
+                        for freq in (frequencies or [None]):
+                            if variables is None:
+                                ids.update(i for (i,) in source.execute(
+                                    "SELECT ReportDataDictionaryIndex FROM ReportDataDictionary"
+                                    " WHERE ReportingFrequency = ?", (to_sql_frequency(freq),)))
+                            else:
+                                ids.update(get_ids_dict(source, variables, to_sql_frequency(freq), alike).keys())
+                    finally:
+                        source.close()
+                case = conn.execute("INSERT INTO Cases (Path, Size, MTime) VALUES (?, ?, ?)",
+                                    (sql,) + stamp).lastrowid
+                conn.execute("ATTACH DATABASE ? AS source", (sql,))
+                attached = True
+                stored = "1" if ids is None else "ReportDataDictionaryIndex IN ({})".format(
+                    ",".join(str(int(i)) for i in ids) or "NULL")
+                conn.execute(f"INSERT INTO ReportDataDictionary SELECT ?, ReportDataDictionaryIndex, KeyValue, Name,"
+                             f" Units, ReportingFrequency, {stored} FROM source.ReportDataDictionary", (case,))
+                conn.execute("INSERT INTO Time SELECT ?, TimeIndex, Year, Month, Day, Hour, Minute, IntervalType"
+                             " FROM source.Time", (case,))
+                conn.execute(f"INSERT OR IGNORE INTO ReportData SELECT ?, ReportDataDictionaryIndex, TimeIndex, Value"
+                             f" FROM source.ReportData WHERE {stored}", (case,))
+                conn.commit()
+            except Exception as e:
+                # a corrupt or incomplete case is left out, the others are consolidated
+                conn.rollback()
+                print(f'**********Not consolidated {sql}: {e}')
+            finally:
+                if attached:
+                    conn.execute("DETACH DATABASE source")
+    finally:
+        conn.close()
+    print()
+    return Warehouse(path)
+
+
+def open_warehouse(folder: str):
+    """
+    Open the warehouse of a project result folder if it was built.
+
+    Parameters
+    ----------
+    folder : str
+        The `result` folder of the project.
+
+    Returns
+    -------
+    Warehouse or None
+    """
+    path = os.path.join(folder, WAREHOUSE_FILE)
+    if not os.path.isfile(path):
+        return None
+    try:
+        return Warehouse(path)
+    except Exception as e:
+        print(e)
+        return None
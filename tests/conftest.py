@@ -0,0 +1,194 @@
+import calendar
+import os
+import sys
+import sqlite3
+from datetime import date, datetime, timedelta
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# (Name, Type, Units) of the synthetic outputs, one zone each
+OUTPUTS = [('Var 0', 'Sum', 'J'), ('Var 1', 'Avg', 'W'), ('Var 2', 'Sum', 'hr'), ('Var 3', 'Avg', 'C')]
+FREQUENCIES = ['Hourly', 'Daily', 'Monthly', 'Annual']
+# IntervalType of each frequency in the Time table
+INTERVAL_TYPES = {'Hourly': 1, 'Daily': 2, 'Monthly': 3, 'Annual': 5}
+
+
+def make_sql(path: str, days=59, year=2002, seed=0):
+    """
+    Write a small EnergyPlus-like SQL output.
+
+    Hourly values are random, the daily, monthly and annual values are reported consistently with
+    them: summed for 'Sum' variables, averaged for 'Avg' ones.
+
+    Parameters
+    ----------
+    path : str
+        Path to the SQL file, overwritten if it exists.
+    days : int, optional
+        Number of simulated days from January 1st. Default is 59.
+    year : int, optional
+        Simulated year. Default is 2002.
+    seed : int, optional
+        Seed of the hourly values. Default is 0.
+
+    Returns
+    -------
+    dict
+        Reported values by (sql frequency, position of the variable in `OUTPUTS`).
+    """
+    if os.path.exists(path):
+        os.remove(path)
+    hourly = np.random.RandomState(seed).rand(len(OUTPUTS), days * 24) * 10
+    time_rows, time_index = [], {frequency: [] for frequency in FREQUENCIES}
+    # first hour of each reporting period
+    starts = {'Hourly': list(range(days * 24)), 'Daily': [], 'Monthly': [], 'Annual': [0]}
+
+    def add_time(frequency, day, hour, interval, simulation_day):
+        time_rows.append((len(time_rows) + 1, year, day.month, day.day, hour, 0, 0, interval,
+                          INTERVAL_TYPES[frequency], simulation_day, None, 1, 0))
+        time_index[frequency].append(len(time_rows))
+
+    for d in range(days):
+        day = datetime(year, 1, 1) + timedelta(days=d)
+        for hour in range(1, 25):
+            add_time('Hourly', day, hour, 60, d + 1)
+        add_time('Daily', day, 24, 1440, d + 1)
+        starts['Daily'].append(d * 24)
+        if day.day == 1:
+            starts['Monthly'].append(d * 24)
+        if (day + timedelta(days=1)).month != day.month or d == days - 1:
+            add_time('Monthly', day, 24, None, d + 1)
+    add_time('Annual', datetime(year, 12, 31), 24, None, days)
+
+    conn = sqlite3.connect(path)
+    try:
+        conn.execute("CREATE TABLE Time (TimeIndex INTEGER PRIMARY KEY, Year INTEGER, Month INTEGER, Day INTEGER,"
+                     " Hour INTEGER, Minute INTEGER, Dst INTEGER, Interval INTEGER, IntervalType INTEGER,"
+                     " SimulationDays INTEGER, DayType TEXT, EnvironmentPeriodIndex INTEGER, WarmupFlag INTEGER)")
+        conn.execute("CREATE TABLE ReportDataDictionary (ReportDataDictionaryIndex INTEGER PRIMARY KEY,"
+                     " IsMeter INTEGER, Type TEXT, IndexGroup TEXT, TimestepType TEXT, KeyValue TEXT, Name TEXT,"
+                     " ReportingFrequency TEXT, ScheduleName TEXT, Units TEXT)")
+        conn.execute("CREATE TABLE ReportData (ReportDataIndex INTEGER PRIMARY KEY, TimeIndex INTEGER,"
+                     " ReportDataDictionaryIndex INTEGER, Value REAL)")
+        conn.executemany("INSERT INTO Time VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?)", time_rows)
+        reported = {}
+        for frequency in FREQUENCIES:
+            bounds = np.array(starts[frequency])
+            counts = np.diff(np.append(bounds, days * 24))
+            for i, (name, var_type, units) in enumerate(OUTPUTS):
+                id_ = conn.execute("INSERT INTO ReportDataDictionary VALUES (NULL, 0, ?, 'Zone', 'Zone', ?, ?, ?,"
+                                   " '', ?)", (var_type, f'ZONE{i}', name, frequency, units)).lastrowid
+                values = np.add.reduceat(hourly[i], bounds)
+                if var_type == 'Avg':
+                    values = values / counts
+                reported[(frequency, i)] = values
+                conn.executemany("INSERT INTO ReportData (TimeIndex, ReportDataDictionaryIndex, Value)"
+                                 " VALUES (?, ?, ?)", zip(time_index[frequency], [id_] * len(values),
+                                                          values.tolist()))
+        conn.commit()
+    finally:
+        conn.close()
+    return reported
+
+
+# standard lines of the .eso data dictionary, before the outputs
+ESO_PREAMBLE = [
+    "Program Version,EnergyPlus, Version 9.4.0-998c4b761e, YMD=2021.01.01 10:00",
+    "1,5,Environment Title[],Latitude[deg],Longitude[deg],Time Zone[],Elevation[m]",
+    "2,8,Day of Simulation[],Month[],Day of Month[],DST Indicator[1=yes 0=no],Hour[],StartMinute[],EndMinute[],"
+    "DayType",
+    "3,5,Cumulative Day of Simulation[],Month[],Day of Month[],DST Indicator[1=yes 0=no],DayType  ! When Daily"
+    " Report Variables Requested",
+    "4,2,Cumulative Days of Simulation[],Month[]  ! When Monthly Report Variables Requested",
+    "5,1,Cumulative Days of Simulation[] ! When Run Period Report Variables Requested",
+    "6,1,Calendar Year of Simulation[] ! When Annual Report Variables Requested",
+]
+
+
+def make_eso(path: str, sql: str, newline='\n'):
+    """
+    Write the outputs of a SQL file made by `make_sql` as an EnergyPlus-like .eso file.
+
+    Parameters
+    ----------
+    path : str
+        Path to the .eso file, overwritten if it exists.
+    sql : str
+        Path to the SQL file.
+    newline : str, optional
+        Line ending of the file. Default is '\n'.
+    """
+    conn = sqlite3.connect(sql)
+    try:
+        dictionary = conn.execute("SELECT ReportDataDictionaryIndex, KeyValue, Name, Units, ReportingFrequency"
+                                  " FROM ReportDataDictionary ORDER BY ReportDataDictionaryIndex").fetchall()
+        times = conn.execute("SELECT TimeIndex, Year, Month, Day, Hour, IntervalType, SimulationDays FROM Time"
+                             " ORDER BY TimeIndex").fetchall()
+        values = {}
+        for time_index, id_, value in conn.execute("SELECT TimeIndex, ReportDataDictionaryIndex, Value"
+                                                   " FROM ReportData ORDER BY ReportDataIndex"):
+            values.setdefault(time_index, []).append((id_, value))
+    finally:
+        conn.close()
+    # the first ids belong to the standard lines
+    lines = list(ESO_PREAMBLE)
+    for id_, key, name, units, frequency in dictionary:
+        if frequency in ('Hourly', 'Annual'):
+            lines.append(f"{id_ + 6},1,{key},{name} [{units}] !{frequency}")
+        elif frequency == 'Daily':
+            lines.append(f"{id_ + 6},7,{key},{name} [{units}] !Daily [Value,Min,Hour,Minute,Max,Hour,Minute]")
+        else:
+            lines.append(f"{id_ + 6},9,{key},{name} [{units}] !Monthly "
+                         f"[Value,Min,Day,Hour,Minute,Max,Day,Hour,Minute]")
+    lines += ["End of Data Dictionary", "1,RUN PERIOD 1,  40.00, -105.00,  -7.00, 1655.00"]
+    extras = {1: "", 2: ",0.0,1, 0,9.9,2, 0", 3: ",0.0,1,1, 0,9.9,2,2, 0", 5: ""}
+    for time_index, year, month, day, hour, interval_type, simulation_day in times:
+        day_name = calendar.day_name[date(year, month, day).weekday()]
+        if interval_type == 1:
+            lines.append(f"2,{simulation_day},{month:2d},{day:2d}, 0,{hour:2d}, 0.00,60.00,{day_name}")
+        elif interval_type == 2:
+            lines.append(f"3,{simulation_day},{month:2d},{day:2d}, 0,{day_name}")
+        elif interval_type == 3:
+            lines.append(f"4,{simulation_day},{month:2d}")
+        else:
+            lines.append(f"6,{year}")
+        lines += [f"{id_ + 6},{value!r}{extras[interval_type]}" for id_, value in values.get(time_index, [])]
+    lines += ["End of Data", " Number of Records Written=        1"]
+    with open(path, 'w', newline='') as f:
+        f.write(newline.join(lines) + newline)
+
+
+@pytest.fixture
+def variables():
+    """The synthetic outputs as requested variables."""
+    from epeditor import Variable
+    return [Variable(f'ZONE{i}', name, units) for i, (name, _, units) in enumerate(OUTPUTS)]
+
+
+@pytest.fixture
+def case(tmp_path):
+    """A single case folder, as (sql path, reported values)."""
+    folder = tmp_path / 'case'
+    folder.mkdir()
+    sql = str(folder / 'eplusout.sql')
+    return sql, make_sql(sql)
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    """
+    A project folder of three cases with different values, as (folder, sql paths, reported values).
+
+    The working directory is moved into the project, where the readers put their temporary files.
+    """
+    monkeypatch.chdir(tmp_path)
+    sql_list, reported = [], []
+    for i in range(3):
+        folder = tmp_path / f'base_{i}'
+        folder.mkdir()
+        sql = str(folder / 'eplusout.sql')
+        reported.append(make_sql(sql, seed=i))
+        sql_list.append(sql)
+    return str(tmp_path), sql_list, reported
@@ -0,0 +1,67 @@
+import pytest
+from epeditor import affinity
+from epeditor.affinity import parse_cpulist, place_workers, numa_nodes, COMPACT, SPREAD, NUMA
+
+
+@pytest.fixture
+def sysfs(tmp_path, monkeypatch):
+    """
+    Two NUMA nodes of one package each, four cores per package and two threads per core.
+
+    As Linux numbers them, CPUs 0-7 are the first threads of the cores and CPUs 8-15 their SMT siblings.
+    """
+    for cpu in range(16):
+        first = cpu % 8
+        folder = tmp_path / 'cpu' / f'cpu{cpu}' / 'topology'
+        folder.mkdir(parents=True)
+        (folder / 'physical_package_id').write_text(f'{first // 4}\n')
+        (folder / 'core_id').write_text(f'{first % 4}\n')
+        (folder / 'thread_siblings_list').write_text(f'{first},{first + 8}\n')
+    for node, cpulist in enumerate(['0-3,8-11', '4-7,12-15']):
+        (tmp_path / 'node' / f'node{node}').mkdir(parents=True)
+        (tmp_path / 'node' / f'node{node}' / 'cpulist').write_text(cpulist + '\n')
+    (tmp_path / 'node' / 'possible').write_text('0-1\n')
+    monkeypatch.setattr(affinity, 'SYSFS_CPU', str(tmp_path / 'cpu'))
+    monkeypatch.setattr(affinity, 'SYSFS_NODE', str(tmp_path / 'node'))
+    monkeypatch.setattr(affinity, 'available_cpus', lambda: list(range(16)))
+
+
+def test_parse_cpulist():
+    assert parse_cpulist('0-3,8,10-11\n') == [0, 1, 2, 3, 8, 10, 11]
+    assert parse_cpulist('5') == [5]
+    assert parse_cpulist('') == []
+
+
+def test_numa_nodes(sysfs):
+    assert numa_nodes() == {0: [0, 1, 2, 3, 8, 9, 10, 11], 1: [4, 5, 6, 7, 12, 13, 14, 15]}
+
+
+@pytest.mark.parametrize('policy, avoid_smt, expected', [
+    (COMPACT, False, [0, 8, 1, 9, 2, 10, 3, 11, 4, 12, 5, 13, 6, 14, 7, 15]),
+    (COMPACT, True, [0, 1, 2, 3, 4, 5, 6, 7]),
+    (SPREAD, False, [0, 4, 1, 5, 2, 6, 3, 7, 8, 12, 9, 13, 10, 14, 11, 15]),
+    (SPREAD, True, [0, 4, 1, 5, 2, 6, 3, 7]),
+])
+def test_single_cpu_placements(sysfs, policy, avoid_smt, expected):
+    assert place_workers(len(expected), policy, avoid_smt) == [(cpu,) for cpu in expected]
+    # more workers than CPUs start over
+    assert place_workers(len(expected) + 1, policy, avoid_smt)[-1] == (expected[0],)
+
+
+def test_numa_placement(sysfs):
+    assert place_workers(3, NUMA) == [(0, 1, 2, 3, 8, 9, 10, 11), (4, 5, 6, 7, 12, 13, 14, 15),
+                                      (0, 1, 2, 3, 8, 9, 10, 11)]
+    assert place_workers(2, NUMA, avoid_smt=True) == [(0, 1, 2, 3), (4, 5, 6, 7)]
+    with pytest.raises(ValueError):
+        place_workers(2, 'scatter')
+
+
+def test_placement_without_topology(tmp_path, monkeypatch):
+    monkeypatch.setattr(affinity, 'SYSFS_CPU', str(tmp_path / 'cpu'))
+    monkeypatch.setattr(affinity, 'SYSFS_NODE', str(tmp_path / 'node'))
+    monkeypatch.setattr(affinity, 'available_cpus', lambda: [0, 1, 2])
+    # every CPU is a core of its own in a single node
+    assert numa_nodes() == {0: [0, 1, 2]}
+    for policy in [COMPACT, SPREAD]:
+        assert place_workers(4, policy, avoid_smt=True) == [(0,), (1,), (2,), (0,)]
+    assert place_workers(1, NUMA) == [(0, 1, 2)]
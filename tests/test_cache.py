@@ -0,0 +1,54 @@
+import os
+import sqlite3
+import numpy as np
+import pytest
+from epeditor.cache import CaseCache, get_cached_arrays, clear_cache, cache_folder
+from epeditor.db_eplusout_reader import get_first_arrays, sql_reader
+from epeditor.utils import Hourly, Daily, Monthly
+from conftest import make_sql
+
+
+@pytest.mark.parametrize('frequency', [Hourly, Daily, Monthly])
+def test_cached_reads_match_direct_reads(case, variables, frequency):
+    sql, _ = case
+    direct, direct_timestamps = get_first_arrays(sql, variables, frequency)
+    for _ in range(2):
+        array, timestamps = get_cached_arrays(sql, variables, frequency)
+        assert np.array_equal(array, direct)
+        assert np.array_equal(timestamps, direct_timestamps)
+    assert len(CaseCache(sql).index['blocks']) == len(variables)
+
+
+def test_cache_follows_sql_changes(case, variables):
+    sql, _ = case
+    get_cached_arrays(sql, variables, Monthly)
+    # a different size, so the change is seen whatever the mtime resolution
+    reported = make_sql(sql, days=31, seed=1)
+    array, _ = get_cached_arrays(sql, variables, Monthly)
+    assert np.allclose(array, [reported[('Monthly', i)] for i in range(len(variables))])
+
+
+def test_clear_cache(case, variables):
+    sql, _ = case
+    get_cached_arrays(sql, variables, Monthly)
+    clear_cache(sql)
+    assert not os.path.exists(cache_folder(sql))
+
+
+def test_fill_counts_outputs_once(case, variables, monkeypatch):
+    sql, reported = case
+    calls = []
+    count_outputs = sql_reader.count_outputs
+    monkeypatch.setattr(sql_reader, 'count_outputs', lambda *args: calls.append(args) or count_outputs(*args))
+    cache = CaseCache(sql)
+    cache.fill(variables, Daily)
+    assert len(calls) == 1
+    for block in cache.index['blocks'].values():
+        assert block['aligned']
+        assert np.load(os.path.join(cache.folder, block['file'])).shape == (59,)
+    # an hourly and a daily variable read together keep their own lengths
+    conn = sqlite3.connect(sql)
+    array, counts = sql_reader.get_outputs_array(conn, [1, 5], return_counts=True)
+    conn.close()
+    assert counts == [59 * 24, 59]
+    assert np.allclose(array[1, :59], reported[('Daily', 0)]) and np.isnan(array[1, 59:]).all()
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+from epeditor import calculators
+from epeditor.calculators import Percentile, apply_calculator, get_axis_function, register_calculator, argmax
+from epeditor.reader import get_group_result
+from epeditor.utils import Daily
+
+CUBE = np.random.RandomState(0).rand(4, 3, 6)
+
+
+def per_series(calculator, array, axis):
+    """The calculator called on every series along the axis, as done for unregistered callables."""
+    series = np.moveaxis(array, axis, -1)
+    result = np.array([calculator(s) for s in series.reshape(-1, series.shape[-1])])
+    return result.reshape(series.shape[:-1] + result.shape[1:])
+
+
+@pytest.mark.parametrize('calculator', [np.sum, sum, np.mean, np.median, np.std, np.var, np.min, min, np.max, max,
+                                        np.ptp, np.argmax, np.argmin, argmax, len, np.array, Percentile(90)])
+@pytest.mark.parametrize('axis', [0, 1, 2])
+def test_registered_calculators_match_series(calculator, axis):
+    assert get_axis_function(calculator) is not None
+    result = apply_calculator(calculator, CUBE, axis)
+    assert np.allclose(result, per_series(calculator, CUBE, axis))
+
+
+def test_unregistered_calculators_run_per_series():
+    def spread(series):
+        return np.array([np.min(series), np.max(series)])
+
+    assert get_axis_function(spread) is None
+    # list arguments are not hashable registry keys either
+    assert get_axis_function([np.sum]) is None
+    result = apply_calculator(spread, CUBE, axis=1)
+    assert result.shape == (4, 6, 2)
+    assert np.allclose(result[..., 0], CUBE.min(axis=1))
+    assert apply_calculator(spread, np.empty((2, 0)), axis=1).shape == (2,)
+
+
+def test_register_calculator(monkeypatch):
+    monkeypatch.setattr(calculators, 'CALCULATORS', dict(calculators.CALCULATORS))
+
+    def mean_of_squares(series):
+        return np.mean(np.square(series))
+
+    register_calculator(mean_of_squares, lambda a, axis: np.mean(np.square(a), axis=axis))
+    assert get_axis_function(mean_of_squares) is not None
+    assert np.allclose(apply_calculator(mean_of_squares, CUBE, 0), per_series(mean_of_squares, CUBE, 0))
+
+
+@pytest.mark.parametrize('calculator, function', [(np.mean, np.mean), (np.std, np.std),
+                                                  (Percentile(90), lambda a, axis: np.percentile(a, 90, axis=axis))])
+@pytest.mark.parametrize('workers', [1, 2])
+def test_group_results_match_numpy(project, variables, calculator, function, workers):
+    _, sql_list, reported = project
+    result = get_group_result(sql_list, variables, calculator, Daily, workers=workers)
+    cube = np.array([[case[('Daily', i)] for i in range(len(variables))] for case in reported])
+    assert np.allclose(result.data, function(cube, axis=0))
@@ -0,0 +1,52 @@
+import os
+import sqlite3
+import pytest
+from epeditor import Variable
+from epeditor.catalogue import VariableCatalogue, load_catalogue, CATALOGUE_FILE
+from epeditor.db_eplusout_reader import exceptions
+from epeditor.db_eplusout_reader.sql_reader import get_first_ids, to_sql_frequency
+from epeditor.utils import Hourly, Monthly
+from conftest import make_sql
+
+
+@pytest.mark.parametrize('request_, alike', [(Variable('ZONE1', 'Var 1', 'W'), False),
+                                             (Variable(None, 'Var 2', None), False),
+                                             (Variable('zone', None, None), True),
+                                             (Variable(None, 'var 3', 'c'), True)])
+def test_resolve_matches_sql(project, request_, alike):
+    folder, sql_list, _ = project
+    catalogue = load_catalogue(folder, sql_list)
+    for frequency in [Hourly, Monthly]:
+        conn = sqlite3.connect(sql_list[0])
+        try:
+            expected = get_first_ids(conn, [request_], to_sql_frequency(frequency), alike)
+        finally:
+            conn.close()
+        assert catalogue.resolve(sql_list[0], [request_], frequency, alike) == expected
+
+
+def test_resolve_missing_variable(project):
+    folder, sql_list, _ = project
+    catalogue = load_catalogue(folder, sql_list)
+    with pytest.raises(exceptions.NoResults):
+        catalogue.resolve(sql_list[0], [Variable('ZONE9', None, None)], Hourly)
+
+
+def test_saved_catalogue_is_reused_until_a_case_changes(project):
+    folder, sql_list, _ = project
+    catalogue = load_catalogue(folder, sql_list)
+    loaded = VariableCatalogue.load(os.path.join(folder, CATALOGUE_FILE))
+    assert loaded.is_current(sql_list)
+    assert loaded.variables() == catalogue.variables()
+    make_sql(sql_list[1], days=31)
+    assert not loaded.is_current(sql_list)
+    assert loaded.resolve(sql_list[1], [Variable('ZONE0', None, None)], Hourly) is None
+
+
+def test_search_modes(project):
+    folder, sql_list, _ = project
+    catalogue = load_catalogue(folder, sql_list)
+    assert [v.key for v in catalogue.search('zone[12]$', mode='regex')] == ['ZONE1', 'ZONE2']
+    assert [v.key for v in catalogue.search('ZONE?')] == ['ZONE0', 'ZONE1', 'ZONE2', 'ZONE3']
+    assert [v.key for v in catalogue.search('var 3')] == ['ZONE3']
+    assert catalogue.search('var 3', frequency=Monthly, mode='prefix') == [Variable('ZONE3', 'Var 3', 'C')]
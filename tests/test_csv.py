@@ -0,0 +1,68 @@
+import gzip
+import os
+import numpy as np
+import pytest
+from epeditor.db_eplusout_reader import get_results
+from epeditor.db_eplusout_reader.results_dict import ResultsHandler, ResultsWriter
+from epeditor.reader import IDFResult
+from epeditor.utils import Hourly, Monthly
+
+
+def table_csv(results_dictionary, path, explode_header=True, title=''):
+    """The csv written from the whole table, as `ResultsDictionary.to_csv` did before streaming."""
+    table = ResultsHandler.convert_dict_to_table(results_dictionary, explode_header)
+    ResultsWriter.write_table_to_csv(table, path, ',', False, title)
+
+
+def result_csv(result, path, seq=','):
+    """The csv of an `IDFResult`, as `IDFResult.to_csv` wrote it before streaming."""
+    streams = []
+    data = result.data
+    if len(data.shape) == 2:
+        streamData = np.array(data).T
+        streams += [seq.join(['directory'] + [v.__repr__() for v in result.variables])]
+        streams += [seq.join(np.append([os.path.dirname(file)], line.astype(str))) for line, file in
+                    zip(streamData, result.sql_list)]
+    if len(data.shape) == 3:
+        for i, v in enumerate(result.variables):
+            streams += [v.__repr__()]
+            streams += [seq.join([os.path.dirname(file).split('\\')[-1] for file in result.sql_list])]
+            streams += [seq.join(line.astype(str)) for line in np.array(data[i])]
+    with open(path, 'w+') as f:
+        f.write('\n'.join(streams))
+
+
+def read_text(path):
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt', newline='') as f:
+        return f.read()
+
+
+@pytest.mark.parametrize('chunk_rows', [None, 7])
+@pytest.mark.parametrize('explode_header', [True, False])
+def test_results_dictionary_csv_matches_table(case, variables, tmp_path, chunk_rows, explode_header):
+    sql, _ = case
+    results = get_results(sql, variables, Hourly)
+    table_csv(results, str(tmp_path / 'table.csv'), explode_header, title='case')
+    for name in ['streamed.csv', 'streamed.csv.gz']:
+        results.to_csv(str(tmp_path / name), explode_header, title='case', chunk_rows=chunk_rows)
+        assert read_text(str(tmp_path / name)) == read_text(str(tmp_path / 'table.csv'))
+    with open(tmp_path / 'streamed.csv.gz', 'rb') as f:
+        assert f.read(2) == b'\x1f\x8b'
+
+
+@pytest.mark.parametrize('chunk_rows', [None, 7])
+def test_idf_result_csv_matches_table(project, variables, tmp_path, chunk_rows):
+    folder, sql_list, _ = project
+    cases = [os.path.join(folder, f'base_{i % 3}', 'eplusout.sql') for i in range(20)]
+    random = np.random.RandomState(0)
+    results = [IDFResult(variables, Monthly, random.rand(len(variables), len(cases)) * 100, cases),
+               IDFResult(variables, Monthly, random.rand(len(variables), 15, len(cases)), cases)]
+    for result in results:
+        result_csv(result, str(tmp_path / 'table.csv'))
+        result.to_csv(str(tmp_path / 'streamed.csv'), chunk_rows=chunk_rows)
+        result.to_csv(str(tmp_path / 'streamed.gz'), compress=True, chunk_rows=chunk_rows)
+        expected = read_text(str(tmp_path / 'table.csv'))
+        assert read_text(str(tmp_path / 'streamed.csv')) == expected
+        with gzip.open(tmp_path / 'streamed.gz', 'rt', newline='') as f:
+            assert f.read() == expected
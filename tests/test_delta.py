@@ -0,0 +1,41 @@
+import os
+import numpy as np
+import pytest
+from epeditor.db_eplusout_reader import exceptions
+from epeditor.delta import DeltaResult, get_delta_result
+from epeditor.utils import Monthly
+from conftest import make_sql
+
+
+def test_delta_of_known_cube(variables):
+    cube = np.array([[[10., 20.], [4., 0.]],
+                     [[8., 20.], [5., 1.]],
+                     [[12., 10.], [4., 0.]]])
+    result = DeltaResult(variables[:2], Monthly, cube, ['base', 'a', 'b'])
+    assert np.array_equal(result.delta.data[:, :, 1], [[-2., 0.], [1., 1.]])
+    assert np.array_equal(result.savings.data, [[0., 2., 8.], [0., -2., 0.]])
+    assert np.allclose(result.percent.data, [[0., 20 / 3, 80 / 3], [0., -50., 0.]])
+    # no ratio against a zero baseline step
+    assert np.allclose(result.ratio.data[0, :, 2], [1.2, 0.5])
+    assert np.isnan(result.ratio.data[1, 1, 1])
+    assert result.rank(0) == [('b', 8.), ('a', 2.), ('base', 0.)]
+    assert result.top(1, variables[1], percent=True) == [('base', 0.)]
+
+
+def test_delta_result_matches_reported(project, variables):
+    _, sql_list, reported = project
+    result = get_delta_result(sql_list, sql_list[1], variables, Monthly)
+    order = [1, 0, 2]
+    assert result.sql_list == [os.path.normpath(sql_list[i]) for i in order]
+    cube = np.array([[reported[case][('Monthly', i)] for i in range(len(variables))] for case in order])
+    assert np.allclose(np.moveaxis(result.delta.data, -1, 0), cube - cube[0])
+    assert np.allclose(result.savings.data, (cube[0].sum(axis=1) - cube.sum(axis=2)).T)
+
+
+def test_delta_skips_cases_with_other_steps(project, variables):
+    _, sql_list, _ = project
+    make_sql(sql_list[2], days=31)
+    result = get_delta_result(sql_list, sql_list[0], variables, Monthly)
+    assert result.sql_list == [os.path.normpath(sql) for sql in sql_list[:2]]
+    with pytest.raises(exceptions.NoResults):
+        get_delta_result(sql_list, os.path.join(os.path.dirname(sql_list[0]), 'missing.sql'), variables)
@@ -0,0 +1,129 @@
+from datetime import datetime
+import numpy as np
+import pytest
+from epeditor import Variable
+from epeditor.db_eplusout_reader import get_first_arrays
+from epeditor.db_eplusout_reader.eso_reader import get_eso_dictionary_rows
+from epeditor.db_eplusout_reader.processing.esofile_reader import process_header_line, process_eso_file, \
+    read_preamble, read_body_selective, filter_header
+from epeditor.db_eplusout_reader.processing.raw_eso_data import RawOutputData, INITIAL_STEPS
+from epeditor.db_eplusout_reader.processing.esofile_time import parse_eso_timestamp, parse_eso_timestamp_columns, \
+    get_year_offsets, generate_datetime_dates
+from epeditor.db_eplusout_reader.db_esofile import DBEsoFileCollection
+from conftest import ESO_PREAMBLE, make_sql, make_eso
+
+
+def write_meters(path):
+    """An .eso file reporting one standard and one cumulative meter over three hours."""
+    lines = ESO_PREAMBLE + ["7,1,Electricity:Facility [J] !Hourly",
+                            "8,1,Cumulative Electricity:Facility [J] !Hourly",
+                            "End of Data Dictionary", "1,RUN PERIOD 1,  40.00, -105.00,  -7.00, 1655.00"]
+    for hour in range(1, 4):
+        lines += [f"2,1, 1, 1, 0,{hour:2d}, 0.00,60.00,Tuesday", f"7,{hour * 10.}", f"8,{hour * (hour + 1) * 5.}"]
+    lines += ["End of Data", " Number of Records Written=        1"]
+    with open(path, 'w') as f:
+        f.write('\n'.join(lines) + '\n')
+
+
+def test_meter_header_lines():
+    assert process_header_line("7,1,Electricity:Facility [J] !Hourly") == \
+        (7, 'Meter', 'Electricity:Facility', 'J', 'hourly')
+    assert process_header_line("8,1,Cumulative Electricity:Facility [J] !Hourly") == \
+        (8, 'Cumulative Meter', 'Cumulative Electricity:Facility', 'J', 'hourly')
+    assert process_header_line("9,1,ZONE1,Zone Mean Air Temperature [C] !Hourly") == \
+        (9, 'ZONE1', 'Zone Mean Air Temperature', 'C', 'hourly')
+
+
+def test_meters_are_requested_as_in_sql(tmp_path):
+    path = str(tmp_path / 'eplusout.eso')
+    write_meters(path)
+    assert get_eso_dictionary_rows(path) == [(7, '', 'Electricity:Facility', 'J', 'Hourly'),
+                                             (8, 'Cumulative', 'Electricity:Facility', 'J', 'Hourly')]
+    array, _ = get_first_arrays(path, [Variable('Cumulative', 'Electricity:Facility', 'J'),
+                                       Variable('', 'Electricity:Facility', 'J')], 'hourly')
+    assert np.array_equal(array, [[10., 30., 60.], [10., 20., 30.]])
+
+
+@pytest.fixture(params=['\n', '\r\n'], ids=['LF', 'CRLF'])
+def eso(tmp_path, request):
+    """An .eso file holding the outputs of a synthetic SQL case, as (eso path, reported values)."""
+    sql, path = str(tmp_path / 'eplusout.sql'), str(tmp_path / 'eplusout.eso')
+    reported = make_sql(sql)
+    make_eso(path, sql, request.param)
+    return path, reported
+
+
+@pytest.mark.parametrize('chunk_size', [1000, 2 ** 26])
+def test_selective_body_matches_full_parse(eso, chunk_size):
+    path, reported = eso
+    full = process_eso_file(path)
+    with open(path) as f:
+        highest_frequency_id, header = read_preamble(f)
+    # one variable of each frequency, from 'Var 0' hourly to 'Var 3' annual
+    ids = {7, 12, 17, 22}
+    with open(path, 'rb') as f:
+        buffer = f.read()
+    offset = buffer.find(b'\n', buffer.find(b'End of Data Dictionary')) + 1
+    selective = read_body_selective(buffer, offset, highest_frequency_id, filter_header(header, ids), ids,
+                                    chunk_size)
+    assert len(selective) == len(full) == 1
+    for frequency, name in [('hourly', 'Hourly'), ('daily', 'Daily'), ('monthly', 'Monthly'), ('annual', 'Annual')]:
+        outputs = selective[0].outputs[frequency]
+        assert len(outputs) == 1
+        (id_, values), = outputs.items()
+        assert np.array_equal(values, full[0].outputs[frequency][id_])
+        assert np.allclose(values, reported[(name, (id_ - 7) % 4)])
+        assert selective[0].dates[frequency] == full[0].dates[frequency]
+
+
+def test_raw_output_blocks_grow():
+    header = {'hourly': {Variable('ZONE0', 'Var 0', 'J'): 7, Variable('ZONE1', 'Var 1', 'W'): 8}, 'monthly': {}}
+    raw = RawOutputData('RUN PERIOD 1', header)
+    assert raw.blocks['hourly'].shape == (2, INITIAL_STEPS)
+    n_steps = 2 * INITIAL_STEPS + 3
+    for step in range(n_steps):
+        raw.initialize_next_outputs_step('hourly')
+        raw.set_output('hourly', 7, float(step))
+        # steps without a reported value stay NaN
+        if step % 2:
+            raw.set_output('hourly', 8, -float(step))
+    assert raw.blocks['hourly'].shape == (2, 4 * INITIAL_STEPS)
+    assert raw.array('hourly').shape == (2, n_steps)
+    assert np.array_equal(raw.outputs['hourly'][7], np.arange(n_steps))
+    assert np.isnan(raw.outputs['hourly'][8][::2]).all()
+    assert np.array_equal(raw.outputs['hourly'][8][1::2], -np.arange(1, n_steps, 2))
+    assert raw.array('monthly').shape == (0, 0)
+
+
+def test_timestamp_columns_match_single_timestamps():
+    # (month, day, hour, end minute): timesteps, hour ends, the last hour of a month, hour 0 of daily+ steps
+    raw = [(1, 1, 1, 15), (1, 1, 1, 60), (1, 31, 24, 60), (2, 28, 23, 45), (2, 29, 24, 60), (12, 31, 24, 60),
+           (7, 4, 0, 0), (3, 1, 0, 30)]
+    years = np.array([2004] * len(raw))
+    columns = np.array(raw).T
+    expected = [np.datetime64(parse_eso_timestamp(2004, *row), 'm') for row in raw]
+    assert np.array_equal(parse_eso_timestamp_columns(years, *columns), expected)
+    with pytest.raises(ValueError):
+        parse_eso_timestamp_columns(np.array([2002]), *np.array([(2, 29, 1, 60)]).T)
+
+
+def test_year_offsets_roll_over():
+    columns = np.array([(12, 31, 23, 60), (12, 31, 24, 60), (1, 1, 1, 60), (6, 1, 1, 60), (1, 1, 1, 60),
+                        (1, 1, 1, 60)])
+    assert np.array_equal(get_year_offsets(columns), [0, 0, 1, 1, 2, 3])
+    dates = generate_datetime_dates(columns[:3], 2002)
+    assert np.array_equal(dates, np.array([datetime(2002, 12, 31, 23), datetime(2003, 1, 1), datetime(2003, 1, 1, 1)],
+                                          dtype='datetime64[m]'))
+
+
+def test_selective_timestamps_match_full_parse(eso, variables):
+    path, _ = eso
+    full = DBEsoFileCollection.from_path(path)
+    selective = DBEsoFileCollection.from_path(path, ids={7, 12, 17, 22})
+    for frequency in ['hourly', 'daily', 'monthly', 'annual']:
+        assert np.array_equal(selective[0].time_index(frequency), full[0].time_index(frequency))
+        _, timestamps = get_first_arrays(path, variables, frequency)
+        assert np.array_equal(timestamps, full[0].time_index(frequency))
+    hourly = full[0].time_index('hourly')
+    assert hourly.dtype == np.dtype('datetime64[m]')
+    assert np.all(np.diff(hourly) == np.timedelta64(60, 'm'))
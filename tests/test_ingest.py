@@ -0,0 +1,82 @@
+import os
+import queue
+import sqlite3
+import numpy as np
+from epeditor.ingest import ResultStore
+from epeditor.simulator import make_return_callback, drain_cases
+from epeditor.utils import Monthly
+
+
+class Finished:
+    """Stands for the AsyncResult of a worker that returned."""
+
+    def ready(self):
+        return True
+
+
+def test_ingest(project, variables):
+    folder, sql_list, _ = project
+    store = ResultStore(variables, Monthly)
+    assert store.ingest(sql_list[2])
+    assert store.ingest_folder(os.path.join(folder, 'base_0')) == 1
+    assert store.sql_list == [os.path.normpath(sql_list[2]), os.path.normpath(sql_list[0])]
+    assert store.cases[os.path.normpath(sql_list[0])] == 2
+    # a case missing a variable is not added
+    conn = sqlite3.connect(sql_list[1])
+    conn.execute("DELETE FROM ReportDataDictionary WHERE Name = 'Var 0'")
+    conn.commit()
+    conn.close()
+    assert not store.ingest(sql_list[1])
+    assert store.ingest_folder(os.path.join(folder, 'missing')) == 0
+    assert len(store) == 2
+
+
+def test_group_result_of_ingested_cases(project, variables):
+    _, sql_list, reported = project
+    store = ResultStore(variables, Monthly)
+    for sql in sql_list[:2]:
+        store.ingest(sql)
+    result = store.group_result(np.sum)
+    assert result.sql_list == [os.path.normpath(sql) for sql in sql_list[:2]]
+    for i in range(len(variables)):
+        assert np.allclose(result.data[i], reported[0][('Monthly', i)] + reported[1][('Monthly', i)])
+    # summaries reduce the variables of each case, one column per case
+    summary = store.group_result(np.max, variables[1:3], x='summary')
+    for k in range(2):
+        assert np.allclose(summary.data[:, k], np.maximum(reported[k][('Monthly', 1)], reported[k][('Monthly', 2)]))
+    assert store.case_result(sql_list[2]) is None
+    assert np.allclose(store.case_result(sql_list[1], variables[3]).data[0], reported[1][('Monthly', 3)])
+    # cases finished later are added to the next results
+    store.ingest(sql_list[2])
+    assert len(store.group_result(np.sum).sql_list) == 3
+
+
+def test_return_callback_ingests_finished_cases(project, variables, capsys):
+    folder, sql_list, _ = project
+    store = ResultStore(variables, Monthly)
+    # a simulate_file task returns its message, a simulate_queue task its case folders
+    make_return_callback(store.ingest_folder, os.path.join(folder, 'base_0'))('Case Done:base_0.idf')
+    make_return_callback(store.ingest_folder)([os.path.join(folder, 'base_1'), os.path.join(folder, 'base_2')])
+    assert store.sql_list == [os.path.normpath(sql) for sql in sql_list]
+
+    def broken(case_dir):
+        raise RuntimeError('locked')
+
+    make_return_callback(broken)([os.path.join(folder, 'base_0')])
+    assert '****Ingest Error' in capsys.readouterr().out
+
+
+def test_drain_cases_reports_each_folder_once(project, variables):
+    folder, sql_list, _ = project
+    store, folders = ResultStore(variables, Monthly), []
+    done = queue.Queue()
+    for name in ['base_1', 'base_0', 'base_2']:
+        done.put(os.path.join(folder, name))
+
+    def on_case(case_dir):
+        folders.append(case_dir)
+        store.ingest_folder(case_dir)
+
+    drain_cases(done, [Finished(), Finished()], on_case)
+    assert folders == [os.path.join(folder, name) for name in ['base_1', 'base_0', 'base_2']]
+    assert store.sql_list == [os.path.normpath(sql_list[i]) for i in [1, 0, 2]]
@@ -0,0 +1,176 @@
+from datetime import datetime
+import gc
+import os
+import sqlite3
+import numpy as np
+import pytest
+from epeditor import Variable
+from epeditor.db_eplusout_reader import get_first_arrays, get_results
+from epeditor.db_eplusout_reader.sql_reader import to_sql_frequency, iter_federated_arrays, get_time_index, \
+    get_window_mask, get_window_ranges, window_statement
+from epeditor import reader
+from epeditor.reader import IDFResult, get_group_result, read_cases
+from epeditor.utils import Hourly, Daily, Monthly, Annually
+from conftest import OUTPUTS, make_eso
+
+
+@pytest.mark.parametrize('frequency', [Hourly, Daily, Monthly, Annually])
+def test_first_arrays_match_reported(case, variables, frequency):
+    sql, reported = case
+    array, timestamps = get_first_arrays(sql, variables[::-1], frequency)
+    assert array.shape == (len(variables), len(timestamps))
+    for row, i in zip(array, reversed(range(len(OUTPUTS)))):
+        assert np.allclose(row, reported[(to_sql_frequency(frequency), i)])
+
+
+def test_window_ranges_follow_gaps():
+    time_indices = np.array([3, 5, 8, 9, 12, 14, 20])
+    mask = np.array([True, True, False, True, True, False, True])
+    assert get_window_ranges(time_indices, mask) == [(3, 5), (9, 12), (20, 20)]
+    assert get_window_ranges(time_indices, np.zeros(7, dtype=bool)) == []
+    assert window_statement(None) == ""
+    assert window_statement([]) == " AND 0"
+    assert window_statement([(3, 5), (20, 20)]) == \
+        " AND (ReportData.TimeIndex BETWEEN 3 AND 5 OR ReportData.TimeIndex BETWEEN 20 AND 20)"
+
+
+@pytest.mark.parametrize('frequency', [Hourly, Daily, Monthly])
+def test_windowed_reads_match_sliced_full_read(case, variables, frequency):
+    sql, _ = case
+    start, end = datetime(2002, 1, 10, 5), datetime(2002, 2, 3, 12)
+    full, timestamps = get_first_arrays(sql, variables, frequency)
+    mask = get_window_mask(timestamps, start, end)
+    assert mask.any() and not mask.all()
+    array, windowed = get_first_arrays(sql, variables, frequency, start_date=start, end_date=end)
+    assert windowed.dtype == np.dtype('datetime64[m]')
+    assert np.array_equal(windowed, timestamps[mask])
+    assert np.array_equal(array, full[:, mask])
+    for batched in [False, True]:
+        rd = get_results(sql, variables, frequency, start_date=start, end_date=end, batched=batched)
+        assert isinstance(rd.time_series, np.ndarray) and rd.time_series.dtype == np.dtype('datetime64[m]')
+        assert np.array_equal(rd.time_series, timestamps[mask])
+        assert np.array_equal(np.array(rd.arrays, dtype=float).reshape(len(variables), -1), full[:, mask])
+
+
+def test_window_without_steps(case, variables):
+    sql, _ = case
+    array, timestamps = get_first_arrays(sql, variables, Hourly, start_date=datetime(2002, 6, 1),
+                                         end_date=datetime(2002, 7, 1))
+    assert array.shape == (len(variables), 0) and timestamps.size == 0
+
+
+def test_first_arrays_alike(case):
+    sql, reported = case
+    array, _ = get_first_arrays(sql, [Variable('zone2', None, None), Variable(None, 'var 1', None)], Monthly,
+                                alike=True)
+    assert np.allclose(array[0], reported[('Monthly', 2)])
+    assert np.allclose(array[1], reported[('Monthly', 1)])
+
+
+@pytest.mark.parametrize('calculator, combine', [(np.sum, np.sum), (np.max, np.max), (np.median, np.median)])
+def test_group_result_matches_reported(project, variables, calculator, combine):
+    _, sql_list, reported = project
+    result = get_group_result(sql_list, variables, calculator, Monthly)
+    assert len(result.sql_list) == len(sql_list)
+    for i in range(len(variables)):
+        expected = combine([case[('Monthly', i)] for case in reported], axis=0)
+        assert np.allclose(result.data[i], expected)
+
+
+def test_read_cases_in_case_order(project, variables):
+    _, sql_list, reported = project
+    validSql, arrays = read_cases(sql_list[::-1], variables, Daily)
+    assert validSql == [os.path.normpath(sql) for sql in sql_list[::-1]]
+    for array, case in zip(arrays, reported[::-1]):
+        assert np.allclose(array, [case[('Daily', i)] for i in range(len(variables))])
+
+
+def test_read_cases_with_workers(project, variables):
+    _, sql_list, _ = project
+    serial = read_cases(sql_list, variables, Hourly)
+    parallel = read_cases(sql_list, variables, Hourly, workers=2)
+    assert parallel[0] == serial[0]
+    for a, b in zip(parallel[1], serial[1]):
+        assert np.array_equal(a, b)
+
+
+@pytest.fixture
+def spill_dir(tmp_path, monkeypatch):
+    """Results above 10 elements are spilled to a temporary working folder."""
+    monkeypatch.setattr(reader, 'Working_Dir', str(tmp_path / 'spill'))
+    monkeypatch.setattr(reader, 'Spill_Threshold', 10)
+    return tmp_path / 'spill'
+
+
+def test_spilled_result_is_memory_mapped(spill_dir, variables):
+    data = np.arange(4 * 12.).reshape(4, 12)
+    result = IDFResult(variables, Monthly, data, [])
+    assert result.nbytes_in_memory == 0
+    assert isinstance(result.data, np.memmap)
+    assert np.array_equal(result.data, data)
+    assert np.array_equal(result.select(variables[1], [0, 2]), data[1:2, [0, 2]])
+
+
+def test_spill_files_are_removed(spill_dir, tmp_path, variables):
+    data = np.arange(4 * 12.).reshape(4, 12)
+    result = IDFResult(variables, Monthly, data, [])
+    assert len(os.listdir(spill_dir)) == 2
+    del result
+    gc.collect()
+    assert os.listdir(spill_dir) == []
+
+    result = IDFResult(variables, Monthly, data, [])
+    result.load()
+    assert os.listdir(spill_dir) == []
+    assert np.array_equal(result.data, data)
+
+    result = IDFResult(variables, Monthly, data, [])
+    path = str(tmp_path / 'kept.npy')
+    result.save(path)
+    assert os.listdir(spill_dir) == []
+    assert np.array_equal(IDFResult.from_npy(path).data, data)
+
+
+@pytest.mark.parametrize('batch_size', [1, 2, None])
+def test_federated_reads_match_case_reads(project, variables, batch_size):
+    _, sql_list, reported = project
+    found = list(iter_federated_arrays(sql_list, variables, Daily, batch_size=batch_size))
+    assert [sql for sql, _, _ in found] == sql_list
+    for (sql, array, timestamps), case in zip(found, reported):
+        direct, direct_timestamps = get_first_arrays(sql, variables, Daily)
+        assert np.array_equal(array, direct)
+        assert np.array_equal(timestamps, direct_timestamps)
+        assert np.allclose(array, [case[('Daily', i)] for i in range(len(variables))])
+
+
+def test_federated_read_cases_skips_incomplete_cases(project, variables):
+    _, sql_list, _ = project
+    conn = sqlite3.connect(sql_list[1])
+    conn.execute("DELETE FROM ReportDataDictionary WHERE Name = 'Var 3'")
+    conn.commit()
+    conn.close()
+    validSql, arrays = read_cases(sql_list, variables, Monthly, federated=True)
+    assert validSql == [os.path.normpath(sql_list[0]), os.path.normpath(sql_list[2])]
+    assert np.array_equal(arrays[1], read_cases(sql_list[2:], variables, Monthly)[1][0])
+
+
+def test_federated_read_cases_skips_corrupt_cases(project, variables):
+    _, sql_list, _ = project
+    with open(sql_list[1], 'wb') as f:
+        f.write(b'not a database' * 100)
+    validSql, arrays = read_cases(sql_list, variables, Monthly, federated=True)
+    assert validSql == [os.path.normpath(sql_list[0]), os.path.normpath(sql_list[2])]
+    assert np.array_equal(arrays[1], read_cases(sql_list[2:], variables, Monthly)[1][0])
+
+
+def test_federated_read_cases_reads_eso_cases(project, variables):
+    _, sql_list, _ = project
+    eso = sql_list[1][:-len('.sql')] + '.eso'
+    make_eso(eso, sql_list[1])
+    os.remove(sql_list[1])
+    cases = [sql_list[0], eso, sql_list[2]]
+    validSql, arrays = read_cases(cases, variables, Daily, federated=True)
+    serial = read_cases(cases, variables, Daily)
+    assert validSql == serial[0] == [os.path.normpath(path) for path in cases]
+    for a, b in zip(arrays, serial[1]):
+        assert np.array_equal(a, b)
@@ -0,0 +1,102 @@
+import numpy as np
+import pytest
+from epeditor.reducers import Count, Sum, Mean, Min, Max, Var, Std, Quantile, CaseReduction, as_reducer
+from epeditor.reader import stack_cases
+
+# shards of a 37 case stack, one of them empty
+SHARDS = [(0, 10), (10, 11), (11, 11), (11, 37)]
+
+
+def reduce_shards(reducer, stack):
+    """Reduce each shard on its own and merge the shards in order."""
+    merged = reducer.empty()
+    for first, last in SHARDS:
+        shard = reducer.empty()
+        for array in stack[first:last]:
+            shard.update(array)
+        merged.merge(shard)
+    return merged
+
+
+@pytest.mark.parametrize('reducer, function', [(Count(), lambda a, axis: np.full(a.shape[1:], len(a))),
+                                               (Sum(), np.sum), (Mean(), np.mean), (Min(), np.min),
+                                               (Max(), np.max), (Var(), np.var), (Std(), np.std)])
+def test_merged_shards_match_numpy(reducer, function):
+    # a large offset makes a naive sum of squares lose the variance
+    stack = 1e6 + np.random.RandomState(0).randn(37, 3, 5)
+    serial = reducer.empty()
+    for array in stack:
+        serial.update(array)
+    for result in [serial, reduce_shards(reducer, stack)]:
+        assert result.n == len(stack)
+        assert np.allclose(result.result(), function(stack, axis=0), rtol=1e-10, atol=1e-9)
+
+
+def test_welford_matches_chan_merge():
+    stack = np.random.RandomState(1).rand(9, 2, 4) * 100
+    left, right, serial = Var(), Var(), Var()
+    for array in stack[:4]:
+        left.update(array)
+    for array in stack[4:]:
+        right.update(array)
+    for array in stack:
+        serial.update(array)
+    left.merge(right)
+    assert np.allclose(left.mean, serial.mean)
+    assert np.allclose(left.m2, serial.m2)
+
+
+def test_quantile_is_exact_before_compaction():
+    stack = np.random.RandomState(2).rand(50, 2, 3)
+    reducer = reduce_shards(Quantile(0.9, k=200), stack[:37])
+    assert np.allclose(reducer.result(), np.quantile(stack[:37], 0.9, axis=0))
+
+
+@pytest.mark.parametrize('q', [0.1, 0.5, 0.9])
+def test_quantile_rank_error(q):
+    k, n = 64, 3000
+    stack = np.random.RandomState(3).randn(n, 2, 3)
+    reducer = Quantile(q, k=k, seed=0)
+    shards = [Quantile(q, k=k, seed=i) for i in range(3)]
+    for i, array in enumerate(stack):
+        reducer.update(array)
+        shards[i % 3].update(array)
+    for shard in shards[1:]:
+        shards[0].merge(shard)
+    for sketch in [reducer, shards[0]]:
+        assert len(sketch.levels) > 1
+        # rank of the estimate among the cases of each cell
+        ranks = (stack <= sketch.result()).mean(axis=0)
+        assert np.all(np.abs(ranks - q) < 4. / k)
+
+
+def test_case_reduction_pads_short_cases():
+    random = np.random.RandomState(4)
+    arrays = [random.rand(2, steps) for steps in [3, 5, 4, 5, 2, 3]]
+    expected = np.mean(stack_cases(arrays, 2), axis=0)
+    serial = CaseReduction(Mean())
+    for array in arrays:
+        serial.update(array)
+    assert np.allclose(serial.result(2), expected)
+    # shards of any length are merged in order
+    for split in [1, 2, 4]:
+        left, right = CaseReduction(Mean()), CaseReduction(Mean())
+        for array in arrays[:split]:
+            left.update(array)
+        for array in arrays[split:]:
+            right.update(array)
+        left.merge(right)
+        assert np.allclose(left.result(2), expected)
+    assert CaseReduction(Sum()).result(3).shape == (3, 0)
+
+
+def test_as_reducer():
+    assert type(as_reducer(np.mean)) is Mean
+    assert type(as_reducer(len)) is Count
+    assert type(as_reducer(Std)) is Std
+    assert as_reducer(np.median) is None
+    assert as_reducer(lambda a: a[0]) is None
+    used = Quantile(0.25, k=10)
+    used.update(np.ones((1, 1)))
+    fresh = as_reducer(used)
+    assert (fresh.q, fresh.k, fresh.n) == (0.25, 10, 0)
@@ -0,0 +1,87 @@
+import sqlite3
+import numpy as np
+import pytest
+from epeditor import cache
+from epeditor.cache import CaseCache, get_cached_arrays
+from epeditor.db_eplusout_reader.sql_reader import to_sql_frequency
+from epeditor.reader import get_group_result, read_cases
+from epeditor.resample import resample
+from epeditor.utils import Hourly, Daily, Monthly, Annually, RunPeriod
+
+
+@pytest.fixture
+def resampled(monkeypatch):
+    monkeypatch.setattr(cache, 'RESAMPLE', True)
+
+
+@pytest.mark.parametrize('frequency', [Daily, Monthly, Annually])
+def test_resampled_reads_match_reported(case, variables, resampled, frequency):
+    # 'Var 2' is summed in hours, not in energy units
+    sql, reported = case
+    get_cached_arrays(sql, variables, Hourly)
+    assert CaseCache(sql).resample_source(variables, frequency) == Hourly
+    array, _ = get_cached_arrays(sql, variables, frequency)
+    for i in range(len(variables)):
+        assert np.allclose(array[i], reported[(to_sql_frequency(frequency), i)])
+
+
+def test_unknown_type_is_read_from_sql(case, variables, resampled):
+    sql, reported = case
+    conn = sqlite3.connect(sql)
+    conn.execute("UPDATE ReportDataDictionary SET Type = NULL WHERE Name = 'Var 2'")
+    conn.commit()
+    conn.close()
+    get_cached_arrays(sql, variables, Hourly)
+    assert CaseCache(sql).resample_source(variables, Monthly) is None
+    array, _ = get_cached_arrays(sql, variables, Monthly)
+    assert np.allclose(array[2], reported[('Monthly', 2)])
+
+
+def test_resample_is_opt_in(case, variables):
+    sql, _ = case
+    get_cached_arrays(sql, variables, Hourly)
+    assert CaseCache(sql).resample_source(variables, Monthly) is None
+
+
+def test_resample_argument(project, variables, monkeypatch):
+    _, sql_list, reported = project
+    read_cases(sql_list, variables, Hourly)
+    result = get_group_result(sql_list, variables, np.sum, Monthly, resample=True)
+    for i in range(len(variables)):
+        assert np.allclose(result.data[i], np.sum([case[('Monthly', i)] for case in reported], axis=0))
+    # the monthly series were never read from SQLite
+    assert all('Monthly' not in CaseCache(sql).index['time'] for sql in sql_list)
+    # the argument overrides the module default either way
+    monkeypatch.setattr(cache, 'RESAMPLE', True)
+    assert CaseCache(sql_list[0]).resample_source(variables, Monthly) == Hourly
+    assert CaseCache(sql_list[0]).resample_source(variables, Monthly, resample=False) is None
+    monkeypatch.setattr(cache, 'RESAMPLE', False)
+    assert CaseCache(sql_list[0]).resample_source(variables, Monthly, resample=True) == Hourly
+
+
+def test_periods_do_not_span_environments():
+    # two design days of the same date, hour ending timestamps
+    day = np.datetime64('2002-07-21T00:00') + np.arange(1, 25) * np.timedelta64(1, 'h')
+    timestamps = np.concatenate([day, day])
+    environments = np.repeat([1, 2], 24)
+    array = np.arange(2 * 48.).reshape(2, 48)
+    for frequency in [Daily, RunPeriod]:
+        merged, _ = resample(array, timestamps, frequency, ['Sum', 'Avg'])
+        assert merged.shape == (2, 1)
+        split, stamps = resample(array, timestamps, frequency, ['Sum', 'Avg'], environments)
+        assert np.array_equal(split, [[array[0, :24].sum(), array[0, 24:].sum()],
+                                      [array[1, :24].mean(), array[1, 24:].mean()]])
+        assert len(stamps) == 2
+
+
+def test_resampled_case_with_two_environments(case, variables):
+    sql, _ = case
+    conn = sqlite3.connect(sql)
+    conn.execute("UPDATE Time SET EnvironmentPeriodIndex = 2 WHERE Month = 2")
+    conn.commit()
+    hourly, _ = get_cached_arrays(sql, variables, Hourly)
+    conn.close()
+    array, _ = get_cached_arrays(sql, variables, Annually, resample=True)
+    january = 31 * 24
+    assert np.allclose(array[0], [hourly[0, :january].sum(), hourly[0, january:].sum()])
+    assert np.allclose(array[1], [hourly[1, :january].mean(), hourly[1, january:].mean()])
@@ -0,0 +1,96 @@
+import os
+import time
+import multiprocessing
+import pytest
+from epeditor import scheduler
+from epeditor.scheduler import Scheduler, RUNNING, DONE, FAILED, CANCELLED
+
+# the fake simulations reach the job processes by forking
+pytestmark = pytest.mark.skipif(multiprocessing.get_start_method() != 'fork',
+                                reason='job processes do not inherit the patched simulate_file')
+
+
+def fake_simulation(idf_path, epw, idd=None, overwrite=False, verbose='q', cpu_index=None, long_dir=False,
+                    fail_once=None, sleep=0.):
+    """Stands for `simulate_file`: fails the first time `fail_once` is given, sleeps, then succeeds."""
+    if fail_once is not None and not os.path.exists(fail_once):
+        open(fail_once, 'w').close()
+        raise RuntimeError('first attempt')
+    time.sleep(sleep)
+    return f'Case Done:{idf_path}'
+
+
+@pytest.fixture(autouse=True)
+def fake_simulate_file(monkeypatch):
+    monkeypatch.setattr(scheduler, 'simulate_file', fake_simulation)
+
+
+def test_failed_attempt_is_retried(tmp_path):
+    done = []
+    jobs = Scheduler(2, retries=1, backoff=0., on_case=done.append)
+    job = jobs.submit(str(tmp_path / 'a.idf'), 'x.epw', fail_once=str(tmp_path / 'a.failed'))
+    other = jobs.submit(str(tmp_path / 'b.idf'), 'x.epw')
+    status = jobs.join()
+    assert [record['state'] for record in status] == [DONE, DONE]
+    assert (job.attempts, other.attempts) == (2, 1)
+    assert sorted(done) == [str(tmp_path / 'a'), str(tmp_path / 'b')]
+
+
+def test_failed_job_without_retries(tmp_path):
+    done = []
+    jobs = Scheduler(1, on_case=done.append)
+    job = jobs.submit(str(tmp_path / 'a.idf'), 'x.epw', fail_once=str(tmp_path / 'a.failed'))
+    jobs.join()
+    assert job.state == FAILED
+    assert 'first attempt' in job.message
+    assert done == []
+    assert jobs.status(FAILED)[0]['attempts'] == 1
+
+
+def test_attempts_time_out(tmp_path):
+    jobs = Scheduler(1, timeout=0.5, retries=1, backoff=0.)
+    job = jobs.submit(str(tmp_path / 'a.idf'), 'x.epw', sleep=60.)
+    start = time.time()
+    jobs.join()
+    assert time.time() - start < 10
+    assert job.state == FAILED
+    assert job.attempts == 2
+    assert job.message == 'Timeout after 0.5s'
+    assert not job.process.is_alive()
+
+
+def test_priorities_and_cancel(tmp_path):
+    jobs = Scheduler(1)
+    jobs.pause()
+    low = jobs.submit(str(tmp_path / 'low.idf'), 'x.epw', priority=0)
+    high = jobs.submit(str(tmp_path / 'high.idf'), 'x.epw', priority=5)
+    slow = jobs.submit(str(tmp_path / 'slow.idf'), 'x.epw', priority=-1, sleep=60.)
+    jobs.resume()
+    deadline = time.time() + 10
+    while slow.state != RUNNING and time.time() < deadline:
+        time.sleep(0.05)
+    jobs.cancel()
+    jobs.join()
+    assert high.started < low.started < slow.started
+    assert (high.state, low.state, slow.state) == (DONE, DONE, CANCELLED)
+
+
+def late_job(conn, args, kwargs, run_job=scheduler.run_job):
+    """Stands for `run_job` in a process that takes a while to lead its own process group."""
+    time.sleep(2.)
+    run_job(conn, args, kwargs)
+
+
+def test_cancel_right_after_submit(tmp_path, monkeypatch):
+    monkeypatch.setattr(scheduler, 'run_job', late_job)
+    jobs = Scheduler(1)
+    job = jobs.submit(str(tmp_path / 'a.idf'), 'x.epw', sleep=60.)
+    deadline = time.time() + 10
+    while job.state != RUNNING and time.time() < deadline:
+        time.sleep(0.01)
+    start = time.time()
+    jobs.cancel(job)
+    jobs.join()
+    assert time.time() - start < scheduler.STOP_TIMEOUT
+    assert job.state == CANCELLED
+    assert not job.process.is_alive()
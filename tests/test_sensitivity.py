@@ -0,0 +1,110 @@
+import os
+from types import SimpleNamespace
+import numpy as np
+from epeditor import sensitivity
+from epeditor.editor import IDFModel
+from epeditor.sensitivity import morris_design, elementary_effects, saltelli_design, sobol_indices, run_design
+
+COEFFICIENTS = np.array([3., 0., -2., 0.5])
+
+
+def test_morris_design_moves_one_factor_at_a_time():
+    trajectories, levels = 6, 4
+    design = morris_design(len(COEFFICIENTS), trajectories, levels, seed=0)
+    assert design.shape == (trajectories * (len(COEFFICIENTS) + 1), len(COEFFICIENTS))
+    assert design.min() >= 0 and design.max() <= 1
+    steps = np.diff(design.reshape(trajectories, len(COEFFICIENTS) + 1, -1), axis=1)
+    moved = np.abs(steps) > 1e-12
+    assert np.all(moved.sum(axis=2) == 1)
+    # every factor moves once per trajectory, by levels / (2 * (levels - 1))
+    assert np.all(moved.sum(axis=1) == 1)
+    assert np.allclose(np.abs(steps).max(axis=2), levels / (2 * (levels - 1)))
+
+
+def test_elementary_effects_of_linear_function():
+    trajectories = 5
+    design = morris_design(len(COEFFICIENTS), trajectories, seed=1)
+    outputs = design @ COEFFICIENTS
+    effects = elementary_effects(design, outputs, trajectories)
+    assert effects.shape == (trajectories, len(COEFFICIENTS))
+    assert np.allclose(effects, COEFFICIENTS)
+    # extra output axes follow the factor axis
+    effects = elementary_effects(design, np.stack([outputs, 2 * outputs + 1], axis=1), trajectories)
+    assert effects.shape == (trajectories, len(COEFFICIENTS), 2)
+    assert np.allclose(effects[:, :, 1], 2 * COEFFICIENTS)
+
+
+def ishigami(x, a=7., b=0.1):
+    return np.sin(x[:, 0]) + a * np.sin(x[:, 1]) ** 2 + b * x[:, 2] ** 4 * np.sin(x[:, 0])
+
+
+def test_sobol_indices_of_linear_function():
+    design = saltelli_design(len(COEFFICIENTS), 2048, seed=0)
+    first, total, first_interval, total_interval = sobol_indices(design @ COEFFICIENTS, len(COEFFICIENTS),
+                                                                 n_boot=50, seed=0)
+    # uniform independent factors: S_i = ST_i = a_i^2 / sum(a^2)
+    expected = COEFFICIENTS ** 2 / np.sum(COEFFICIENTS ** 2)
+    assert np.allclose(first, expected, atol=0.05)
+    assert np.allclose(total, expected, atol=0.05)
+    assert np.all(first_interval[0] <= first + 1e-12) and np.all(first <= first_interval[1] + 1e-12)
+    assert np.all(total_interval[0] <= total + 1e-12) and np.all(total <= total_interval[1] + 1e-12)
+
+
+def test_sobol_indices_of_ishigami_function():
+    design = saltelli_design(3, 4096, seed=1)
+    outputs = ishigami(-np.pi + 2 * np.pi * design)
+    # failed runs are left out
+    outputs[[5, 9]] = np.nan
+    first, total, _, _ = sobol_indices(np.stack([outputs, 10 * outputs], axis=1), 3, n_boot=0)
+    assert first.shape == (3, 2)
+    assert np.allclose(first[:, 0], [0.314, 0.442, 0.], atol=0.05)
+    assert np.allclose(total[:, 0], [0.558, 0.442, 0.244], atol=0.05)
+    # indices do not depend on the scale of the output
+    assert np.allclose(first[:, 0], first[:, 1])
+
+
+class FakeObject:
+    """Stands for an EpBunch: fieldvalues[1] is the name, fields are read and set by name."""
+
+    def __init__(self, idfclass, name, **fields):
+        self.fieldvalues = [idfclass, name]
+        self.fields = fields
+
+    def __getitem__(self, field):
+        return self.fields[field]
+
+    def __setitem__(self, field, value):
+        self.fields[field] = value
+
+
+class FakeModel:
+    """Stands for an IDFModel, writing the field values of each case instead of an IDF file."""
+    write = IDFModel.write
+    changeValue = IDFModel.changeValue
+
+    def __init__(self, folder):
+        self.file_name = os.path.join(folder, 'model.idf')
+        self.folder = folder
+        self.idd = None
+        self.idfobjects = {'MATERIAL': [FakeObject('MATERIAL', 'Brick', Thickness=0.2, Conductivity=0.9)]}
+
+    def save(self, path):
+        fields = self.idfobjects['MATERIAL'][0].fields
+        with open(path, 'w') as f:
+            f.write(f"{fields['Thickness']},{fields['Conductivity']}")
+
+
+def test_run_design_keeps_the_baseline_model(tmp_path, monkeypatch):
+    monkeypatch.setattr(sensitivity, 'simulate_local', lambda *args, **kwargs: None)
+    model = FakeModel(str(tmp_path))
+    editors = [SimpleNamespace(idfclass='MATERIAL', name='Brick', field=field) for field in
+               ['Thickness', 'Conductivity']]
+    design = np.array([[0.1, 0.5], [0.3, 1.2]])
+    geditor = SimpleNamespace(editors=[SimpleNamespace(params=design[:, i], **vars(edit))
+                                       for i, edit in enumerate(editors)], params_num=len(design))
+    run_design(model, geditor, 'x.epw', str(tmp_path / 'design'), 'run')
+    assert model.folder == str(tmp_path)
+    assert model.idfobjects['MATERIAL'][0].fields == {'Thickness': 0.2, 'Conductivity': 0.9}
+    for i, row in enumerate(design):
+        with open(tmp_path / 'design' / f'run_{i}.idf') as f:
+            assert f.read() == f'{row[0]},{row[1]}'
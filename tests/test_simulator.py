@@ -0,0 +1,160 @@
+import os
+import shutil
+import tempfile
+import multiprocessing
+from multiprocessing import Manager
+from multiprocessing.pool import Pool
+from types import SimpleNamespace
+import pytest
+from epeditor import simulator
+from epeditor.simulator import simulate_file, scratch_folder, copy_back, case_folder, simulate_queue, drain_cases
+
+
+class FakeIDF:
+    """Stands for eppy's IDF: a model that already writes SQL output."""
+    iddname = None
+
+    def __init__(self, idfname, epw=None):
+        self.idfname = idfname
+        self.epw = epw
+        self.idfobjects = {'Output:SQLite': [None], 'version': [SimpleNamespace(Version_Identifier='9.4')]}
+
+    @staticmethod
+    def setiddname(idd):
+        pass
+
+
+def fake_run(idf, weather=None, idd=None, output_directory='', output_prefix='eplusout', fail=False, **kwargs):
+    """Stands for `run_with_cpu`: writes the outputs of a run, then fails if asked to."""
+    for ext in ['.sql', '.err', '.eso']:
+        with open(os.path.join(output_directory, output_prefix + ext), 'w') as f:
+            f.write(ext)
+    if fail:
+        raise RuntimeError('EnergyPlus failed')
+
+
+@pytest.fixture
+def model(tmp_path, monkeypatch):
+    """An IDF file simulated without EnergyPlus, as (idf path, output folder, scratch root)."""
+    monkeypatch.setattr(simulator, 'IDF', FakeIDF)
+    monkeypatch.setattr(simulator, 'check_installation', lambda idf_path: True)
+    monkeypatch.setattr(simulator, 'get_idd', lambda idf_path: None)
+    monkeypatch.setattr(simulator, 'run_with_cpu', fake_run)
+    idf_path = tmp_path / 'model.idf'
+    idf_path.write_text('Version,9.4;')
+    (tmp_path / 'scratch').mkdir()
+    return str(idf_path), str(tmp_path / 'model'), str(tmp_path / 'scratch')
+
+
+def test_failed_scratch_run_keeps_its_err_file(model):
+    idf_path, case_dir, scratch = model
+    with pytest.raises(RuntimeError):
+        simulate_file(idf_path, 'x.epw', scratch=scratch, fail=True)
+    assert sorted(os.listdir(case_dir)) == ['x.err']
+    assert os.listdir(scratch) == []
+
+
+def test_scratch_folder(tmp_path, monkeypatch):
+    monkeypatch.setattr(simulator, 'SCRATCH_ROOT', str(tmp_path))
+    case_dir = str(tmp_path / 'project' / 'case_0')
+    folder = scratch_folder(case_dir)
+    assert os.path.dirname(folder) == str(tmp_path)
+    assert os.path.basename(folder).startswith('epeditor-') and folder.endswith('-case_0')
+    # the same case always runs in the same folder, other cases of the same name do not
+    assert scratch_folder(case_dir, True) == folder
+    assert scratch_folder(str(tmp_path / 'other' / 'case_0')) != folder
+    assert os.path.dirname(scratch_folder(case_dir, str(tmp_path / 'ram'))) == tempfile.gettempdir()
+
+
+def test_copy_back_replaces_kept_outputs(tmp_path):
+    run_dir, target_dir = tmp_path / 'run', tmp_path / 'case'
+    run_dir.mkdir()
+    target_dir.mkdir()
+    for name in ['x.sql', 'x.ERR', 'x.eso']:
+        (run_dir / name).write_text('new ' + name)
+    (target_dir / 'x.sql').write_text('old')
+    copied = copy_back(str(run_dir), str(target_dir))
+    assert sorted(copied) == [str(target_dir / 'x.ERR'), str(target_dir / 'x.sql')]
+    assert sorted(os.listdir(target_dir)) == ['x.ERR', 'x.sql']
+    assert (target_dir / 'x.sql').read_text() == 'new x.sql'
+
+
+def test_failed_copy_back_leaves_the_output(tmp_path, monkeypatch):
+    run_dir, target_dir = tmp_path / 'run', tmp_path / 'case'
+    run_dir.mkdir()
+    target_dir.mkdir()
+    (run_dir / 'x.sql').write_text('new')
+    (target_dir / 'x.sql').write_text('old')
+
+    def broken_copy(source, target):
+        with open(target, 'w') as f:
+            f.write('ne')
+        raise OSError('disk full')
+
+    monkeypatch.setattr(shutil, 'copyfile', broken_copy)
+    with pytest.raises(OSError):
+        copy_back(str(run_dir), str(target_dir))
+    assert os.listdir(target_dir) == ['x.sql']
+    assert (target_dir / 'x.sql').read_text() == 'old'
+
+
+def test_scratch_run_copies_kept_outputs(model):
+    idf_path, case_dir, scratch = model
+    assert simulate_file(idf_path, 'x.epw', scratch=scratch).startswith('Case Done:')
+    assert sorted(os.listdir(case_dir)) == ['x.err', 'x.sql']
+    assert os.listdir(scratch) == []
+    # without scratch the case runs in its output folder
+    assert simulate_file(idf_path, 'y.epw').startswith('Case Done:')
+    assert {'y.eso', 'y.sql'} <= set(os.listdir(case_dir))
+
+
+def test_scratch_folder_is_removed_after_an_exception(model, monkeypatch):
+    idf_path, case_dir, scratch = model
+
+    def crash(*args, **kwargs):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(simulator, 'run_with_cpu', crash)
+    with pytest.raises(KeyboardInterrupt):
+        simulate_file(idf_path, 'x.epw', scratch=scratch)
+    assert os.listdir(scratch) == []
+    assert os.listdir(case_dir) == []
+
+
+def counted_simulation(idf_path, epw, idd=None, overwrite=False, verbose='q', cpu_index=None, long_dir=False,
+                       **kwargs):
+    """Stands for `simulate_file`: records the run in the output folder, fails for 'bad' models."""
+    if 'bad' in idf_path:
+        raise RuntimeError('EnergyPlus failed')
+    os.makedirs(case_folder(idf_path, epw, long_dir), exist_ok=True)
+    with open(os.path.join(case_folder(idf_path, epw, long_dir), 'runs.txt'), 'a') as f:
+        f.write(f'{cpu_index}\n')
+    return f'Case Done:{idf_path}'
+
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != 'fork',
+                    reason='pool workers do not inherit the patched simulate_file')
+def test_queue_runs_every_case_once(tmp_path, monkeypatch):
+    monkeypatch.setattr(simulator, 'simulate_file', counted_simulation)
+    idfs = [str(tmp_path / f'case_{i}.idf') for i in range(5)] + [str(tmp_path / 'bad.idf')]
+    pairs = [(idf, epw) for idf in idfs for epw in ['a.epw', 'b.epw']]
+    manager = Manager()
+    work, done = manager.Queue(), manager.Queue()
+    for pair in pairs:
+        work.put(pair)
+    pool = Pool(2)
+    try:
+        results = [pool.apply_async(simulate_queue, (work,), dict(cpu_index=i, long_dir=True, done=done))
+                   for i in range(2)]
+        drained = []
+        drain_cases(done, results, drained.append)
+        returned = [folder for result in results for folder in result.get()]
+    finally:
+        pool.close()
+        pool.join()
+        manager.shutdown()
+    expected = sorted(case_folder(idf, epw, True) for idf, epw in pairs if 'bad' not in idf)
+    assert sorted(drained) == sorted(returned) == expected
+    for folder in expected:
+        with open(os.path.join(folder, 'runs.txt')) as f:
+            assert len(f.read().split()) == 1
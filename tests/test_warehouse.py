@@ -0,0 +1,61 @@
+import os
+import numpy as np
+import pytest
+from epeditor.db_eplusout_reader import get_first_arrays
+from epeditor.reader import read_cases
+from epeditor.simulator import find_sql, RESULT_DIR
+from epeditor.utils import Hourly, Monthly
+from epeditor.warehouse import build_warehouse, open_warehouse, WAREHOUSE_FILE
+from conftest import make_sql
+
+
+@pytest.fixture
+def warehouse(project):
+    folder, sql_list, _ = project
+    os.makedirs(os.path.join(folder, RESULT_DIR))
+    return build_warehouse(os.path.join(folder, RESULT_DIR, WAREHOUSE_FILE), sql_list)
+
+
+def test_warehouse_is_not_a_case(project, warehouse):
+    folder, sql_list, _ = project
+    # a stray SQL file in the result folder is not a case either
+    make_sql(os.path.join(folder, RESULT_DIR, 'eplusout.sql'), days=31)
+    cases = find_sql(folder)
+    assert sorted(cases) == ['base_0', 'base_1', 'base_2']
+    assert sorted(cases.values()) == sql_list
+
+
+@pytest.mark.parametrize('frequency', [Hourly, Monthly])
+def test_warehouse_reads_match_case_reads(project, variables, warehouse, frequency):
+    _, sql_list, _ = project
+    for sql in sql_list:
+        array, timestamps = warehouse.first_arrays(sql, variables, frequency)
+        direct, direct_timestamps = get_first_arrays(sql, variables, frequency)
+        assert np.array_equal(array, direct)
+        assert np.array_equal(timestamps, direct_timestamps)
+
+
+def test_warehouse_follows_case_changes(project, variables, warehouse):
+    folder, sql_list, _ = project
+    reported = make_sql(sql_list[0], days=31, seed=5)
+    assert warehouse.first_arrays(sql_list[0], variables, Monthly) is None
+    validSql, arrays = read_cases(sql_list, variables, Monthly, warehouse=warehouse)
+    assert len(validSql) == len(sql_list)
+    assert np.allclose(arrays[0], [reported[('Monthly', i)] for i in range(len(variables))])
+
+    warehouse = build_warehouse(os.path.join(folder, RESULT_DIR, WAREHOUSE_FILE), sql_list)
+    assert np.array_equal(warehouse.first_arrays(sql_list[0], variables, Monthly)[0], arrays[0])
+    assert open_warehouse(os.path.join(folder, RESULT_DIR)) is not None
+
+
+def test_warehouse_leaves_out_corrupt_cases(project, variables):
+    folder, sql_list, _ = project
+    os.makedirs(os.path.join(folder, RESULT_DIR))
+    with open(sql_list[1], 'wb') as f:
+        f.write(b'not a database' * 100)
+    for selected in [None, variables]:
+        warehouse = build_warehouse(os.path.join(folder, RESULT_DIR, WAREHOUSE_FILE), sql_list, selected)
+        assert warehouse.first_arrays(sql_list[1], variables, Monthly) is None
+        for sql in sql_list[::2]:
+            array, _ = warehouse.first_arrays(sql, variables, Monthly)
+            assert np.array_equal(array, get_first_arrays(sql, variables, Monthly)[0])
@@ -202,6 +202,13 @@ class MultiInputDialog(QtWidgets.QDialog):
         self.localParameters.cpus = QtWidgets.QLineEdit(self.localParameters)
         self.localParameters.cpus.setText('8')
         self.localParameters.Layout.addWidget(self.localParameters.cpus)
+        self.localParameters.timeout = QtWidgets.QLineEdit(self.localParameters)
+        self.localParameters.timeout.setPlaceholderText('timeout (min)')
+        self.localParameters.Layout.addWidget(self.localParameters.timeout)
+        self.localParameters.retries = QtWidgets.QLineEdit(self.localParameters)
+        self.localParameters.retries.setText('0')
+        self.localParameters.retries.setPlaceholderText('retries')
+        self.localParameters.Layout.addWidget(self.localParameters.retries)
 
         # OK
         self.OK = QtWidgets.QDialogButtonBox(QtWidgets.QDialogButtonBox.Ok,
@@ -217,8 +224,11 @@ class MultiInputDialog(QtWidgets.QDialog):
     def values(self):
         """返回当前所有文本"""
         core = self.CoreSelect.buttonGroup.checkedButton().hint == 'Local'
+        timeout = self.localParameters.timeout.text().strip()
         return {'core': core, 'cpus': int(self.localParameters.cpus.text()),
-                'forceCPU': self.localParameters.forceCPU.isChecked()}
+                'forceCPU': self.localParameters.forceCPU.isChecked(),
+                'timeout': float(timeout) * 60 if timeout else None,
+                'retries': int(self.localParameters.retries.text() or 0)}
 
 
 # 中间类Window的写法
@@ -363,6 +373,13 @@ class Window(Ui_MainWindow, QtWidgets.QMainWindow):
         self.actionWrite.triggered.connect(self.action_write)
         self.actionSimulation.triggered.connect(self.action_Simulation)
         self.actionContinueSimulation.triggered.connect(self.action_continueSimulation)
+        self.actionPauseSimulation = self.menuSimulation.addAction('Pause Simulation')
+        self.actionPauseSimulation.triggered.connect(self.action_pauseSimulation)
+        self.actionResumeSimulation = self.menuSimulation.addAction('Resume Simulation')
+        self.actionResumeSimulation.triggered.connect(self.action_resumeSimulation)
+        self.actionCancelSimulation = self.menuSimulation.addAction('Cancel Simulation')
+        self.actionCancelSimulation.triggered.connect(self.action_cancelSimulation)
+        self.scheduler = None
         self.actionSet_Result_Folder.triggered.connect(self.action_Result_Folder)
 
         self.exec.clicked.connect(self.click_QA)
@@ -538,8 +555,18 @@ class Window(Ui_MainWindow, QtWidgets.QMainWindow):
                 val = dlg.values()
                 QtWidgets.QMessageBox.information(self, "warning",
                                                   "模拟即将开始，相关信息在CMD打印\nSimulation is ready, please turn to CMD....")
-                self.prj.model.simulation(epw=filePath, overwrite=False, stdout=self.stdout,
-                                          local=val['core'], process_count=val['cpus'], forceCPU=val['forceCPU'])
+                # the menu stays responsive while the scheduler waits, to pause or cancel the run
+                self.scheduler = Scheduler(val['cpus'], timeout=val['timeout'], retries=val['retries'],
+                                           on_wait=app.processEvents)
+                self.actionSimulation.setEnabled(False)
+                self.actionContinueSimulation.setEnabled(False)
+                try:
+                    self.prj.model.simulation(epw=filePath, overwrite=False, stdout=self.stdout,
+                                              local=val['core'], process_count=val['cpus'], forceCPU=val['forceCPU'],
+                                              scheduler=self.scheduler)
+                finally:
+                    self.actionSimulation.setEnabled(True)
+                    self.actionContinueSimulation.setEnabled(True)
                 print('******Simulation begin, turn to CMD....******')
                 self.prj.model.read_folder(self.prj.model.folder)
                 self.clickStage3()
@@ -550,6 +577,24 @@ class Window(Ui_MainWindow, QtWidgets.QMainWindow):
                 self.exportButton.clicked.connect(self.resultAnalysisArea.resultBox.toCsv)
                 print('******ALL DONE******')
 
+    def action_pauseSimulation(self):
+        """Stop starting new cases of the running simulation, the running cases go on."""
+        if self.scheduler is not None:
+            self.scheduler.pause()
+            print(f'******Simulation paused: {self.scheduler}******')
+
+    def action_resumeSimulation(self):
+        """Start the pending cases of a paused simulation again."""
+        if self.scheduler is not None:
+            self.scheduler.resume()
+            print(f'******Simulation resumed: {self.scheduler}******')
+
+    def action_cancelSimulation(self):
+        """Cancel the pending cases of the running simulation and kill the running ones."""
+        if self.scheduler is not None:
+            self.scheduler.cancel()
+            print(f'******Simulation cancelled: {self.scheduler}******')
+
     def action_idfreference(self):
         """Open the InputOutputReference.pdf document using the system's default PDF viewer.
         
@@ -1076,9 +1076,18 @@ class ResultBox(QtWidgets.QWidget):
         searhText = self.variables_Scroll.variableSearch.text().strip()
         showBox = []
         if len(searhText)>2:
-            for _varBox in self.validVariables:
-                if re.search(searhText, _varBox.hint.key + _varBox.hint.type ,re.IGNORECASE) != None:
-                    showBox.append(_varBox)
+            catalogue = getattr(self.prj.model, 'catalogue', None)
+            if catalogue is not None:
+                # regular expression search on the project catalogue, plain text when it is not a valid one
+                try:
+                    found = set(catalogue.search(searhText, mode='regex'))
+                except re.error:
+                    found = set(catalogue.search(searhText, mode='substring'))
+                showBox = [_varBox for _varBox in self.validVariables if _varBox.hint in found]
+            else:
+                for _varBox in self.validVariables:
+                    if re.search(searhText, _varBox.hint.key + _varBox.hint.type ,re.IGNORECASE) != None:
+                        showBox.append(_varBox)
             self.showVariables(showBox)
         if len(searhText)==0:
             self.showVariables(self.validVariables)
@@ -1147,17 +1156,21 @@ class ResultBox(QtWidgets.QWidget):
         Returns
         -------
         None
-            This function does not return any value. It saves the result to a CSV file 
-            and opens the file location if successful.
+            This function does not return any value. It saves the result to a CSV file, gzip
+            compressed when that file type is chosen, and opens the file location if successful.
         """
         try:
             if self.prj.model is not None:
                 filePath, filetype = QtWidgets.QFileDialog.getSaveFileName(self, "Select the CSV saving path", "./",
-                                                                           'CSV Files (*.csv)')
+                                                                           'CSV Files (*.csv);;'
+                                                                           'Gzip CSV Files (*.csv.gz)')
                 if filePath:
+                    compress = filetype.startswith('Gzip') or filePath.lower().endswith('.gz')
+                    if compress and not filePath.lower().endswith('.gz'):
+                        filePath += '.gz'
                     result = self.extrudeResult()
-                    result.to_csv(filePath)
-                    os.startfile(filePath)
+                    result.to_csv(filePath, compress=compress)
+                    os.startfile(os.path.dirname(filePath) if compress else filePath)
         except Exception as e:
             traceback.print_exc()
 